@@ -1,7 +1,7 @@
 """Add contact_submissions table
 
 Revision ID: 002_add_contact_submissions
-Revises: 001_initial_schema
+Revises: 001_initial
 Create Date: 2024-01-01 00:00:00.000000
 
 """
@@ -13,7 +13,7 @@ from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision: str = '002_add_contact_submissions'
-down_revision: Union[str, None] = '001_initial_schema'
+down_revision: Union[str, None] = '001_initial'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
@@ -0,0 +1,36 @@
+"""Add platform_stats_snapshot table
+
+Revision ID: 003_add_platform_stats_snapshot
+Revises: 002_add_contact_submissions
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_platform_stats_snapshot'
+down_revision: Union[str, None] = '002_add_contact_submissions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'platform_stats_snapshot',
+        sa.Column('key', sa.String(50), primary_key=True),
+        sa.Column('total_students', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('total_sponsors', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('active_sponsorships', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('total_fund_raised', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('total_donations', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('locations_served', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('is_dirty', sa.Boolean, nullable=False, server_default=sa.true()),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('platform_stats_snapshot')
@@ -0,0 +1,43 @@
+"""Add indexed provider reference columns to payment_transactions
+
+Revision ID: 004_add_payment_provider_references
+Revises: 003_add_platform_stats_snapshot
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004_add_payment_provider_references'
+down_revision: Union[str, None] = '003_add_platform_stats_snapshot'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REFERENCE_COLUMNS = ('checkout_request_id', 'paypal_order_id', 'bank_transfer_reference')
+
+
+def upgrade() -> None:
+    for column in REFERENCE_COLUMNS:
+        op.add_column('payment_transactions', sa.Column(column, sa.String(100), nullable=True))
+
+    # Backfill from the JSONB column, named metadata or tx_metadata depending
+    # on how the table was created.
+    existing = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('payment_transactions')}
+    json_column = 'tx_metadata' if 'tx_metadata' in existing else 'metadata'
+    for column in REFERENCE_COLUMNS:
+        op.execute(
+            f"UPDATE payment_transactions SET {column} = {json_column} ->> '{column}' "
+            f"WHERE {json_column} ? '{column}'"
+        )
+
+    for column in REFERENCE_COLUMNS:
+        op.create_index(f'ix_payment_transactions_{column}', 'payment_transactions', [column], unique=True)
+
+
+def downgrade() -> None:
+    for column in REFERENCE_COLUMNS:
+        op.drop_index(f'ix_payment_transactions_{column}', table_name='payment_transactions')
+        op.drop_column('payment_transactions', column)
@@ -0,0 +1,42 @@
+"""Add retry bookkeeping to payment_webhooks for the webhook inbox
+
+Revision ID: 005_add_payment_webhook_inbox
+Revises: 004_add_payment_provider_references
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005_add_payment_webhook_inbox'
+down_revision: Union[str, None] = '004_add_payment_provider_references'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('payment_webhooks', sa.Column('attempts', sa.Integer, nullable=False, server_default='0'))
+    op.add_column('payment_webhooks', sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('payment_webhooks', sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('payment_webhooks', sa.Column('last_error', sa.Text, nullable=True))
+
+    # Existing unprocessed rows become due immediately
+    op.execute("UPDATE payment_webhooks SET next_attempt_at = now() WHERE processed = false")
+
+    op.create_index(
+        'ix_payment_webhooks_pending',
+        'payment_webhooks',
+        ['next_attempt_at'],
+        postgresql_where=sa.text('processed = false'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payment_webhooks_pending', table_name='payment_webhooks')
+    op.drop_column('payment_webhooks', 'last_error')
+    op.drop_column('payment_webhooks', 'processed_at')
+    op.drop_column('payment_webhooks', 'next_attempt_at')
+    op.drop_column('payment_webhooks', 'attempts')
@@ -0,0 +1,31 @@
+"""Add rate_limit_buckets table for the shared rate limiter
+
+Revision ID: 006_add_rate_limit_buckets
+Revises: 005_add_payment_webhook_inbox
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006_add_rate_limit_buckets'
+down_revision: Union[str, None] = '005_add_payment_webhook_inbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rate_limit_buckets',
+        sa.Column('key', sa.String(255), primary_key=True),
+        sa.Column('tat', sa.Double, nullable=False),
+        sa.Column('allowed', sa.Boolean, nullable=False, server_default=sa.true()),
+        prefixes=['UNLOGGED'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rate_limit_buckets')
@@ -0,0 +1,27 @@
+"""Add sha256 checksum to student_documents
+
+Revision ID: 007_add_student_document_sha256
+Revises: 006_add_rate_limit_buckets
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '007_add_student_document_sha256'
+down_revision: Union[str, None] = '006_add_rate_limit_buckets'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('student_documents', sa.Column('sha256', sa.String(64), nullable=True))
+    op.create_index('ix_student_documents_sha256', 'student_documents', ['sha256'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_student_documents_sha256', table_name='student_documents')
+    op.drop_column('student_documents', 'sha256')
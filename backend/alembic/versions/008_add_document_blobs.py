@@ -0,0 +1,38 @@
+"""Add content-addressed document_blobs store
+
+Revision ID: 008_add_document_blobs
+Revises: 007_add_student_document_sha256
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008_add_document_blobs'
+down_revision: Union[str, None] = '007_add_student_document_sha256'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'document_blobs',
+        sa.Column('id', sa.String(64), primary_key=True),
+        sa.Column('size', sa.BigInteger, nullable=False),
+        sa.Column('ref_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.add_column(
+        'student_documents',
+        sa.Column('blob_id', sa.String(64), sa.ForeignKey('document_blobs.id'), nullable=True),
+    )
+    op.create_index('ix_student_documents_blob_id', 'student_documents', ['blob_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_student_documents_blob_id', table_name='student_documents')
+    op.drop_column('student_documents', 'blob_id')
+    op.drop_table('document_blobs')
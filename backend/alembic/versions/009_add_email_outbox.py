@@ -0,0 +1,53 @@
+"""Add email_outbox for queued SMTP delivery
+
+Revision ID: 009_add_email_outbox
+Revises: 008_add_document_blobs
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '009_add_email_outbox'
+down_revision: Union[str, None] = '008_add_document_blobs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLAlchemy stores Enum members by name
+    op.execute("CREATE TYPE emailstatus AS ENUM ('PENDING', 'SENT', 'FAILED')")
+    email_status_enum = postgresql.ENUM('PENDING', 'SENT', 'FAILED', name='emailstatus', create_type=False)
+
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('to_email', sa.String(255), nullable=False, index=True),
+        sa.Column('subject', sa.Text, nullable=False),
+        sa.Column('html_content', sa.Text, nullable=True),
+        sa.Column('text_content', sa.Text, nullable=True),
+        sa.Column('reply_to', sa.String(255), nullable=True),
+        sa.Column('status', email_status_enum, nullable=False, server_default='PENDING'),
+        sa.Column('attempts', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text, nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index(
+        'ix_email_outbox_due',
+        'email_outbox',
+        ['next_attempt_at'],
+        postgresql_where=sa.text('next_attempt_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_due', table_name='email_outbox')
+    op.drop_table('email_outbox')
+    op.execute("DROP TYPE emailstatus")
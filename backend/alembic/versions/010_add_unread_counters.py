@@ -0,0 +1,31 @@
+"""Add unread_counters for the admin inbox
+
+Revision ID: 010_add_unread_counters
+Revises: 009_add_email_outbox
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '010_add_unread_counters'
+down_revision: Union[str, None] = '009_add_email_outbox'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows are created and filled by the counter reconciliation that runs
+    # at application startup
+    op.create_table(
+        'unread_counters',
+        sa.Column('key', sa.String(64), primary_key=True),
+        sa.Column('count', sa.BigInteger, nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('unread_counters')
@@ -0,0 +1,49 @@
+"""Add full-text search vector to contact_submissions
+
+Revision ID: 011_add_contact_submission_search
+Revises: 010_add_unread_counters
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '011_add_contact_submission_search'
+down_revision: Union[str, None] = '010_add_unread_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || translate(coalesce(email, ''), '@.', '  ')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(subject, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(message, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # A stored generated column is computed for existing rows as it is
+    # added, which rewrites the table under an exclusive lock
+    op.add_column(
+        'contact_submissions',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR,
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        ),
+    )
+    op.create_index(
+        'ix_contact_submissions_search',
+        'contact_submissions',
+        ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contact_submissions_search', table_name='contact_submissions')
+    op.drop_column('contact_submissions', 'search_vector')
@@ -0,0 +1,32 @@
+"""Add pg_trgm index on institution names for typeahead
+
+Revision ID: 012_add_institution_name_trgm
+Revises: 011_add_contact_submission_search
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '012_add_institution_name_trgm'
+down_revision: Union[str, None] = '011_add_contact_submission_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_institutions_name_trgm',
+        'institutions',
+        ['name'],
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    # pg_trgm is left installed; other objects may have come to rely on it
+    op.drop_index('ix_institutions_name_trgm', table_name='institutions')
@@ -0,0 +1,67 @@
+"""Maintain unread_counters with row triggers
+
+Revision ID: 013_add_unread_counter_triggers
+Revises: 012_add_institution_name_trgm
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '013_add_unread_counter_triggers'
+down_revision: Union[str, None] = '012_add_institution_name_trgm'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION count_unread_rows() RETURNS trigger AS $$
+        DECLARE
+            old_key text;
+            new_key text;
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                IF NOT OLD.is_read THEN
+                    old_key := TG_ARGV[0] || lower(to_jsonb(OLD) ->> TG_ARGV[1]);
+                END IF;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                IF NOT NEW.is_read THEN
+                    new_key := TG_ARGV[0] || lower(to_jsonb(NEW) ->> TG_ARGV[1]);
+                END IF;
+            END IF;
+            IF old_key IS NOT DISTINCT FROM new_key THEN
+                RETURN NULL;
+            END IF;
+            IF old_key IS NOT NULL THEN
+                UPDATE unread_counters SET count = count - 1 WHERE key = old_key;
+            END IF;
+            IF new_key IS NOT NULL THEN
+                INSERT INTO unread_counters (key, count) VALUES (new_key, 1)
+                ON CONFLICT (key) DO UPDATE SET count = unread_counters.count + 1;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER admin_notifications_count_unread
+        AFTER INSERT OR DELETE OR UPDATE OF is_read, notification_type ON admin_notifications
+        FOR EACH ROW EXECUTE FUNCTION count_unread_rows('notification:', 'notification_type')
+    """)
+    op.execute("""
+        CREATE TRIGGER contact_submissions_count_unread
+        AFTER INSERT OR DELETE OR UPDATE OF is_read, inquiry_type ON contact_submissions
+        FOR EACH ROW EXECUTE FUNCTION count_unread_rows('contact:', 'inquiry_type')
+    """)
+    # Counters maintained until now may have drifted; the reconciliation at
+    # application startup recounts them
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER contact_submissions_count_unread ON contact_submissions")
+    op.execute("DROP TRIGGER admin_notifications_count_unread ON admin_notifications")
+    op.execute("DROP FUNCTION count_unread_rows()")
@@ -1,18 +1,24 @@
 """
 Admin notifications API routes.
 """
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
 from uuid import UUID
+import asyncio
 import json
+import time
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.session import get_db
+from app.core.config import settings
 from app.core.deps import get_current_admin_user
 from app.models.user import User
 from app.models.admin_notification import NotificationType
 from app.services.admin_notification_service import AdminNotificationService
+from app.services.admin_event_service import admin_event_hub, load_unread_counts
+from app.utils.counting import CountMode
 from app.schemas.admin_notification import (
     AdminNotificationResponse,
     AdminNotificationListResponse,
@@ -38,6 +44,8 @@ async def get_notifications(
     page_size: int = Query(20, ge=1, le=100),
     notification_type: Optional[str] = Query(None),
     unread_only: bool = Query(False),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(None, description="How to compute total: exact, cached or estimate"),
     db: AsyncSession = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user),
 ):
@@ -55,12 +63,20 @@ async def get_notifications(
                 detail=f"Invalid notification type: {notification_type}"
             )
     
-    notifications, total = await service.get_notifications(
-        page=page,
-        page_size=page_size,
-        notification_type=type_filter,
-        unread_only=unread_only,
-    )
+    try:
+        notifications, total, next_cursor, total_is_estimate = await service.get_notifications(
+            page=page,
+            page_size=page_size,
+            notification_type=type_filter,
+            unread_only=unread_only,
+            cursor=cursor,
+            count_mode=count,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
     
     # Get unread count
     unread_data = await service.get_unread_count()
@@ -94,6 +110,8 @@ async def get_notifications(
         page=page,
         page_size=page_size,
         total_pages=total_pages,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
     )
 
 
@@ -108,6 +126,60 @@ async def get_unread_count(
     return UnreadCountResponse(**counts)
 
 
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@router.get("/admin/notifications/stream")
+async def stream_admin_events(
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """
+    Server-Sent Events stream replacing the unread-count polls.
+
+    Sends a ``counts`` event (the unread-count payload plus
+    ``contact_unread``) on connect and whenever it changes, and a
+    ``notification`` event for each new notification. The stream ends after
+    ``ADMIN_EVENTS_MAX_STREAM_SECONDS`` and the browser reconnects, which
+    re-checks the admin's token.
+    """
+    # Subscribe first so no change between the snapshot and the stream is lost
+    queue = admin_event_hub.subscribe()
+    try:
+        counts = await load_unread_counts(db)
+    except BaseException:
+        admin_event_hub.unsubscribe(queue)
+        raise
+    # Release the pooled connection rather than holding it for the whole stream
+    await db.close()
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield f"retry: {settings.ADMIN_EVENTS_RETRY_MS}\n"
+            yield format_sse("counts", counts)
+            deadline = time.monotonic() + settings.ADMIN_EVENTS_MAX_STREAM_SECONDS
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    admin_event = await asyncio.wait_for(
+                        queue.get(), timeout=min(settings.ADMIN_EVENTS_KEEPALIVE_SECONDS, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line: keeps proxies from timing out an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(admin_event.name, admin_event.data)
+        finally:
+            admin_event_hub.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/admin/notifications/{notification_id}", response_model=AdminNotificationResponse)
 async def get_notification(
     notification_id: UUID,
@@ -25,6 +25,7 @@ from app.schemas.contact import (
 from app.models.contact import ContactStatus
 from app.database.session import get_db
 from app.core.deps import AdminUser
+from app.utils.counting import CountMode
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -164,31 +165,47 @@ async def get_admin_messages(
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     status: Optional[str] = Query(None, description="Filter by status"),
     inquiry_type: Optional[str] = Query(None, description="Filter by inquiry type"),
-    search: Optional[str] = Query(None, description="Search in name, email, subject, message"),
+    search: Optional[str] = Query(
+        None, description="Full-text search in name, email, subject, message; results are ranked by relevance"
+    ),
     unread_only: bool = Query(False, description="Show only unread messages"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(None, description="How to compute totals: exact, cached or estimate"),
     contact_service: ContactService = Depends(get_contact_service),
 ) -> ContactSubmissionListResponse:
     """
     Get paginated list of contact form submissions (admin only).
     """
-    submissions, total, unread_count = await contact_service.get_submissions(
-        page=page,
-        page_size=page_size,
-        status_filter=status,
-        inquiry_type_filter=inquiry_type,
-        search=search,
-        unread_only=unread_only,
-    )
+    try:
+        submissions, total, unread_count, next_cursor, total_is_estimate = await contact_service.get_submissions(
+            page=page,
+            page_size=page_size,
+            status_filter=status,
+            inquiry_type_filter=inquiry_type,
+            search=search,
+            unread_only=unread_only,
+            cursor=cursor,
+            count_mode=count,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    items = [ContactSubmissionDB.model_validate(s) for s in submissions]
+    if search:
+        snippets = await contact_service.search_snippets([s.id for s in submissions], search)
+        items = [item.model_copy(update={"search_snippet": snippets.get(item.id)}) for item in items]
     
     total_pages = math.ceil(total / page_size) if total > 0 else 1
     
     return ContactSubmissionListResponse(
-        items=[ContactSubmissionDB.model_validate(s) for s in submissions],
+        items=items,
         total=total,
         page=page,
         page_size=page_size,
         total_pages=total_pages,
         unread_count=unread_count,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
     )
 
 
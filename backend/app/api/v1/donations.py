@@ -6,17 +6,19 @@ from uuid import UUID
 import logging
 
 from fastapi import APIRouter, HTTPException, status, Query
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, and_
 
 from app.models.donation import OrganizationDonation, DonationStatus
-from app.models.sponsor import Sponsor
 from app.schemas.donation import (
     DonationCreate,
     DonationResponse,
     DonationUpdate,
     DonationListResponse,
 )
-from app.core.deps import CurrentUser, AdminUser, DBSession, OptionalUser
+from app.core.deps import CurrentPrincipal, AdminUser, DBSession, OptionalPrincipal
+from app.utils.counting import CountMode, count_rows
+from app.utils.pagination import keyset_paginate
+from app.utils.streaming import StreamFormat, pydantic_serializer, stream_query_response
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -32,8 +34,19 @@ async def list_donations(
     payment_method: Optional[str] = None,
     student_id: Optional[UUID] = None,
     sponsor_id: Optional[UUID] = None,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(None, description="How to compute total: exact, cached or estimate"),
+    stream: Optional[StreamFormat] = Query(None, description="Stream every matching row as ndjson or a json array"),
 ):
-    """List all donations with filtering (admin only)."""
+    """
+    List all donations with filtering (admin only), newest first.
+    
+    Passing ``next_cursor`` back as ``cursor`` fetches the following page by
+    keyset instead of OFFSET; ``page`` is then only echoed back.
+    
+    With ``stream`` set, paging and the total count are skipped and every
+    matching donation is written out as it is read from the database.
+    """
     # Build query
     query = select(OrganizationDonation)
     
@@ -51,17 +64,31 @@ async def list_donations(
     if filters:
         query = query.where(and_(*filters))
     
+    if stream:
+        return stream_query_response(
+            query.order_by(OrganizationDonation.created_at.desc(), OrganizationDonation.id.desc()),
+            pydantic_serializer(DonationResponse),
+            stream,
+        )
+    
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    total, total_is_estimate = await count_rows(db, query, count)
     
     # Apply pagination
-    offset = (page - 1) * size
-    query = query.offset(offset).limit(size).order_by(OrganizationDonation.created_at.desc())
-    
-    result = await db.execute(query)
-    items = result.scalars().all()
+    try:
+        items, next_cursor = await keyset_paginate(
+            db,
+            query,
+            [OrganizationDonation.created_at, OrganizationDonation.id],
+            size,
+            cursor=cursor,
+            offset=(page - 1) * size,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=400,  # `status` is shadowed by the filter parameter
+            detail="Invalid cursor",
+        )
     
     return DonationListResponse(
         items=[DonationResponse.model_validate(item) for item in items],
@@ -69,6 +96,8 @@ async def list_donations(
         page=page,
         size=size,
         pages=(total + size - 1) // size,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
     )
 
 
@@ -76,19 +105,14 @@ async def list_donations(
 async def create_donation(
     donation_data: DonationCreate,
     db: DBSession,
-    current_user: OptionalUser = None,
+    principal: OptionalPrincipal = None,
 ):
     """Create a new donation."""
     sponsor_id = None
     
     # Link to sponsor if user is authenticated
-    if current_user:
-        result = await db.execute(
-            select(Sponsor).where(Sponsor.user_id == current_user.id)
-        )
-        sponsor = result.scalar_one_or_none()
-        if sponsor:
-            sponsor_id = sponsor.id
+    if principal and principal.sponsor:
+        sponsor_id = principal.sponsor.id
     
     # Determine initial status based on transaction
     initial_status = DonationStatus.PENDING
@@ -124,16 +148,14 @@ async def create_donation(
 @router.get("/me", response_model=DonationListResponse)
 async def get_my_donations(
     db: DBSession,
-    current_user: CurrentUser,
+    principal: CurrentPrincipal,
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(None, description="How to compute total: exact, cached or estimate"),
 ):
     """Get donations made by current user."""
-    # Find sponsor for current user
-    sponsor_result = await db.execute(
-        select(Sponsor).where(Sponsor.user_id == current_user.id)
-    )
-    sponsor = sponsor_result.scalar_one_or_none()
+    sponsor = principal.sponsor
     
     if not sponsor:
         return DonationListResponse(items=[], total=0, page=page, size=size, pages=0)
@@ -144,16 +166,23 @@ async def get_my_donations(
     )
     
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    total, total_is_estimate = await count_rows(db, query, count)
     
     # Apply pagination
-    offset = (page - 1) * size
-    query = query.offset(offset).limit(size).order_by(OrganizationDonation.created_at.desc())
-    
-    result = await db.execute(query)
-    items = result.scalars().all()
+    try:
+        items, next_cursor = await keyset_paginate(
+            db,
+            query,
+            [OrganizationDonation.created_at, OrganizationDonation.id],
+            size,
+            cursor=cursor,
+            offset=(page - 1) * size,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
     
     return DonationListResponse(
         items=[DonationResponse.model_validate(item) for item in items],
@@ -161,6 +190,8 @@ async def get_my_donations(
         page=page,
         size=size,
         pages=(total + size - 1) // size,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
     )
 
 
@@ -168,7 +199,7 @@ async def get_my_donations(
 async def get_donation(
     donation_id: UUID,
     db: DBSession,
-    current_user: OptionalUser = None,
+    principal: OptionalPrincipal = None,
 ):
     """Get donation details."""
     result = await db.execute(
@@ -183,14 +214,11 @@ async def get_donation(
         )
     
     # Check access - admin can see all, sponsors can see their own
-    if current_user:
-        sponsor_result = await db.execute(
-            select(Sponsor).where(Sponsor.user_id == current_user.id)
-        )
-        sponsor = sponsor_result.scalar_one_or_none()
+    if principal:
+        sponsor = principal.sponsor
         
         # Allow if admin or owner
-        if current_user.role != "admin" and (not sponsor or donation.sponsor_id != sponsor.id):
+        if principal.user.role != "admin" and (not sponsor or donation.sponsor_id != sponsor.id):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied",
@@ -204,7 +232,7 @@ async def update_donation(
     donation_id: UUID,
     update_data: DonationUpdate,
     db: DBSession,
-    current_user: CurrentUser,
+    principal: CurrentPrincipal,
 ):
     """Update donation (admin or owner only)."""
     result = await db.execute(
@@ -219,11 +247,8 @@ async def update_donation(
         )
     
     # Check access
-    if current_user.role != "admin":
-        sponsor_result = await db.execute(
-            select(Sponsor).where(Sponsor.user_id == current_user.id)
-        )
-        sponsor = sponsor_result.scalar_one_or_none()
+    if principal.user.role != "admin":
+        sponsor = principal.sponsor
         
         if not sponsor or donation.sponsor_id != sponsor.id:
             raise HTTPException(
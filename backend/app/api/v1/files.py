@@ -1,16 +1,18 @@
 """
 File serving API routes.
 """
+from typing import Optional
 from uuid import UUID
-import io
 
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 
 from app.models.student import Student
 from app.core.deps import CurrentUser, DBSession
-from app.services.file_service import file_storage_service
+from app.services.file_service import file_storage_service, mime_type_for
+from app.utils.file_responses import file_response
+from app.utils.images import PROFILE_IMAGE_VARIANTS, variant_filename
 
 router = APIRouter()
 
@@ -19,6 +21,7 @@ router = APIRouter()
 async def serve_file(
     student_id: str,
     filename: str,
+    request: Request,
     db: DBSession,
     current_user: CurrentUser,
 ):
@@ -44,34 +47,32 @@ async def serve_file(
             if current_user.role.value == "student" and student.user_id != current_user.id:
                 raise HTTPException(status_code=403, detail="Not authorized")
         
-        # Download file (will decrypt if encrypted)
-        file_data, was_encrypted = await file_storage_service.download_file(
+        if not is_encrypted_file:
+            return await file_response(
+                request,
+                file_storage_service.file_path(student_id, filename),
+                media_type=mime_type_for(filename),
+                headers={"Cache-Control": "public, max-age=3600"},
+            )
+        
+        # Encrypted documents are decrypted as they stream out
+        chunks, _ = file_storage_service.stream_file(
             student_id=student_id,
             filename=filename,
         )
         
-        # Determine content type
-        content_type = "application/octet-stream"
-        lower_filename = filename.lower()
-        if ".jpg" in lower_filename or ".jpeg" in lower_filename:
-            content_type = "image/jpeg"
-        elif ".png" in lower_filename:
-            content_type = "image/png"
-        elif ".webp" in lower_filename:
-            content_type = "image/webp"
-        elif ".pdf" in lower_filename:
-            content_type = "application/pdf"
-        
         return StreamingResponse(
-            io.BytesIO(file_data),
-            media_type=content_type,
+            chunks,
+            media_type=mime_type_for(filename),
             headers={
-                "Cache-Control": "public, max-age=3600" if not was_encrypted else "private, no-cache",
+                "Cache-Control": "private, no-cache",
             },
         )
         
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error serving file: {str(e)}")
 
@@ -80,32 +81,44 @@ async def serve_file(
 async def serve_public_file(
     student_id: str,
     filename: str,
+    request: Request,
+    size: Optional[str] = Query(None, pattern=f"^({'|'.join(PROFILE_IMAGE_VARIANTS)})$"),
 ):
     """
     Serve public files like profile photos without authentication.
     Only non-encrypted files are served through this endpoint.
+    
+    ``size`` selects a resized WebP variant of a profile photo. Until the
+    variant has been generated the original is served, marked for
+    revalidation so clients pick up the variant once it exists.
     """
     # Don't allow serving encrypted files through public endpoint
     if filename.startswith("enc_"):
         raise HTTPException(status_code=403, detail="Cannot access encrypted files publicly")
     
     try:
-        file_data, _ = await file_storage_service.download_file(
-            student_id=student_id,
-            filename=filename,
-        )
+        if size:
+            try:
+                return await file_response(
+                    request,
+                    file_storage_service.file_path(student_id, variant_filename(filename, size)),
+                    media_type="image/webp",
+                    headers={"Cache-Control": "public, max-age=86400"},
+                )
+            except FileNotFoundError:
+                return await file_response(
+                    request,
+                    file_storage_service.file_path(student_id, filename),
+                    media_type=mime_type_for(filename, default="image/jpeg"),
+                    headers={"Cache-Control": "no-cache"},
+                )
         
-        # Determine content type
-        content_type = "image/jpeg"
-        lower_filename = filename.lower()
-        if ".png" in lower_filename:
-            content_type = "image/png"
-        elif ".webp" in lower_filename:
-            content_type = "image/webp"
-        
-        return StreamingResponse(
-            io.BytesIO(file_data),
-            media_type=content_type,
+        # Served from disk (sendfile where available) with ETag/Last-Modified,
+        # conditional 304s and byte ranges
+        return await file_response(
+            request,
+            file_storage_service.file_path(student_id, filename),
+            media_type=mime_type_for(filename, default="image/jpeg"),
             headers={
                 "Cache-Control": "public, max-age=86400",  # Cache for 24 hours
             },
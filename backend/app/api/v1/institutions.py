@@ -16,7 +16,7 @@ from app.schemas.institution import (
     InstitutionResponse,
     InstitutionDetailResponse,
 )
-from app.core.deps import CurrentUser, AdminUser, DBSession
+from app.core.deps import CurrentUser, CurrentPrincipal, AdminUser, DBSession
 
 router = APIRouter()
 
@@ -70,13 +70,10 @@ async def create_institution(
 @router.get("/me", response_model=InstitutionDetailResponse)
 async def get_my_institution(
     db: DBSession,
-    current_user: CurrentUser,
+    principal: CurrentPrincipal,
 ):
     """Get current user's institution profile."""
-    result = await db.execute(
-        select(Institution).where(Institution.user_id == current_user.id)
-    )
-    institution = result.scalar_one_or_none()
+    institution = principal.institution
     
     if not institution:
         raise HTTPException(
@@ -27,6 +27,7 @@ from app.schemas.payment import (
 from app.core.deps import CurrentUser, DBSession, OptionalUser
 from app.core.config import settings
 from app.services.mpesa_service import mpesa_service
+from app.services.webhook_service import PaymentWebhookService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -102,7 +103,7 @@ async def initiate_transaction(
         currency=request.currency,
         payment_method=PaymentMethod(request.payment_method),
         phone_number=request.phone_number,
-        metadata=request.metadata or {},
+        tx_metadata=request.metadata or {},
         status=TransactionStatus.INITIATED,
     )
     
@@ -134,7 +135,7 @@ async def process_mpesa_payment(
             detail="Transaction not found",
         )
     
-    mpesa_result = mpesa_service.initiate_stk_push(
+    mpesa_result = await mpesa_service.initiate_stk_push(
         phone_number=request.phone_number,
         amount=request.amount,
         account_reference=request.account_reference,
@@ -156,8 +157,9 @@ async def process_mpesa_payment(
     # Update transaction with M-Pesa details
     transaction.status = TransactionStatus.PENDING
     transaction.phone_number = request.phone_number
-    transaction.metadata = {
-        **transaction.metadata,
+    transaction.checkout_request_id = mpesa_result.get('checkout_request_id')
+    transaction.tx_metadata = {
+        **transaction.tx_metadata,
         "checkout_request_id": mpesa_result.get('checkout_request_id'),
         "merchant_request_id": mpesa_result.get('merchant_request_id'),
         "account_reference": request.account_reference,
@@ -184,56 +186,21 @@ async def mpesa_callback(
     """
     M-Pesa callback endpoint.
     Safaricom calls this endpoint when payment is completed/failed.
+
+    The callback is stored in the webhook inbox and acknowledged at once;
+    the webhook workers apply it to the transaction. If it can't be stored
+    the request fails so Safaricom retries it.
     """
     try:
         callback_data = await request.json()
-        logger.info(f"M-Pesa callback received: {callback_data}")
-        
-        # Process callback
-        processed = mpesa_service.process_callback(callback_data)
-        
-        if not processed.get('checkout_request_id'):
-            logger.warning("No checkout_request_id in callback")
-            return {"ResultCode": 0, "ResultDesc": "Accepted"}
-        
-        # Find transaction by checkout_request_id
-        result = await db.execute(
-            select(PaymentTransaction).where(
-                PaymentTransaction.metadata['checkout_request_id'].astext == processed['checkout_request_id']
-            )
-        )
-        transaction = result.scalar_one_or_none()
-        
-        if not transaction:
-            logger.warning(f"Transaction not found for checkout_request_id: {processed['checkout_request_id']}")
-            return {"ResultCode": 0, "ResultDesc": "Accepted"}
-        
-        # Update transaction based on result
-        if processed.get('success') and processed.get('result_code') == 0:
-            transaction.status = TransactionStatus.COMPLETED
-            transaction.completed_at = datetime.now(timezone.utc)
-            transaction.metadata = {
-                **transaction.metadata,
-                "mpesa_receipt_number": processed.get('mpesa_receipt_number'),
-                "transaction_date": processed.get('transaction_date'),
-                "result_desc": processed.get('result_desc'),
-            }
-            logger.info(f"M-Pesa payment completed: {transaction.reference_id} - Receipt: {processed.get('mpesa_receipt_number')}")
-        else:
-            transaction.status = TransactionStatus.FAILED
-            transaction.failed_at = datetime.now(timezone.utc)
-            transaction.failure_reason = processed.get('result_desc', 'Payment failed')
-            logger.warning(f"M-Pesa payment failed: {transaction.reference_id} - {transaction.failure_reason}")
-        
-        await db.commit()
-        
-        # Return success response to M-Pesa
-        return {"ResultCode": 0, "ResultDesc": "Accepted"}
-        
-    except Exception as e:
-        logger.error(f"Error processing M-Pesa callback: {str(e)}", exc_info=True)
-        # Always return success to M-Pesa to avoid retries
+    except ValueError:
+        logger.warning("Malformed M-Pesa callback body")
         return {"ResultCode": 0, "ResultDesc": "Accepted"}
+    
+    logger.info(f"M-Pesa callback received: {callback_data}")
+    await PaymentWebhookService(db).enqueue("mpesa", callback_data)
+    
+    return {"ResultCode": 0, "ResultDesc": "Accepted"}
 
 
 @router.post("/airtel/process", response_model=AirtelPaymentResponse)
@@ -258,8 +225,8 @@ async def process_airtel_payment(
     
     transaction.status = TransactionStatus.PENDING
     transaction.phone_number = request.phone_number
-    transaction.metadata = {
-        **transaction.metadata,
+    transaction.tx_metadata = {
+        **transaction.tx_metadata,
         "airtel_transaction_id": airtel_transaction_id,
         "account_reference": request.account_reference,
     }
@@ -307,8 +274,8 @@ async def process_card_payment(
     transaction.completed_at = datetime.now(timezone.utc)
     transaction.card_last4 = "****"  # Never store actual card data
     transaction.card_brand = "tokenized"
-    transaction.metadata = {
-        **transaction.metadata,
+    transaction.tx_metadata = {
+        **transaction.tx_metadata,
         "transaction_ref": transaction_ref,
         "authorization_code": f"AUTH{secrets.token_hex(6)}",
         "billing_name": request.billing_name,
@@ -322,7 +289,7 @@ async def process_card_payment(
         success=True,
         message="Payment processed successfully",
         transaction_ref=transaction_ref,
-        authorization_code=transaction.metadata.get("authorization_code"),
+        authorization_code=transaction.tx_metadata.get("authorization_code"),
         card_last4=transaction.card_last4,
         card_brand=transaction.card_brand,
     )
@@ -353,8 +320,9 @@ async def create_paypal_order(
     approval_url = f"https://www.sandbox.paypal.com/checkoutnow?token={order_id}"
     
     transaction.status = TransactionStatus.PENDING
-    transaction.metadata = {
-        **transaction.metadata,
+    transaction.paypal_order_id = order_id
+    transaction.tx_metadata = {
+        **transaction.tx_metadata,
         "paypal_order_id": order_id,
         "return_url": request.return_url,
         "cancel_url": request.cancel_url,
@@ -391,8 +359,7 @@ async def capture_paypal_payment(
         )
     
     # Verify order ID matches
-    stored_order_id = transaction.metadata.get("paypal_order_id")
-    if stored_order_id != request.order_id:
+    if transaction.paypal_order_id != request.order_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Order ID mismatch",
@@ -403,8 +370,8 @@ async def capture_paypal_payment(
     
     transaction.status = TransactionStatus.COMPLETED
     transaction.completed_at = datetime.now(timezone.utc)
-    transaction.metadata = {
-        **transaction.metadata,
+    transaction.tx_metadata = {
+        **transaction.tx_metadata,
         "paypal_capture_id": capture_id,
     }
     
@@ -450,8 +417,9 @@ async def initiate_bank_transfer(
     }
     
     transaction.status = TransactionStatus.PENDING
-    transaction.metadata = {
-        **transaction.metadata,
+    transaction.bank_transfer_reference = reference
+    transaction.tx_metadata = {
+        **transaction.tx_metadata,
         "bank_transfer_reference": reference,
         "donor_name": request.donor_name,
         "donor_email": request.donor_email,
@@ -483,7 +451,7 @@ async def confirm_bank_transfer(
     # Find transaction by reference
     result = await db.execute(
         select(PaymentTransaction).where(
-            PaymentTransaction.metadata["bank_transfer_reference"].astext == reference
+            PaymentTransaction.bank_transfer_reference == reference
         )
     )
     transaction = result.scalar_one_or_none()
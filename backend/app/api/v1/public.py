@@ -419,8 +419,9 @@ from fastapi import APIRouter, Query, HTTPException, status
 from sqlalchemy import select
 
 from app.models.institution import Institution, ComplianceStatus, InstitutionType
-from app.schemas.institution import InstitutionResponse
+from app.schemas.institution import InstitutionResponse, InstitutionSuggestion
 from app.core.deps import DBSession
+from app.services.institution_suggest_service import institution_suggester
 
 router = APIRouter()
 
@@ -511,6 +512,44 @@ async def list_higher_learning_institutions(
     return result.scalars().all()
 
 
+# Institution types each suggest filter accepts
+SUGGEST_TYPES = {
+    "secondary_school": [InstitutionType.SECONDARY_SCHOOL],
+    "university": [InstitutionType.UNIVERSITY],
+    "college": [InstitutionType.COLLEGE],
+    "vocational": [InstitutionType.VOCATIONAL],
+    "higher_learning": [InstitutionType.UNIVERSITY, InstitutionType.COLLEGE],
+}
+
+
+@router.get("/institutions/suggest", response_model=List[InstitutionSuggestion])
+async def suggest_institutions(
+    db: DBSession,
+    q: str = Query(..., min_length=1, max_length=100, description="What the user has typed so far"),
+    institution_type: Optional[str] = Query(
+        None, description=f"Restrict to one of: {', '.join(SUGGEST_TYPES)}"
+    ),
+    limit: int = Query(10, ge=1, le=20),
+):
+    """
+    Typeahead for the student registration institution picker.
+    
+    Returns the best-matching active institutions, ranked by how closely
+    their name matches ``q`` (prefix matches first, then fuzzy matches, so
+    typos still find the institution).
+    """
+    types = None
+    if institution_type:
+        if institution_type not in SUGGEST_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid institution type. Must be one of: {', '.join(SUGGEST_TYPES)}"
+            )
+        types = SUGGEST_TYPES[institution_type]
+    
+    return await institution_suggester.suggest(db, q, types, limit)
+
+
 @router.get("/institutions/{institution_id}/validate")
 async def validate_institution_for_registration(
     institution_id: UUID,
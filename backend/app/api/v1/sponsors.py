@@ -2,12 +2,12 @@
 Sponsor management API routes.
 All endpoints require authentication with credentials.
 """
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from uuid import UUID
 from decimal import Decimal
 
 from fastapi import APIRouter, HTTPException, status, Query
-from sqlalchemy import select, func
+from sqlalchemy import select, func, case
 from sqlalchemy.orm import selectinload
 
 from app.models.sponsor import Sponsor
@@ -23,40 +23,35 @@ from app.schemas.sponsor import (
     SponsorshipResponse,
     SponsorshipDetailResponse,
 )
-from app.core.deps import CurrentUser, AdminUser, DBSession
+from app.core.deps import CurrentUser, CurrentPrincipal, AdminUser, DBSession
+from app.utils.pagination import apply_cursor, encode_cursor
+from app.utils.streaming import StreamFormat, dict_serializer, stream_rows, streaming_json_response
+from app.utils.images import profile_photo_variants
 
 router = APIRouter()
 
 
-@router.get("/institutions-with-students")
-async def get_institutions_with_students(
-    db: DBSession,
-    current_user: CurrentUser,  # Requires authentication
-) -> Dict[str, Any]:
-    """
-    Get all active institutions with their students.
-    Requires authentication - sponsors must be logged in.
-    
-    Returns ALL students with their sponsorship status:
-    - unsponsored: no sponsorships or balance_due == total_fees
-    - partially_sponsored: has sponsorships but balance_due > 0
-    - fully_sponsored: balance_due == 0 or amount_paid >= total_fees
-    """
-    # Fetch all active institutions
-    inst_query = select(Institution).where(
-        Institution.compliance_status == ComplianceStatus.ACTIVE
-    )
-    inst_result = await db.execute(inst_query)
-    institutions = inst_result.scalars().all()
-    
-    # Fetch students with fee balances and sponsorships for each institution
-    grouped_students: Dict[str, Dict[str, Any]] = {}
-    institutions_list: List[Dict[str, Any]] = []
-    total_students = 0
-    total_needed = Decimal("0")
-    
-    for institution in institutions:
-        inst_data = {
+def _sponsorship_status(
+    total_fees: Decimal,
+    amount_paid: Decimal,
+    balance_due: Decimal,
+    has_sponsorships: bool,
+) -> str:
+    """Classify a student's funding state from their fee balance."""
+    if total_fees > 0:
+        if balance_due <= 0 or amount_paid >= total_fees:
+            return "fully_sponsored"
+        if has_sponsorships or amount_paid > 0:
+            return "partially_sponsored"
+        return "unsponsored"
+    # No fee balance record - treat as unsponsored with no fees
+    return "no_fees_recorded"
+
+
+def _institution_group(institution: Institution) -> Dict[str, Any]:
+    """Start an institution card with empty student tallies."""
+    return {
+        "institution": {
             "id": str(institution.id),
             "name": institution.name,
             "email": institution.email,
@@ -76,120 +71,242 @@ async def get_institutions_with_students(
             "is_verified": institution.is_verified,
             "compliance_status": institution.compliance_status.value if institution.compliance_status else "active",
             "student_count": 0,
-            "total_balance_needed": 0.0,
+            "total_balance_needed": Decimal("0"),
             "unsponsored_count": 0,
             "partially_sponsored_count": 0,
             "fully_sponsored_count": 0,
-        }
-        
-        students_query = (
-            select(Student)
-            .options(
-                selectinload(Student.fee_balance),
-                selectinload(Student.sponsorships),
-            )
-            .where(
-                Student.institution_id == institution.id,
-                Student.compliance_status == ComplianceStatus.ACTIVE,
+        },
+        "students": [],
+    }
+
+
+def _add_student(group: Dict[str, Any], student: Any) -> Decimal:
+    """
+    Append one joined student row to its institution group.
+
+    Returns the student's outstanding balance.
+    """
+    inst_data = group["institution"]
+    
+    total_fees = Decimal(str(student.total_fees or 0))
+    amount_paid = Decimal(str(student.amount_paid or 0))
+    balance_due = Decimal(str(student.balance_due or 0))
+    amount_raised = Decimal(str(student.amount_raised or 0))
+    sponsorship_count = student.sponsorship_count or 0
+    
+    sponsorship_status = _sponsorship_status(
+        total_fees, amount_paid, balance_due, sponsorship_count > 0
+    )
+    if sponsorship_status == "fully_sponsored":
+        inst_data["fully_sponsored_count"] += 1
+    elif sponsorship_status in ("partially_sponsored", "unsponsored"):
+        if sponsorship_status == "partially_sponsored":
+            inst_data["partially_sponsored_count"] += 1
+        else:
+            inst_data["unsponsored_count"] += 1
+        inst_data["total_balance_needed"] += balance_due
+    else:
+        inst_data["unsponsored_count"] += 1
+    
+    group["students"].append({
+        "id": str(student.id),
+        "full_name": student.full_name,
+        "date_of_birth": student.date_of_birth.isoformat() if student.date_of_birth else None,
+        "gender": student.gender,
+        "grade_level": student.grade_level,
+        "location": student.location,
+        "photo_url": student.photo_url,
+        "photo_variants": profile_photo_variants(student.photo_url),
+        "background_story": student.background_story,
+        "family_situation": student.family_situation,
+        "academic_performance": student.academic_performance,
+        "need_level": student.need_level,
+        "is_verified": student.is_verified,
+        "institution_id": inst_data["id"],
+        "sponsorship_status": sponsorship_status,
+        "amount_raised": float(amount_raised),
+        "funding_goal": float(total_fees),
+        "fee_balance": {
+            "total_fees": float(total_fees),
+            "amount_paid": float(amount_paid),
+            "balance_due": float(balance_due),
+        },
+        "sponsorship_count": sponsorship_count,
+    })
+    inst_data["student_count"] += 1
+    return balance_due
+
+
+def _finish_group(group: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert the accumulated institution balance for JSON output."""
+    group["institution"]["total_balance_needed"] = float(group["institution"]["total_balance_needed"])
+    return group
+
+
+def _students_with_totals_query(institution_ids: List[UUID]):
+    """
+    Active students of the given institutions, joined to their fee balance
+    and to per-student sponsorship totals aggregated in SQL.
+    """
+    sponsorship_totals = (
+        select(
+            Sponsorship.student_id,
+            func.sum(Sponsorship.amount).label("amount_raised"),
+            func.count(Sponsorship.id).label("sponsorship_count"),
+        )
+        .where(Sponsorship.status.in_([SponsorshipStatus.ACTIVE, SponsorshipStatus.COMPLETED]))
+        .group_by(Sponsorship.student_id)
+        .subquery()
+    )
+    
+    return (
+        select(
+            Student.id,
+            Student.full_name,
+            Student.date_of_birth,
+            Student.gender,
+            Student.grade_level,
+            Student.location,
+            Student.photo_url,
+            Student.background_story,
+            Student.family_situation,
+            Student.academic_performance,
+            Student.need_level,
+            Student.is_verified,
+            Student.institution_id,
+            StudentFeeBalance.total_fees,
+            StudentFeeBalance.amount_paid,
+            StudentFeeBalance.balance_due,
+            sponsorship_totals.c.amount_raised,
+            sponsorship_totals.c.sponsorship_count,
+        )
+        .outerjoin(StudentFeeBalance, StudentFeeBalance.student_id == Student.id)
+        .outerjoin(sponsorship_totals, sponsorship_totals.c.student_id == Student.id)
+        .where(
+            Student.institution_id.in_(institution_ids),
+            Student.compliance_status == ComplianceStatus.ACTIVE,
+        )
+    )
+
+
+async def _stream_institution_groups(institutions: List[Institution]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield one finished institution group at a time.
+
+    Students are read ordered by institution position, so each group can be
+    emitted (and dropped) as soon as the next institution's rows begin.
+    """
+    if not institutions:
+        return
+    
+    position = case(
+        {institution.id: index for index, institution in enumerate(institutions)},
+        value=Student.institution_id,
+    )
+    query = _students_with_totals_query([institution.id for institution in institutions]).order_by(position)
+    
+    pending = iter(institutions)
+    current = _institution_group(next(pending))
+    async for student in stream_rows(query, scalars=False):
+        while current["institution"]["id"] != str(student.institution_id):
+            yield _finish_group(current)
+            current = _institution_group(next(pending))
+        _add_student(current, student)
+    
+    yield _finish_group(current)
+    for institution in pending:
+        yield _finish_group(_institution_group(institution))
+
+
+@router.get("/institutions-with-students")
+async def get_institutions_with_students(
+    db: DBSession,
+    current_user: CurrentUser,  # Requires authentication
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Institutions per page (enables pagination)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    stream: Optional[StreamFormat] = Query(None, description="Stream one institution group at a time as ndjson or a json array"),
+) -> Dict[str, Any]:
+    """
+    Get all active institutions with their students.
+    Requires authentication - sponsors must be logged in.
+    
+    Returns ALL students with their sponsorship status:
+    - unsponsored: no sponsorships or balance_due == total_fees
+    - partially_sponsored: has sponsorships but balance_due > 0
+    - fully_sponsored: balance_due == 0 or amount_paid >= total_fees
+    
+    Pass ``limit`` to page through institutions ordered by name; the response
+    then carries ``next_cursor`` and the stats cover the returned page only.
+    
+    With ``stream`` set, each ``{"institution": ..., "students": [...]}``
+    group is written out as soon as its students have been read; the
+    page-level ``stats`` are omitted, and ``next_cursor`` is sent in the
+    ``X-Next-Cursor`` header since the body is already being written.
+    
+    Runs two queries regardless of institution count: one for the
+    institutions, and one streamed query for their students joined to fee
+    balances and per-student sponsorship totals aggregated in SQL.
+    """
+    # Fetch active institutions (one page of them in cursor mode)
+    inst_query = (
+        select(Institution)
+        .where(Institution.compliance_status == ComplianceStatus.ACTIVE)
+        .order_by(Institution.name, Institution.id)
+    )
+    if cursor:
+        try:
+            inst_query = apply_cursor(inst_query, [Institution.name, Institution.id], cursor, descending=False)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
             )
+    if limit:
+        inst_query = inst_query.limit(limit + 1)
+    
+    inst_result = await db.execute(inst_query)
+    institutions = list(inst_result.scalars().all())
+    
+    next_cursor = None
+    if limit and len(institutions) > limit:
+        institutions = institutions[:limit]
+        next_cursor = encode_cursor([institutions[-1].name, institutions[-1].id])
+    
+    if stream:
+        return streaming_json_response(
+            _stream_institution_groups(institutions),
+            dict_serializer,
+            stream,
+            headers={"X-Next-Cursor": next_cursor} if next_cursor else None,
         )
-        students_result = await db.execute(students_query)
-        students = students_result.scalars().all()
-        
-        all_students = []
-        institution_balance_needed = Decimal("0")
-        unsponsored_count = 0
-        partially_sponsored_count = 0
-        fully_sponsored_count = 0
-        
-        for student in students:
-            total_fees = Decimal("0")
-            amount_paid = Decimal("0")
-            balance_due = Decimal("0")
-            
-            if student.fee_balance:
-                total_fees = Decimal(str(student.fee_balance.total_fees or 0))
-                amount_paid = Decimal(str(student.fee_balance.amount_paid or 0))
-                balance_due = Decimal(str(student.fee_balance.balance_due or 0))
-            
-            amount_raised = Decimal("0")
-            active_sponsorships = [
-                s for s in student.sponsorships 
-                if s.status in [SponsorshipStatus.ACTIVE, SponsorshipStatus.COMPLETED]
-            ]
-            for sponsorship in active_sponsorships:
-                amount_raised += Decimal(str(sponsorship.amount or 0))
-            
-            has_sponsorships = len(active_sponsorships) > 0
-            
-            if total_fees > 0:
-                if balance_due <= 0 or amount_paid >= total_fees:
-                    sponsorship_status = "fully_sponsored"
-                    fully_sponsored_count += 1
-                elif has_sponsorships or amount_paid > 0:
-                    sponsorship_status = "partially_sponsored"
-                    partially_sponsored_count += 1
-                    institution_balance_needed += balance_due
-                else:
-                    sponsorship_status = "unsponsored"
-                    unsponsored_count += 1
-                    institution_balance_needed += balance_due
-            else:
-                # No fee balance record - treat as unsponsored with no fees
-                sponsorship_status = "no_fees_recorded"
-                unsponsored_count += 1
-            
-            student_data = {
-                "id": str(student.id),
-                "full_name": student.full_name,
-                "date_of_birth": student.date_of_birth.isoformat() if student.date_of_birth else None,
-                "gender": student.gender,
-                "grade_level": student.grade_level,
-                "location": student.location,
-                "photo_url": student.photo_url,
-                "background_story": student.background_story,
-                "family_situation": student.family_situation,
-                "academic_performance": student.academic_performance,
-                "need_level": student.need_level,
-                "is_verified": student.is_verified,
-                "institution_id": str(student.institution_id),
-                "sponsorship_status": sponsorship_status,
-                "amount_raised": float(amount_raised),
-                "funding_goal": float(total_fees),
-                "fee_balance": {
-                    "total_fees": float(total_fees),
-                    "amount_paid": float(amount_paid),
-                    "balance_due": float(balance_due),
-                },
-                "sponsorship_count": len(active_sponsorships),
-            }
-            all_students.append(student_data)
-            
+    
+    grouped_students: Dict[str, Dict[str, Any]] = {
+        str(institution.id): _institution_group(institution) for institution in institutions
+    }
+    total_students = 0
+    total_needed = Decimal("0")
+    
+    if institutions:
+        students_query = _students_with_totals_query([institution.id for institution in institutions])
+        students_result = await db.stream(students_query)
+        async for student in students_result:
+            balance_due = _add_student(grouped_students[str(student.institution_id)], student)
+            total_students += 1
             if balance_due > 0:
                 total_needed += balance_due
-        
-        inst_data["student_count"] = len(all_students)
-        inst_data["total_balance_needed"] = float(institution_balance_needed)
-        inst_data["unsponsored_count"] = unsponsored_count
-        inst_data["partially_sponsored_count"] = partially_sponsored_count
-        inst_data["fully_sponsored_count"] = fully_sponsored_count
-        total_students += len(all_students)
-        
-        grouped_students[str(institution.id)] = {
-            "institution": inst_data,
-            "students": all_students,
-        }
-        
-        institutions_list.append(inst_data)
+    
+    for group in grouped_students.values():
+        _finish_group(group)
     
     return {
         "grouped_students": grouped_students,
-        "institutions": institutions_list,
+        "institutions": [group["institution"] for group in grouped_students.values()],
         "stats": {
             "total_students": total_students,
-            "total_institutions": len(institutions_list),
+            "total_institutions": len(grouped_students),
             "total_needed": float(total_needed),
         },
+        "next_cursor": next_cursor,
     }
 
 
@@ -232,15 +349,9 @@ async def get_student_for_sponsorship(
     ]
     amount_raised = sum(Decimal(str(s.amount or 0)) for s in active_sponsorships)
     
-    if total_fees > 0:
-        if balance_due <= 0 or amount_paid >= total_fees:
-            sponsorship_status = "fully_sponsored"
-        elif len(active_sponsorships) > 0 or amount_paid > 0:
-            sponsorship_status = "partially_sponsored"
-        else:
-            sponsorship_status = "unsponsored"
-    else:
-        sponsorship_status = "no_fees_recorded"
+    sponsorship_status = _sponsorship_status(
+        total_fees, amount_paid, balance_due, len(active_sponsorships) > 0
+    )
     
     return {
         "id": str(student.id),
@@ -250,6 +361,7 @@ async def get_student_for_sponsorship(
         "grade_level": student.grade_level,
         "location": student.location,
         "photo_url": student.photo_url,
+        "photo_variants": profile_photo_variants(student.photo_url),
         "background_story": student.background_story,
         "family_situation": student.family_situation,
         "academic_performance": student.academic_performance,
@@ -323,14 +435,10 @@ async def list_sponsors(
 
 @router.get("/me", response_model=SponsorResponse)
 async def get_my_sponsor_profile(
-    db: DBSession,
-    current_user: CurrentUser,
+    principal: CurrentPrincipal,
 ):
     """Get current user's sponsor profile."""
-    result = await db.execute(
-        select(Sponsor).where(Sponsor.user_id == current_user.id)
-    )
-    sponsor = result.scalar_one_or_none()
+    sponsor = principal.sponsor
     
     if not sponsor:
         raise HTTPException(
@@ -344,13 +452,10 @@ async def get_my_sponsor_profile(
 @router.get("/me/sponsorships", response_model=List[SponsorshipDetailResponse])
 async def get_my_sponsorships(
     db: DBSession,
-    current_user: CurrentUser,
+    principal: CurrentPrincipal,
 ):
     """Get current user's sponsorships."""
-    result = await db.execute(
-        select(Sponsor).where(Sponsor.user_id == current_user.id)
-    )
-    sponsor = result.scalar_one_or_none()
+    sponsor = principal.sponsor
     
     if not sponsor:
         return []
@@ -377,14 +482,13 @@ async def get_my_sponsorships(
 async def create_sponsorship(
     sponsorship_data: SponsorshipCreate,
     db: DBSession,
-    current_user: CurrentUser,
+    principal: CurrentPrincipal,
 ):
     """Create a new sponsorship."""
+    current_user = principal.user
+    
     # Get or create sponsor record
-    result = await db.execute(
-        select(Sponsor).where(Sponsor.user_id == current_user.id)
-    )
-    sponsor = result.scalar_one_or_none()
+    sponsor = principal.sponsor
     
     if not sponsor:
         # Create sponsor record
@@ -1,17 +1,19 @@
 """
 Statistics API routes.
 """
-from typing import Dict, Any
-from fastapi import APIRouter
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Query
+from sqlalchemy import select, func, true
 
 from app.models.student import Student
 from app.models.sponsor import Sponsor
 from app.models.sponsorship import Sponsorship, SponsorshipStatus
 from app.models.donation import OrganizationDonation
 from app.models.institution import Institution
-from app.core.deps import CurrentUser, DBSession
+from app.core.deps import AdminUser, CurrentPrincipal, CurrentUser, DBSession
+from app.core.user_cache import user_cache_stats
+from app.services.stats_service import StatsService
 
 router = APIRouter()
 
@@ -21,175 +23,151 @@ async def get_impact_stats(
     db: DBSession,
     current_user: CurrentUser,
 ) -> Dict[str, Any]:
-    """Get platform-wide impact statistics."""
-    
-    # Count total students
-    students_result = await db.execute(select(func.count(Student.id)))
-    total_students = students_result.scalar() or 0
-    
-    # Count sponsors
-    sponsors_result = await db.execute(select(func.count(Sponsor.id)))
-    total_sponsors = sponsors_result.scalar() or 0
-    
-    # Count active sponsorships
-    active_sponsorships_result = await db.execute(
-        select(func.count(Sponsorship.id)).where(Sponsorship.status == SponsorshipStatus.ACTIVE)
-    )
-    active_sponsorships = active_sponsorships_result.scalar() or 0
-    
-    # Calculate total funds raised (from sponsorships - sum of commitment amounts)
-    funds_result = await db.execute(
-        select(func.sum(Sponsorship.amount)).where(
-            Sponsorship.status.in_([SponsorshipStatus.ACTIVE, SponsorshipStatus.COMPLETED])
-        )
-    )
-    total_fund_raised = funds_result.scalar() or 0
-    
-    # Calculate total donations
-    donations_result = await db.execute(
-        select(func.sum(OrganizationDonation.amount))
-    )
-    total_donations = donations_result.scalar() or 0
-    
-    # Count unique locations (counties) served
-    locations_result = await db.execute(
-        select(func.count(func.distinct(Institution.county))).where(Institution.county.isnot(None))
-    )
-    locations_served = locations_result.scalar() or 0
-    
-    return {
-        "total_students": total_students,
-        "total_sponsors": total_sponsors,
-        "total_fund_raised": float(total_fund_raised),
-        "active_sponsorships": active_sponsorships,
-        "total_donations": float(total_donations),
-        "locations_served": locations_served,
-    }
+    """Get platform-wide impact statistics, served from the stats snapshot."""
+    return await StatsService(db).get_impact_stats()
 
 
 @router.get("/admin/dashboard")
 async def get_admin_dashboard_stats(
     db: DBSession,
     current_user: CurrentUser,
+    as_of: Optional[date] = Query(None, description="Report figures as of the end of this date"),
 ) -> Dict[str, Any]:
-    """Get admin dashboard statistics."""
+    """
+    Get admin dashboard statistics.
+
+    Every figure is computed with one ``FILTER (WHERE ...)`` aggregate per
+    table, and the per-table aggregates are cross-joined into a single
+    statement so the whole dashboard costs one round trip.
+    """
     from app.models.user import User
     from app.models.payment import PaymentTransaction, TransactionStatus
-    from datetime import datetime, timedelta
-    
-    # Users count
-    users_result = await db.execute(select(func.count(User.id)))
-    total_users = users_result.scalar() or 0
-    
-    # Students
-    students_result = await db.execute(select(func.count(Student.id)))
-    total_students = students_result.scalar() or 0
-    
-    # Institutions
-    institutions_result = await db.execute(select(func.count(Institution.id)))
-    total_institutions = institutions_result.scalar() or 0
-    
-    # Sponsors
-    sponsors_result = await db.execute(select(func.count(Sponsor.id)))
-    total_sponsors = sponsors_result.scalar() or 0
-    
-    # Active sponsorships
-    active_sponsorships_result = await db.execute(
-        select(func.count(Sponsorship.id)).where(Sponsorship.status == SponsorshipStatus.ACTIVE)
-    )
-    active_sponsorships = active_sponsorships_result.scalar() or 0
-    
-    # Revenue
-    revenue_result = await db.execute(
-        select(func.sum(PaymentTransaction.amount))
-        .where(PaymentTransaction.status == TransactionStatus.COMPLETED)
-    )
-    total_revenue = revenue_result.scalar() or 0
-    
-    # Donations
-    donations_result = await db.execute(select(func.sum(OrganizationDonation.amount)))
-    total_donations = donations_result.scalar() or 0
-    
-    # Payment statuses
-    completed_payments_result = await db.execute(
-        select(func.count(PaymentTransaction.id))
-        .where(PaymentTransaction.status == TransactionStatus.COMPLETED)
+
+    # Window: everything created up to the end of `as_of` (or now), with the
+    # "this month" figures covering the 30 days before that point.
+    if as_of:
+        window_end = datetime.combine(as_of + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    else:
+        window_end = datetime.now(timezone.utc)
+    window_start = window_end - timedelta(days=30)
+
+    users = (
+        select(func.count(User.id).label("total_users"))
+        .where(User.created_at < window_end)
+        .subquery()
     )
-    completed_payments = completed_payments_result.scalar() or 0
-    
-    pending_payments_result = await db.execute(
-        select(func.count(PaymentTransaction.id))
-        .where(PaymentTransaction.status.in_([TransactionStatus.PENDING, TransactionStatus.PROCESSING]))
+
+    institutions = (
+        select(func.count(Institution.id).label("total_institutions"))
+        .where(Institution.created_at < window_end)
+        .subquery()
     )
-    pending_payments = pending_payments_result.scalar() or 0
-    
-    failed_payments_result = await db.execute(
-        select(func.count(PaymentTransaction.id))
-        .where(PaymentTransaction.status == TransactionStatus.FAILED)
+
+    students = (
+        select(
+            func.count(Student.id).label("total_students"),
+            func.count(Student.id).filter(Student.created_at >= window_start).label("new_students"),
+        )
+        .where(Student.created_at < window_end)
+        .subquery()
     )
-    failed_payments = failed_payments_result.scalar() or 0
-    
-    # Students with/without sponsors
-    sponsored_students = await db.execute(
-        select(func.count(func.distinct(Sponsorship.student_id)))
-        .where(Sponsorship.status == SponsorshipStatus.ACTIVE)
+
+    sponsors = (
+        select(
+            func.count(Sponsor.id).label("total_sponsors"),
+            func.count(Sponsor.id).filter(Sponsor.created_at >= window_start).label("new_sponsors"),
+        )
+        .where(Sponsor.created_at < window_end)
+        .subquery()
     )
-    students_sponsored = sponsored_students.scalar() or 0
-    students_unsponsored = total_students - students_sponsored
-    
-    # Average sponsorship amount
-    avg_sponsorship_result = await db.execute(
-        select(func.avg(Sponsorship.amount))
-        .where(Sponsorship.status == SponsorshipStatus.ACTIVE)
+
+    is_active = Sponsorship.status == SponsorshipStatus.ACTIVE
+    sponsorships = (
+        select(
+            func.count(Sponsorship.id).filter(is_active).label("active_sponsorships"),
+            func.count(func.distinct(Sponsorship.student_id)).filter(is_active).label("students_sponsored"),
+            func.avg(Sponsorship.amount).filter(is_active).label("avg_sponsorship_amount"),
+        )
+        .where(Sponsorship.created_at < window_end)
+        .subquery()
     )
-    avg_sponsorship_amount = avg_sponsorship_result.scalar() or 0
-    
-    # New students this month
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    new_students_result = await db.execute(
-        select(func.count(Student.id)).where(Student.created_at >= thirty_days_ago)
+
+    is_completed = PaymentTransaction.status == TransactionStatus.COMPLETED
+    payments = (
+        select(
+            func.sum(PaymentTransaction.amount).filter(is_completed).label("total_revenue"),
+            func.count(PaymentTransaction.id).filter(is_completed).label("completed_payments"),
+            func.count(PaymentTransaction.id).filter(
+                PaymentTransaction.status.in_([TransactionStatus.PENDING, TransactionStatus.PROCESSING])
+            ).label("pending_payments"),
+            func.count(PaymentTransaction.id).filter(
+                PaymentTransaction.status == TransactionStatus.FAILED
+            ).label("failed_payments"),
+        )
+        .where(PaymentTransaction.created_at < window_end)
+        .subquery()
     )
-    new_students_this_month = new_students_result.scalar() or 0
-    
-    # New sponsors this month
-    new_sponsors_result = await db.execute(
-        select(func.count(Sponsor.id)).where(Sponsor.created_at >= thirty_days_ago)
+
+    donations = (
+        select(func.sum(OrganizationDonation.amount).label("total_donations"))
+        .where(OrganizationDonation.created_at < window_end)
+        .subquery()
     )
-    new_sponsors_this_month = new_sponsors_result.scalar() or 0
-    
+
+    # Each aggregate subquery yields exactly one row, so joining them on TRUE
+    # is a 1x1 cross join rather than a cartesian blow-up.
+    query = (
+        select(users, institutions, students, sponsors, sponsorships, payments, donations)
+        .select_from(users)
+        .join(institutions, true())
+        .join(students, true())
+        .join(sponsors, true())
+        .join(sponsorships, true())
+        .join(payments, true())
+        .join(donations, true())
+    )
+    row = (await db.execute(query)).mappings().one()
+
+    total_students = row["total_students"] or 0
+    students_sponsored = row["students_sponsored"] or 0
+
     return {
-        "total_users": total_users,
+        "total_users": row["total_users"] or 0,
         "total_students": total_students,
-        "total_institutions": total_institutions,
-        "total_sponsors": total_sponsors,
-        "active_sponsorships": active_sponsorships,
-        "total_revenue": float(total_revenue),
-        "total_donations": float(total_donations),
-        "completed_payments": completed_payments,
-        "pending_payments": pending_payments,
-        "failed_payments": failed_payments,
+        "total_institutions": row["total_institutions"] or 0,
+        "total_sponsors": row["total_sponsors"] or 0,
+        "active_sponsorships": row["active_sponsorships"] or 0,
+        "total_revenue": float(row["total_revenue"] or 0),
+        "total_donations": float(row["total_donations"] or 0),
+        "completed_payments": row["completed_payments"] or 0,
+        "pending_payments": row["pending_payments"] or 0,
+        "failed_payments": row["failed_payments"] or 0,
         "students_sponsored": students_sponsored,
-        "students_unsponsored": students_unsponsored,
-        "avg_sponsorship_amount": float(avg_sponsorship_amount),
-        "new_students_this_month": new_students_this_month,
-        "new_sponsors_this_month": new_sponsors_this_month,
+        "students_unsponsored": total_students - students_sponsored,
+        "avg_sponsorship_amount": float(row["avg_sponsorship_amount"] or 0),
+        "new_students_this_month": row["new_students"] or 0,
+        "new_sponsors_this_month": row["new_sponsors"] or 0,
+        "as_of": window_end.isoformat(),
     }
 
 
+@router.get("/admin/user-cache")
+async def get_user_cache_stats(
+    current_user: AdminUser,
+) -> Dict[str, Any]:
+    """Get this worker's authenticated-user cache counters and hit rate."""
+    return user_cache_stats()
+
+
 @router.get("/institution/dashboard")
 async def get_institution_dashboard_stats(
     db: DBSession,
-    current_user: CurrentUser,
+    principal: CurrentPrincipal,
 ) -> Dict[str, Any]:
     """Get institution dashboard statistics."""
     from app.models.student import StudentFeeBalance
-    from datetime import datetime, timedelta
     
-    # Get institution
-    institution_result = await db.execute(
-        select(Institution).where(Institution.user_id == current_user.id)
-    )
-    institution = institution_result.scalar_one_or_none()
+    institution = principal.institution
     
     if not institution:
         return {
@@ -2,15 +2,14 @@
 Student management API routes.
 """
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 import os
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, status, Query, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Query, Response, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
-import io
 
 from app.models.student import Student, StudentDocument, StudentFeeBalance, DocumentType, DocumentStatus
 from app.models.institution import Institution
@@ -27,8 +26,13 @@ from app.schemas.student import (
     StudentSponsorshipResponse,
 )
 from app.schemas.payment import PaymentAccountResponse
-from app.core.deps import CurrentUser, AdminUser, DBSession
-from app.services.file_service import file_storage_service
+from app.core.deps import CurrentUser, CurrentPrincipal, AdminUser, DBSession
+from app.services.file_service import FileTooLargeError, UnsupportedFileTypeError, file_storage_service
+from app.services.blob_store import document_blob_store
+from app.services.image_service import generate_profile_variants, variant_filenames
+from app.utils.images import profile_photo_variants
+from app.utils.pagination import keyset_paginate
+from app.utils.streaming import StreamFormat, pydantic_serializer, stream_query_response
 
 router = APIRouter()
 
@@ -92,15 +96,28 @@ async def get_student_by_user_id(
 @router.get("/", response_model=List[StudentResponse])
 async def list_students(
     db: DBSession,
-    current_user: CurrentUser,
+    principal: CurrentPrincipal,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
     institution_id: Optional[UUID] = None,
     need_level_min: Optional[int] = Query(None, ge=1, le=10),
     need_level_max: Optional[int] = Query(None, ge=1, le=10),
     is_verified: Optional[bool] = None,
+    stream: Optional[StreamFormat] = Query(None, description="Stream every matching row as ndjson or a json array"),
 ):
-    """List students with optional filters."""
+    """
+    List students with optional filters.
+    
+    Pages are ordered by ``(need_level, id)`` descending. The cursor for the
+    next page is returned in the ``X-Next-Cursor`` header (the body stays a
+    plain list for existing clients); passing it back as ``cursor`` replaces
+    ``skip``.
+    
+    With ``stream`` set, ``skip``/``limit`` are ignored and every matching
+    student is written out as it is read from the database.
+    """
     query = select(Student).options(selectinload(Student.fee_balance))
     
     # Apply filters
@@ -114,17 +131,25 @@ async def list_students(
         query = query.where(Student.is_verified == is_verified)
     
     # For institution users, only show their students
-    if current_user.role.value == "institution":
-        institution = await db.execute(
-            select(Institution).where(Institution.user_id == current_user.id)
-        )
-        inst = institution.scalar_one_or_none()
-        if inst:
-            query = query.where(Student.institution_id == inst.id)
+    if principal.user.role.value == "institution" and principal.institution:
+        query = query.where(Student.institution_id == principal.institution.id)
     
-    query = query.order_by(Student.need_level.desc()).offset(skip).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+    if stream:
+        query = query.order_by(Student.need_level.desc(), Student.id.desc())
+        return stream_query_response(query, pydantic_serializer(StudentResponse), stream)
+    
+    try:
+        students, next_cursor = await keyset_paginate(
+            db, query, [Student.need_level, Student.id], limit, cursor=cursor, offset=skip
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return students
 
 
 @router.post("/", response_model=StudentResponse)
@@ -344,15 +369,6 @@ async def upload_student_document_file(
             detail="Not authorized to upload documents for this student",
         )
     
-    # Validate file size (max 10MB)
-    max_size = 10 * 1024 * 1024
-    file_data = await file.read()
-    if len(file_data) > max_size:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File too large. Maximum size is {max_size / 1024 / 1024}MB",
-        )
-    
     # Validate file type
     allowed_types = ["image/jpeg", "image/png", "application/pdf"]
     if file.content_type not in allowed_types:
@@ -362,29 +378,45 @@ async def upload_student_document_file(
         )
     
     # TODO: Add virus scanning here in production
-    # virus_scan_result = await scan_file_for_viruses(file_data)
+    # virus_scan_result = await scan_file_for_viruses(stored.path)
     # if virus_scan_result.infected:
     #     raise HTTPException(status_code=400, detail="Virus detected in file")
     
     try:
-        # Upload file with encryption
-        file_path, file_url, is_encrypted = await file_storage_service.upload_file(
-            student_id=str(student_id),
-            file_data=file_data,
-            original_filename=file.filename or "document",
-            document_type=document_type,
-            mime_type=file.content_type or "application/octet-stream",
-            encrypt=True,  # Always encrypt
+        doc_type = DocumentType(document_type)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid document type: {document_type}",
         )
+    
+    # Validate file size (max 10MB) while streaming it to storage
+    max_size = 10 * 1024 * 1024
+    try:
+        # Store encrypted and deduplicated by content
+        blob = await document_blob_store.ingest(
+            db,
+            upload=file,
+            max_size=max_size,
+            allowed_types=allowed_types,
+        )
+        is_encrypted = True
         
         # Create document record
+        document_id = uuid4()
         document = StudentDocument(
+            id=document_id,
             student_id=student_id,
-            document_type=DocumentType(document_type),
-            file_url=file_url,
+            document_type=doc_type,
+            file_url=(
+                f"{file_storage_service.base_url}/api/v1/students/"
+                f"{student_id}/documents/{document_id}/download"
+            ),
             file_name=file.filename or "document",
-            file_size=len(file_data),
-            mime_type=file.content_type,
+            file_size=blob.size,
+            mime_type=blob.mime_type,
+            sha256=blob.sha256,
+            blob_id=blob.blob_id,
             status=DocumentStatus.PENDING,
         )
         db.add(document)
@@ -404,6 +436,16 @@ async def upload_student_document_file(
             is_encrypted=is_encrypted,
         )
         
+    except FileTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size is {max_size / 1024 / 1024}MB",
+        )
+    except UnsupportedFileTypeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid file type. Allowed: {', '.join(allowed_types)}",
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -447,18 +489,19 @@ async def download_student_document(
         )
     
     try:
-        # Extract filename from URL
-        filename = document.file_url.split("/")[-1]
-        
-        # Download and decrypt file
-        file_data, was_encrypted = await file_storage_service.download_file(
-            student_id=str(student_id),
-            filename=filename,
-        )
+        # Decrypt the file as it streams out
+        if document.blob_id:
+            chunks = document_blob_store.stream(document.blob_id)
+        else:
+            # Documents stored before the blob store: extract filename from URL
+            filename = document.file_url.split("/")[-1]
+            chunks, _ = file_storage_service.stream_file(
+                student_id=str(student_id),
+                filename=filename,
+            )
         
-        # Return file as streaming response
         return StreamingResponse(
-            io.BytesIO(file_data),
+            chunks,
             media_type=document.mime_type or "application/octet-stream",
             headers={
                 "Content-Disposition": f'attachment; filename="{document.file_name}"',
@@ -636,6 +679,7 @@ async def upload_profile_image(
     student_id: UUID,
     db: DBSession,
     current_user: CurrentUser,
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
 ):
     """
@@ -661,32 +705,40 @@ async def upload_profile_image(
             detail=f"Invalid file type. Allowed: {', '.join(allowed_types)}"
         )
 
-    # Validate size (max 5MB)
-    contents = await file.read()
-    if len(contents) > 5 * 1024 * 1024:
-        raise HTTPException(status_code=413, detail="Profile photo too large (max 5MB)")
-
     try:
-        # Use your existing file_storage_service (supports encryption, S3, etc.)
-        _, public_url, _ = await file_storage_service.upload_file(
+        # Validate size (max 5MB) while streaming it to storage
+        stored = await file_storage_service.store_upload(
             student_id=str(student_id),
-            file_data=contents,
+            upload=file,
             original_filename=file.filename or "profile.jpg",
             document_type="profile_photo",
-            mime_type=file.content_type,
+            max_size=5 * 1024 * 1024,
             encrypt=False,  # Profile photos are public, no need to encrypt
+            allowed_types=allowed_types,
         )
+        public_url = stored.url
 
         # Update student's photo_url
         student.photo_url = public_url
         await db.commit()
         await db.refresh(student)
 
+        # Thumbnails and WebP variants are rendered after the response is sent
+        background_tasks.add_task(generate_profile_variants, stored.path)
+
         return {
             "message": "Profile photo updated successfully",
-            "photo_url": public_url
+            "photo_url": public_url,
+            "photo_variants": profile_photo_variants(public_url),
         }
 
+    except FileTooLargeError:
+        raise HTTPException(status_code=413, detail="Profile photo too large (max 5MB)")
+    except UnsupportedFileTypeError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed: {', '.join(allowed_types)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -716,6 +768,8 @@ async def remove_profile_image(
     try:
         filename = student.photo_url.split("/")[-1]
         await file_storage_service.delete_file(str(student_id), filename)
+        for variant in variant_filenames(filename):
+            await file_storage_service.delete_file(str(student_id), variant)
     except:
         pass  # Best effort
 
@@ -4,7 +4,7 @@ User management API routes.
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from sqlalchemy import select
 from pydantic import BaseModel
 
@@ -12,6 +12,7 @@ from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate, UserWithProfile, UserProfileUpdate
 from app.services.user_service import UserService
 from app.core.deps import CurrentUser, AdminUser, DBSession
+from app.utils.pagination import keyset_paginate
 
 router = APIRouter()
 
@@ -43,14 +44,30 @@ class UserSettingsUpdate(BaseModel):
 async def list_users(
     admin: AdminUser,
     db: DBSession,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
 ):
-    """List all users (admin only)."""
-    result = await db.execute(
-        select(User).offset(skip).limit(limit)
-    )
-    return result.scalars().all()
+    """
+    List all users (admin only), newest first.
+    
+    The cursor for the next page is returned in the ``X-Next-Cursor``
+    header (the body stays a plain list for existing clients); passing it
+    back as ``cursor`` replaces ``skip``.
+    """
+    try:
+        users, next_cursor = await keyset_paginate(
+            db, select(User), [User.created_at, User.id], limit, cursor=cursor, offset=skip
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
 
 
 @router.get("/me", response_model=UserWithProfile)
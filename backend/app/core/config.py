@@ -23,6 +23,11 @@ class Settings(BaseSettings):
     DATABASE_URL: str = Field(..., description="SQLAlchemy database URL")
     DATABASE_POOL_SIZE: int = Field(5, ge=1)
     DATABASE_MAX_OVERFLOW: int = Field(10, ge=0)
+    DB_SCHEMA_MODE: str = Field(
+        "create",
+        pattern="^(create|check|skip)$",
+        description="Startup schema handling; use check on cold-starting deploys migrated with Alembic",
+    )
 
     # ----------------------------------------------------
     # Security / Auth
@@ -32,6 +37,14 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(30, ge=1)
     ALGORITHM: str = Field("HS256")
     PASSWORD_HASH_ROUNDS: int = Field(12, ge=8)
+    USER_CACHE_TTL_SECONDS: int = Field(30, ge=0, description="Authenticated user cache lifetime (0 disables)")
+    USER_CACHE_MAX_ENTRIES: int = Field(10000, ge=1)
+    PASSWORD_HASH_WORKERS: int = Field(
+        2, ge=1, description="Concurrent Argon2 operations; each holds ~64 MiB while running"
+    )
+    PASSWORD_HASH_QUEUE_DEPTH: int = Field(
+        32, ge=0, description="Hash requests allowed to wait for a worker before returning 503"
+    )
 
     # ----------------------------------------------------
     # Cookies
@@ -48,6 +61,11 @@ class Settings(BaseSettings):
             raise ValueError(f"COOKIE_SAMESITE must be one of {allowed}")
         return v.lower()
 
+    # ----------------------------------------------------
+    # Images
+    # ----------------------------------------------------
+    IMAGE_WORKERS: int = Field(1, ge=1, description="Processes rendering profile image variants")
+
     # ----------------------------------------------------
     # CORS
     # ----------------------------------------------------
@@ -72,6 +90,19 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = Field(...)
     EMAILS_FROM_EMAIL: str = Field(...)
     EMAILS_FROM_NAME: str = Field("DestinyPal")
+    SMTP_TLS_MODE: str = Field("starttls", pattern="^(starttls|ssl|none)$", description="ssl for implicit TLS (port 465)")
+    SMTP_ALLOW_PLAINTEXT_AUTH: bool = Field(
+        False, description="Allow AUTH with SMTP_TLS_MODE=none (local relays only)"
+    )
+    SMTP_TIMEOUT_SECONDS: float = Field(30.0, gt=0)
+    SMTP_POOL_SIZE: int = Field(4, ge=1, description="SMTP connections kept open for delivery")
+    SMTP_IDLE_SECONDS: float = Field(60.0, gt=0, description="Pooled connections idle longer are reopened")
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = Field(100, ge=1)
+    EMAIL_WORKERS: int = Field(1, ge=0, description="Background outbox senders (0 disables)")
+    EMAIL_POLL_INTERVAL_SECONDS: float = Field(5.0, gt=0)
+    EMAIL_BATCH_SIZE: int = Field(50, ge=1)
+    EMAIL_MAX_ATTEMPTS: int = Field(8, ge=1)
+    EMAIL_RETRY_BASE_SECONDS: float = Field(30.0, gt=0, description="Backoff doubles per failed attempt")
 
     TURNSTILE_SECRET_KEY: str
 
@@ -85,17 +116,71 @@ class Settings(BaseSettings):
     MPESA_SHORTCODE: str
     MPESA_CALLBACK_URL: str
     MPESA_ENVIRONMENT: str = Field(default="sandbox", pattern="^(sandbox|production)$")
+    MPESA_BASE_URL: Optional[str] = Field(None, description="Overrides the Daraja host, e.g. a local stand-in")
+    MPESA_CONNECT_TIMEOUT_SECONDS: float = Field(5.0, gt=0)
+    MPESA_READ_TIMEOUT_SECONDS: float = Field(30.0, gt=0)
+    MPESA_MAX_RETRIES: int = Field(2, ge=0)
+    MPESA_RETRY_BACKOFF_SECONDS: float = Field(0.5, ge=0)
+    MPESA_MAX_CONNECTIONS: int = Field(20, ge=1)
+    MPESA_TOKEN_REFRESH_MARGIN_SECONDS: int = Field(
+        300, ge=0, description="Refresh the OAuth token this long before it expires"
+    )
 
     # Airtel Money
     AIRTEL_CLIENT_ID: str
     AIRTEL_CLIENT_SECRET: str
     AIRTEL_CALLBACK_URL: str
 
+    # ----------------------------------------------------
+    # Payment Webhooks
+    # ----------------------------------------------------
+    WEBHOOK_WORKERS: int = Field(2, ge=0, description="Background webhook processors (0 disables)")
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = Field(5.0, gt=0)
+    WEBHOOK_BATCH_SIZE: int = Field(20, ge=1)
+    WEBHOOK_MAX_ATTEMPTS: int = Field(8, ge=1)
+    WEBHOOK_RETRY_BASE_SECONDS: float = Field(2.0, gt=0, description="Backoff doubles per failed attempt")
+
+    # ----------------------------------------------------
+    # Admin Inbox (SSE, unread counters)
+    # ----------------------------------------------------
+    ADMIN_EVENTS_KEEPALIVE_SECONDS: float = Field(15.0, gt=0, description="Comment sent on idle streams")
+    ADMIN_EVENTS_MAX_STREAM_SECONDS: int = Field(900, ge=30, description="Streams end and reconnect after this")
+    ADMIN_EVENTS_RETRY_MS: int = Field(3000, ge=0, description="Reconnect delay suggested to browsers")
+    UNREAD_COUNTER_RECONCILE_INTERVAL_SECONDS: int = Field(
+        3600, ge=0, description="Periodic recount of unread counters to correct drift (0 disables)"
+    )
+
+    # ----------------------------------------------------
+    # Institution Suggestions
+    # ----------------------------------------------------
+    INSTITUTION_SUGGEST_IN_MEMORY: bool = Field(
+        True, description="Serve typeahead from an in-process index (False queries pg_trgm every time)"
+    )
+
     # ----------------------------------------------------
     # Rate Limiting
     # ----------------------------------------------------
     RATE_LIMIT_REQUESTS: int = Field(60)
     RATE_LIMIT_WINDOW_SECONDS: int = Field(60)
+    RATE_LIMIT_BACKEND: str = Field(
+        "memory", pattern="^(memory|postgres|redis)$", description="Use postgres/redis to share limits across workers"
+    )
+    RATE_LIMIT_REDIS_URL: Optional[str] = Field(None)
+
+    # ----------------------------------------------------
+    # Listing Totals
+    # ----------------------------------------------------
+    LIST_COUNT_MODE: str = Field("exact", pattern="^(exact|cached|estimate)$")
+    COUNT_CACHE_TTL_SECONDS: int = Field(30, ge=1)
+    COUNT_ESTIMATE_MIN_ROWS: int = Field(10000, ge=0, description="Below this, estimates fall back to exact counts")
+
+    # ----------------------------------------------------
+    # Statistics Snapshots
+    # ----------------------------------------------------
+    STATS_SNAPSHOT_MAX_AGE_SECONDS: int = Field(300, ge=1, description="Max age of served impact stats")
+    STATS_SNAPSHOT_REFRESH_INTERVAL_SECONDS: int = Field(
+        600, ge=0, description="Background snapshot refresh period (0 disables)"
+    )
 
     # ----------------------------------------------------
     # Pydantic Config
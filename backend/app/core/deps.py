@@ -11,14 +11,22 @@ Features:
 - Proper error messages and WWW-Authenticate headers
 """
 
-from typing import Annotated, Optional
+from dataclasses import dataclass
+from typing import Annotated, Optional, Tuple
+from uuid import UUID
 
 from fastapi import Cookie, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.database.session import get_db
 from app.core.security import verify_token
+from app.core.user_cache import cache_user, get_cached_user
+from app.models.institution import Institution
+from app.models.sponsor import Sponsor
+from app.models.student import Student
 from app.models.user import User
 from app.services.user_service import UserService
 
@@ -50,11 +58,8 @@ async def get_token(
 # --------------------------------------------------------------------------- #
 # User Retrieval
 # --------------------------------------------------------------------------- #
-async def get_current_user_optional(
-    db: Annotated[AsyncSession, Depends(get_db)],
-    token: Annotated[Optional[str], Depends(get_token)],
-) -> Optional[User]:
-    """Return authenticated user if token is valid, otherwise None."""
+def _token_identity(token: Optional[str]) -> Optional[Tuple[UUID, str]]:
+    """Return (user_id, jti) from a valid access token, otherwise None."""
     if not token:
         return None
 
@@ -62,7 +67,27 @@ async def get_current_user_optional(
     if not token_data or not token_data.user_id:
         return None
 
-    user = await UserService(db).get_by_id(token_data.user_id)
+    try:
+        return UUID(token_data.user_id), token_data.jti
+    except ValueError:
+        return None
+
+
+async def get_current_user_optional(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    token: Annotated[Optional[str], Depends(get_token)],
+) -> Optional[User]:
+    """Return authenticated user if token is valid, otherwise None."""
+    identity = _token_identity(token)
+    if identity is None:
+        return None
+
+    user_id, jti = identity
+    user = await get_cached_user(db, user_id, jti)
+    if user is None:
+        user = await UserService(db).get_by_id(user_id)
+        if user is not None:
+            cache_user(user, jti)
     return user
 
 
@@ -91,6 +116,95 @@ async def get_current_active_user(
     return user
 
 
+# --------------------------------------------------------------------------- #
+# Principal (user + role entity)
+# --------------------------------------------------------------------------- #
+@dataclass
+class Principal:
+    """The authenticated user plus the sponsor/institution/student records they own."""
+    user: User
+    sponsor: Optional[Sponsor] = None
+    institution: Optional[Institution] = None
+    student: Optional[Student] = None
+
+
+def _first_owned_id(entity):
+    """Correlated subquery: id of the user's oldest ``entity`` record."""
+    return (
+        select(entity.id)
+        .where(entity.user_id == User.id)
+        .order_by(entity.created_at, entity.id)
+        .limit(1)
+        .correlate(User)
+        .scalar_subquery()
+    )
+
+
+async def get_current_principal_optional(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    token: Annotated[Optional[str], Depends(get_token)],
+) -> Optional[Principal]:
+    """
+    Resolve the caller and their role entities in one query.
+
+    The user comes from the user cache when possible, in which case only
+    the entities are selected; otherwise user, profile and entities are
+    loaded together with outer joins.
+
+    ``user_id`` isn't unique on the entity tables, so each join is narrowed
+    to the user's oldest record of that kind (``created_at``, then ``id``).
+    The query stays one row per user and the same record is picked on every
+    request.
+    """
+    identity = _token_identity(token)
+    if identity is None:
+        return None
+
+    user_id, jti = identity
+    user = await get_cached_user(db, user_id, jti)
+    entities = (Sponsor, Institution, Student) if user else (User, Sponsor, Institution, Student)
+
+    query = (
+        select(*entities)
+        .select_from(User)
+        .outerjoin(Sponsor, Sponsor.id == _first_owned_id(Sponsor))
+        .outerjoin(Institution, Institution.id == _first_owned_id(Institution))
+        .outerjoin(Student, Student.id == _first_owned_id(Student))
+        .where(User.id == user_id)
+    )
+    if user is None:
+        query = query.options(joinedload(User.profile))
+
+    row = (await db.execute(query)).first()
+    if row is None:
+        return None
+
+    if user is None:
+        user, sponsor, institution, student = row
+        cache_user(user, jti)
+    else:
+        sponsor, institution, student = row
+    return Principal(user=user, sponsor=sponsor, institution=institution, student=student)
+
+
+async def get_current_principal(
+    principal: Annotated[Optional[Principal], Depends(get_current_principal_optional)],
+) -> Principal:
+    """Require an authenticated, active principal."""
+    if not principal:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not principal.user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user account",
+        )
+    return principal
+
+
 # --------------------------------------------------------------------------- #
 # Role-Based Access Control
 # --------------------------------------------------------------------------- #
@@ -134,6 +248,8 @@ AdminUser = Annotated[User, Depends(get_current_admin_user)]
 SponsorUser = Annotated[User, Depends(get_current_sponsor_user)]
 InstitutionUser = Annotated[User, Depends(get_current_institution_user)]
 StudentUser = Annotated[User, Depends(get_current_student_user)]
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+OptionalPrincipal = Annotated[Optional[Principal], Depends(get_current_principal_optional)]
 
 # Legacy names (optional – you can keep using these if you want)
 require_admin = get_current_admin_user
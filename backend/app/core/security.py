@@ -2,29 +2,42 @@
 Security utilities for authentication and authorization.
 Implements secure password hashing, JWT tokens, and session management.
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional, Any, TypeVar
+import asyncio
 import secrets
 import hashlib
 
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError, InvalidHashError
-from jose import jwt, JWTError
+from fastapi import HTTPException, status
 from pydantic import BaseModel
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from argon2 import PasswordHasher
 
-# time_cost: number of iterations (higher = more secure, slower)
-# memory_cost: memory usage in KiB (higher = more resistant to GPU attacks)
-# parallelism: number of parallel threads
-password_hasher = PasswordHasher(
-    time_cost=3,        # OWASP recommended minimum
-    memory_cost=65536,  # 64 MiB - resistant to GPU/ASIC attacks
-    parallelism=4,      # Number of parallel threads
-    hash_len=32,        # Length of the hash in bytes
-    salt_len=16,        # Length of the salt in bytes
-)
+# argon2 and jose are imported on first use rather than here: nearly every
+# module imports this one, and most cold starts serve requests that never
+# hash a password.
+
+
+@lru_cache(maxsize=None)
+def get_password_hasher() -> "PasswordHasher":
+    """The shared Argon2 hasher."""
+    from argon2 import PasswordHasher
+
+    # time_cost: number of iterations (higher = more secure, slower)
+    # memory_cost: memory usage in KiB (higher = more resistant to GPU attacks)
+    # parallelism: number of parallel threads
+    return PasswordHasher(
+        time_cost=3,        # OWASP recommended minimum
+        memory_cost=65536,  # 64 MiB - resistant to GPU/ASIC attacks
+        parallelism=4,      # Number of parallel threads
+        hash_len=32,        # Length of the hash in bytes
+        salt_len=16,        # Length of the salt in bytes
+    )
 
 
 class TokenData(BaseModel):
@@ -48,8 +61,10 @@ class TokenPair(BaseModel):
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its Argon2 hash."""
+    from argon2.exceptions import VerifyMismatchError, InvalidHashError
+
     try:
-        password_hasher.verify(hashed_password, plain_password)
+        get_password_hasher().verify(hashed_password, plain_password)
         return True
     except (VerifyMismatchError, InvalidHashError):
         return False
@@ -57,12 +72,73 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Generate a secure Argon2 password hash."""
-    return password_hasher.hash(password)
+    return get_password_hasher().hash(password)
+
+
+T = TypeVar("T")
+
+# Argon2 releases the GIL, so a small thread pool hashes in parallel without
+# blocking the event loop. Its size caps concurrent hashes, and with them
+# peak hashing memory (PASSWORD_HASH_WORKERS x 64 MiB).
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_pending = 0
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="argon2",
+        )
+    return _hash_executor
+
+
+async def _run_hashing(func: Callable[..., T], *args) -> T:
+    """
+    Run a hashing call on the hashing pool.
+
+    Raises:
+        HTTPException: 503 when every worker is busy and the wait queue is
+            full, so overload sheds logins instead of piling them up.
+    """
+    global _hash_pending
+    if _hash_pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_DEPTH:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy. Please try again shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+    _hash_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool without blocking the event loop."""
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool without blocking the event loop."""
+    return await _run_hashing(get_password_hash, password)
+
+
+def shutdown_hash_executor() -> None:
+    """Stop the hashing pool (on application shutdown)."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
 
 
 def needs_rehash(hashed_password: str) -> bool:
     """Check if a password hash needs to be rehashed with updated parameters."""
-    return password_hasher.check_needs_rehash(hashed_password)
+    return get_password_hasher().check_needs_rehash(hashed_password)
 
 
 def generate_token_id() -> str:
@@ -93,6 +169,8 @@ def create_access_token(
         "jti": generate_token_id(),
     }
     
+    from jose import jwt
+
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
@@ -119,6 +197,8 @@ def create_refresh_token(
         "jti": generate_token_id(),
     }
     
+    from jose import jwt
+
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
@@ -136,6 +216,8 @@ def create_token_pair(user_id: str, email: str, role: str) -> TokenPair:
 
 def decode_token(token: str) -> Optional[dict[str, Any]]:
     """Decode and validate a JWT token."""
+    from jose import jwt, JWTError
+
     try:
         payload = jwt.decode(
             token,
@@ -0,0 +1,204 @@
+"""
+In-process cache for authenticated user resolution.
+
+``get_current_user_optional`` would otherwise load the user and profile on
+every authenticated request. Successful lookups are cached as plain column
+snapshots keyed by ``(user_id, jti)`` for ``USER_CACHE_TTL_SECONDS``; a hit
+rebuilds the ``User`` (with its profile) and attaches it to the request's
+session without touching the database, so handlers can keep mutating and
+committing it as before.
+
+Any flushed change to a user, profile or 2FA settings row evicts that user.
+On Postgres the eviction is also broadcast with ``NOTIFY`` in the same
+transaction, and every worker running ``run_invalidation_listener`` evicts
+its copy once the change commits.
+"""
+import asyncio
+import copy
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.models.user import User, UserProfile, User2FASettings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "user_cache_invalidate"
+
+_CacheKey = Tuple[uuid.UUID, str]
+
+# (user_id, jti) -> (expires_at, user columns, profile columns or None)
+_entries: "OrderedDict[_CacheKey, Tuple[float, Dict[str, Any], Optional[Dict[str, Any]]]]" = OrderedDict()
+_keys_by_user: Dict[uuid.UUID, Set[_CacheKey]] = {}
+_stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+
+def _columns(obj: Any) -> Dict[str, Any]:
+    return {attr.key: copy.deepcopy(getattr(obj, attr.key)) for attr in inspect(obj).mapper.column_attrs}
+
+
+def _rebuild(model, data: Dict[str, Any]):
+    obj = model(**copy.deepcopy(data))
+    # Mark it as a clean, already-persisted row
+    make_transient_to_detached(obj)
+    return obj
+
+
+def _drop(key: _CacheKey) -> None:
+    _entries.pop(key, None)
+    keys = _keys_by_user.get(key[0])
+    if keys is not None:
+        keys.discard(key)
+        if not keys:
+            del _keys_by_user[key[0]]
+
+
+async def get_cached_user(db: AsyncSession, user_id: uuid.UUID, jti: str) -> Optional[User]:
+    """Return the cached user attached to ``db``, or None on a miss."""
+    if not settings.USER_CACHE_TTL_SECONDS:
+        return None
+
+    key = (user_id, jti)
+    entry = _entries.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        if entry is not None:
+            _drop(key)
+        _stats["misses"] += 1
+        return None
+
+    _entries.move_to_end(key)
+    _stats["hits"] += 1
+
+    _, user_data, profile_data = entry
+    user = _rebuild(User, user_data)
+    set_committed_value(user, "profile", _rebuild(UserProfile, profile_data) if profile_data else None)
+    return await db.merge(user, load=False)
+
+
+def cache_user(user: User, jti: str) -> None:
+    """Remember a freshly loaded user (with its profile loaded)."""
+    if not settings.USER_CACHE_TTL_SECONDS:
+        return
+
+    key = (user.id, jti)
+    profile = user.profile
+    _entries[key] = (
+        time.monotonic() + settings.USER_CACHE_TTL_SECONDS,
+        _columns(user),
+        _columns(profile) if profile is not None else None,
+    )
+    _entries.move_to_end(key)
+    _keys_by_user.setdefault(user.id, set()).add(key)
+
+    while len(_entries) > settings.USER_CACHE_MAX_ENTRIES:
+        oldest = next(iter(_entries))
+        _drop(oldest)
+        _stats["evictions"] += 1
+
+
+def invalidate_user(user_id: uuid.UUID) -> None:
+    """Evict every cached token entry for ``user_id`` in this worker."""
+    keys = _keys_by_user.pop(user_id, None)
+    if not keys:
+        return
+    for key in keys:
+        _entries.pop(key, None)
+    _stats["invalidations"] += 1
+
+
+def clear_user_cache() -> None:
+    """Drop every cached user in this worker."""
+    _entries.clear()
+    _keys_by_user.clear()
+
+
+def user_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and current size for monitoring."""
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "size": len(_entries),
+        "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else None,
+    }
+
+
+def _affected_user_id(obj: Any) -> Optional[uuid.UUID]:
+    if isinstance(obj, User):
+        return obj.id
+    if isinstance(obj, (UserProfile, User2FASettings)):
+        return obj.user_id
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_changed_users(session: Session, flush_context) -> None:
+    """Evict users whose rows change, and broadcast it with the transaction."""
+    touched = [obj for obj in session.dirty if session.is_modified(obj)]
+    touched += list(session.deleted)
+    # A brand-new user has nothing cached, but a new profile/2FA row does
+    touched += [obj for obj in session.new if not isinstance(obj, User)]
+
+    changed = {_affected_user_id(obj) for obj in touched}
+    changed.discard(None)
+    if not changed:
+        return
+
+    for user_id in changed:
+        invalidate_user(user_id)
+
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        for user_id in changed:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": INVALIDATION_CHANNEL, "payload": str(user_id)},
+            )
+
+
+def _on_remote_invalidation(connection, pid, channel, payload) -> None:
+    try:
+        invalidate_user(uuid.UUID(payload))
+    except ValueError:
+        logger.warning(f"Ignoring malformed user cache invalidation: {payload!r}")
+
+
+async def run_invalidation_listener(engine: AsyncEngine) -> None:
+    """
+    LISTEN for invalidations from other workers until cancelled.
+
+    Eviction at flush time covers this worker; this applies the committed
+    changes made by every other worker (and re-applies our own after commit,
+    closing the window where a concurrent request re-cached the old row).
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    while True:
+        try:
+            async with engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                listener = raw.driver_connection
+                await listener.add_listener(INVALIDATION_CHANNEL, _on_remote_invalidation)
+                # Notifications missed while disconnected can't be replayed
+                clear_user_cache()
+                try:
+                    while True:
+                        await asyncio.sleep(30)
+                        # Surfaces a dropped connection so we reconnect
+                        await listener.execute("SELECT 1")
+                finally:
+                    await listener.remove_listener(INVALIDATION_CHANNEL, _on_remote_invalidation)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"User cache invalidation listener failed, reconnecting: {e}")
+            clear_user_cache()
+            await asyncio.sleep(5)
@@ -0,0 +1,67 @@
+"""
+Startup schema handling.
+
+``DB_SCHEMA_MODE`` picks what the application does with the schema on boot:
+
+- ``create``: ``Base.metadata.create_all`` (local development)
+- ``check``: one ``SELECT`` against ``alembic_version``; refuse to start
+  unless the database is at ``SCHEMA_REVISION``. Migrations are applied
+  out of band with ``alembic upgrade head``. Use this for cold-starting
+  deploys, where reflecting every table on each boot is wasted work.
+- ``skip``: touch nothing
+"""
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.base import Base
+
+logger = logging.getLogger(__name__)
+
+# The Alembic head this code expects. Bump alongside every new migration.
+SCHEMA_REVISION = "013_add_unread_counter_triggers"
+
+
+class SchemaVersionError(RuntimeError):
+    """The database is not migrated to the revision this code expects."""
+
+
+async def create_tables(engine: AsyncEngine) -> None:
+    """Create all database tables if they don't exist."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    logger.info("Database tables initialized successfully")
+
+
+async def check_schema_version(engine: AsyncEngine) -> None:
+    """
+    Verify the database is migrated to ``SCHEMA_REVISION``.
+
+    Raises:
+        SchemaVersionError: if ``alembic_version`` is missing or holds a
+            different revision.
+    """
+    try:
+        async with engine.connect() as conn:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+    except DBAPIError as e:
+        raise SchemaVersionError(
+            f"Could not read alembic_version ({e.orig}); run `alembic upgrade head`"
+        ) from e
+
+    if current != SCHEMA_REVISION:
+        raise SchemaVersionError(
+            f"Database schema is at {current!r}, expected {SCHEMA_REVISION!r}; "
+            f"run `alembic upgrade head`"
+        )
+    logger.info(f"Database schema at {current}")
+
+
+async def prepare_schema(engine: AsyncEngine, mode: str) -> None:
+    """Apply ``DB_SCHEMA_MODE`` at startup."""
+    if mode == "create":
+        await create_tables(engine)
+    elif mode == "check":
+        await check_schema_version(engine)
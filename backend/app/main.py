@@ -265,23 +265,35 @@ DestinyPal Backend API
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import logging
 
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.security import shutdown_hash_executor
+from app.core.user_cache import run_invalidation_listener
 from app.api.v1 import auth, users, students, sponsors, institutions, payments, donations, stats, public
 from app.middleware.rate_limit import RateLimitMiddleware, AuthRateLimitMiddleware
+from app.middleware.rate_limit_store import create_rate_limit_store
 from app.middleware.security import ContentTypeValidationMiddleware, SecurityHeadersMiddleware
-from app.database.session import engine
-from app.database.base import Base
+from app.database.session import engine, async_session_maker
+from app.database.schema import prepare_schema
 from app.models import (
     User, UserProfile, User2FASettings,
     Institution, Student, StudentDocument, StudentFeeBalance,
     Sponsor, Sponsorship,
     Payment, PaymentAccount, PaymentTransaction, PaymentWebhook,
-    OrganizationDonation, contact,
+    OrganizationDonation, PlatformStatsSnapshot, RateLimitBucket, contact,
 )
+from app.services.stats_service import run_snapshot_refresher
+from app.services.unread_counter_service import run_counter_reconciler
+from app.services.image_service import shutdown_image_executor
+from app.services.email_outbox_service import close_smtp_pool, run_email_worker
+from app.services.admin_event_service import run_admin_event_listener
+from app.services.institution_suggest_service import run_suggest_index_listener
+from app.services.mpesa_service import mpesa_service
+from app.services.webhook_service import run_webhook_worker
 from app.api.v1.contact import router as contact_router
 from app.api.v1 import files as files_router
 from app.api.v1.admin_notifications import router as admin_notifications_router
@@ -291,14 +303,6 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 
-async def init_db():
-    """Create all database tables if they don't exist."""
-    async with engine.begin() as conn:
-        # Create all tables defined in models
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Database tables initialized successfully")
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
@@ -308,15 +312,59 @@ async def lifespan(app: FastAPI):
     logger.info(f"CORS origins configured: {settings.CORS_ORIGINS}")
     
     try:
-        await init_db()
+        await prepare_schema(engine, settings.DB_SCHEMA_MODE)
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
     
+    refresher = None
+    if settings.STATS_SNAPSHOT_REFRESH_INTERVAL_SECONDS:
+        refresher = asyncio.create_task(
+            run_snapshot_refresher(async_session_maker, settings.STATS_SNAPSHOT_REFRESH_INTERVAL_SECONDS)
+        )
+    
+    reconciler = None
+    if settings.UNREAD_COUNTER_RECONCILE_INTERVAL_SECONDS:
+        reconciler = asyncio.create_task(
+            run_counter_reconciler(async_session_maker, settings.UNREAD_COUNTER_RECONCILE_INTERVAL_SECONDS)
+        )
+    
+    webhook_workers = [
+        asyncio.create_task(run_webhook_worker(async_session_maker))
+        for _ in range(settings.WEBHOOK_WORKERS)
+    ]
+    email_workers = [
+        asyncio.create_task(run_email_worker(async_session_maker))
+        for _ in range(settings.EMAIL_WORKERS if settings.SMTP_HOST else 0)
+    ]
+    user_cache_listener = asyncio.create_task(run_invalidation_listener(engine))
+    admin_event_listener = asyncio.create_task(run_admin_event_listener(engine, async_session_maker))
+    suggest_listener = asyncio.create_task(run_suggest_index_listener(engine))
+    
     yield
     
     # Shutdown
     logger.info("Shutting down...")
+    for task in (refresher, reconciler):
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    for worker in webhook_workers:
+        worker.cancel()
+    await asyncio.gather(*webhook_workers, return_exceptions=True)
+    for worker in email_workers:
+        worker.cancel()
+    await asyncio.gather(*email_workers, return_exceptions=True)
+    await close_smtp_pool()
+    for listener in (user_cache_listener, admin_event_listener, suggest_listener):
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+    await mpesa_service.aclose()
+    await rate_limit_store.close()
+    shutdown_hash_executor()
+    shutdown_image_executor()
     await engine.dispose()
 
 
@@ -347,14 +395,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "X-Requested-With", "Accept", "Origin", "Cookie"],
-    expose_headers=["X-Request-ID", "Set-Cookie"],
+    expose_headers=["X-Request-ID", "Set-Cookie", "X-Next-Cursor"],
     max_age=600,
 )
 
+rate_limit_store = create_rate_limit_store(settings.RATE_LIMIT_BACKEND, settings.RATE_LIMIT_REDIS_URL)
+
 app.add_middleware(SecurityHeadersMiddleware)
 app.add_middleware(ContentTypeValidationMiddleware)
-app.add_middleware(AuthRateLimitMiddleware, max_attempts=5, lockout_minutes=15)
-app.add_middleware(RateLimitMiddleware, requests_per_minute=settings.RATE_LIMIT_REQUESTS)
+app.add_middleware(AuthRateLimitMiddleware, max_attempts=5, lockout_minutes=15, store=rate_limit_store)
+app.add_middleware(RateLimitMiddleware, requests_per_minute=settings.RATE_LIMIT_REQUESTS, store=rate_limit_store)
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -1,156 +1,132 @@
 """
 Rate limiting middleware for API protection.
+
+State lives in a ``RateLimitStore`` (see ``rate_limit_store``); use the
+postgres or redis backend so limits hold across workers. Both middlewares
+are plain ASGI so they add no per-request task or body wrapping.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Tuple
-from collections import defaultdict
-import asyncio
+from typing import Optional, Tuple
 
-from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
 from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from app.middleware.rate_limit_store import MemoryRateLimitStore, RateLimitStore, retry_after_seconds
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """
-    Simple in-memory rate limiting middleware.
 
-    NOTE:
-    - Safe for single-process deployments
-    - NOT suitable for multi-worker production (use Redis)
+def _get_client_ip(scope: Scope) -> str:
+    forwarded = Headers(scope=scope).get("X-Forwarded-For")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """
+    Per-IP rate limiting: a per-minute limit plus a per-second burst limit.
     """
 
+    EXEMPT_PATHS = {"/", "/health", "/api/docs", "/api/redoc"}
+
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         requests_per_minute: int = 60,
         burst_limit: int = 10,
+        store: Optional[RateLimitStore] = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.requests_per_minute = requests_per_minute
         self.burst_limit = burst_limit
-        self.request_counts: Dict[str, list[datetime]] = defaultdict(list)
-        self._lock = asyncio.Lock()
-
-    def _get_client_ip(self, request: Request) -> str:
-        forwarded = request.headers.get("X-Forwarded-For")
-        if forwarded:
-            return forwarded.split(",")[0].strip()
-        return request.client.host if request.client else "unknown"
+        self.store = store or MemoryRateLimitStore()
 
     async def _is_rate_limited(self, client_ip: str) -> Tuple[bool, int]:
-        now = datetime.utcnow()
-        window_start = now - timedelta(minutes=1)
-        last_second = now - timedelta(seconds=1)
-
-        async with self._lock:
-            timestamps = [
-                ts for ts in self.request_counts[client_ip]
-                if ts > window_start
-            ]
-            self.request_counts[client_ip] = timestamps
-
-            request_count = len(timestamps)
-            burst_count = sum(1 for ts in timestamps if ts > last_second)
-
-            if burst_count >= self.burst_limit:
-                return True, 1
-
-            if request_count >= self.requests_per_minute:
-                oldest = min(timestamps)
-                retry_after = int(
-                    (oldest + timedelta(minutes=1) - now).total_seconds()
-                ) + 1
-                return True, max(retry_after, 1)
-
-            self.request_counts[client_ip].append(now)
-            return False, 0
-
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path in {"/", "/health", "/api/docs", "/api/redoc"}:
-            return await call_next(request)
-
-        client_ip = self._get_client_ip(request)
+        burst = await self.store.hit(f"burst:{client_ip}", self.burst_limit, 1)
+        if not burst.allowed:
+            return True, retry_after_seconds(burst)
+
+        minute = await self.store.hit(f"minute:{client_ip}", self.requests_per_minute, 60)
+        if not minute.allowed:
+            return True, retry_after_seconds(minute)
+
+        return False, 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        client_ip = _get_client_ip(scope)
         is_limited, retry_after = await self._is_rate_limited(client_ip)
 
         if is_limited:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=HTTP_429_TOO_MANY_REQUESTS,
                 content={"detail": "Rate limit exceeded. Please slow down."},
                 headers={"Retry-After": str(retry_after)},
             )
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
-class AuthRateLimitMiddleware(BaseHTTPMiddleware):
+class AuthRateLimitMiddleware:
     """
     Stricter rate limiting for authentication endpoints.
     Protects against brute-force attacks.
     """
 
+    AUTH_PATHS = {
+        "/api/v1/auth/login",
+        "/api/v1/auth/2fa/verify",
+    }
+
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         max_attempts: int = 5,
         lockout_minutes: int = 15,
+        store: Optional[RateLimitStore] = None,
     ):
-        super().__init__(app)
+        self.app = app
         self.max_attempts = max_attempts
         self.lockout_minutes = lockout_minutes
-        self.failed_attempts: Dict[str, list[datetime]] = defaultdict(list)
-        self._lock = asyncio.Lock()
+        self.store = store or MemoryRateLimitStore()
 
-    def _get_client_ip(self, request: Request) -> str:
-        forwarded = request.headers.get("X-Forwarded-For")
-        if forwarded:
-            return forwarded.split(",")[0].strip()
-        return request.client.host if request.client else "unknown"
+    def _key(self, client_ip: str) -> str:
+        return f"auth-failures:{client_ip}"
 
     async def _check_lockout(self, client_ip: str) -> Tuple[bool, int]:
-        now = datetime.utcnow()
-        window_start = now - timedelta(minutes=self.lockout_minutes)
-
-        async with self._lock:
-            attempts = [
-                ts for ts in self.failed_attempts[client_ip]
-                if ts > window_start
-            ]
-            self.failed_attempts[client_ip] = attempts
-
-            if len(attempts) >= self.max_attempts:
-                oldest = min(attempts)
-                retry_after = int(
-                    (oldest + timedelta(minutes=self.lockout_minutes) - now).total_seconds()
-                )
-                return True, max(retry_after, 1)
-
-            return False, 0
+        # cost=0 only asks whether one more attempt would fit
+        result = await self.store.hit(
+            self._key(client_ip), self.max_attempts, self.lockout_minutes * 60, cost=0
+        )
+        if not result.allowed:
+            return True, retry_after_seconds(result)
+        return False, 0
 
     async def record_failed_attempt(self, client_ip: str):
-        async with self._lock:
-            self.failed_attempts[client_ip].append(datetime.utcnow())
+        await self.store.hit(
+            self._key(client_ip), self.max_attempts, self.lockout_minutes * 60, force=True
+        )
 
     async def clear_attempts(self, client_ip: str):
-        async with self._lock:
-            self.failed_attempts[client_ip].clear()
+        await self.store.reset(self._key(client_ip))
 
-    async def dispatch(self, request: Request, call_next):
-        auth_paths = {
-            "/api/v1/auth/login",
-            "/api/v1/auth/2fa/verify",
-        }
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] not in self.AUTH_PATHS:
+            await self.app(scope, receive, send)
+            return
 
-        if request.url.path not in auth_paths:
-            return await call_next(request)
-
-        client_ip = self._get_client_ip(request)
+        client_ip = _get_client_ip(scope)
         is_locked, retry_after = await self._check_lockout(client_ip)
 
         if is_locked:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "detail": (
@@ -160,12 +136,20 @@ class AuthRateLimitMiddleware(BaseHTTPMiddleware):
                 },
                 headers={"Retry-After": str(retry_after)},
             )
+            await response(scope, receive, send)
+            return
+
+        status_code = None
 
-        response = await call_next(request)
+        async def send_capturing_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        if response.status_code == 401:
+        await self.app(scope, receive, send_capturing_status)
+
+        if status_code == 401:
             await self.record_failed_attempt(client_ip)
-        elif response.status_code == 200 and request.url.path.endswith("/login"):
+        elif status_code == 200 and scope["path"].endswith("/login"):
             await self.clear_attempts(client_ip)
-
-        return response
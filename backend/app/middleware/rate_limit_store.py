@@ -0,0 +1,245 @@
+"""
+Storage backends for the rate limiting middleware.
+
+Limits are enforced with GCRA (the generic cell rate algorithm): each key
+keeps a single timestamp, its theoretical arrival time (TAT), which advances
+by ``period / limit`` per request. A request is allowed while the TAT stays
+within ``period`` of now, which admits ``limit`` requests per ``period``
+with smooth refill. Every check is O(1) in time and space, and a key whose
+TAT has passed holds no state and can be evicted.
+
+Backends:
+
+- ``memory``: per-process dict; for single-worker runs and tests
+- ``postgres``: shared ``rate_limit_buckets`` table, one upsert per check
+- ``redis``: shared Redis (or any server speaking its protocol), one Lua
+  script per check; needs the optional ``redis`` package
+"""
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, NamedTuple, Optional
+
+from sqlalchemy import Double, case, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.rate_limit import RateLimitBucket
+
+logger = logging.getLogger(__name__)
+
+# Idle keys are swept once per this many checks
+_SWEEP_EVERY = 1000
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a rate-limit check."""
+    allowed: bool
+    retry_after: float
+
+
+def _gcra(
+    tat: Optional[float],
+    now: float,
+    limit: int,
+    period: float,
+    cost: int,
+    force: bool,
+) -> tuple[Optional[float], RateLimitResult]:
+    """
+    Apply one GCRA step.
+
+    Returns:
+        Tuple of (new TAT to store or None to leave it, result). With
+        ``cost=0`` the check only reports whether one more request would be
+        allowed; ``force`` records the cost even when over the limit.
+    """
+    interval = period / limit
+    tat = max(tat or now, now)
+    overshoot = tat + interval * max(cost, 1) - now - period
+    allowed = overshoot <= 0
+    new_tat = tat + interval * cost if cost and (allowed or force) else None
+    return new_tat, RateLimitResult(allowed, max(overshoot, 0.0))
+
+
+class RateLimitStore(ABC):
+    """Backend holding rate-limit state."""
+
+    @abstractmethod
+    async def hit(
+        self,
+        key: str,
+        limit: int,
+        period: float,
+        cost: int = 1,
+        force: bool = False,
+    ) -> RateLimitResult:
+        """
+        Count ``cost`` requests against ``key`` (``limit`` per ``period``
+        seconds) and report whether they were allowed.
+        """
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """Forget all state for ``key``."""
+
+    async def close(self) -> None:
+        """Release any connections held by the backend."""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """
+    In-process store.
+
+    Checks run without awaiting, so each one is atomic with respect to the
+    event loop and needs no locking. Limits are per worker process.
+    """
+
+    def __init__(self):
+        self._tats: Dict[str, float] = {}
+        self._ops = 0
+
+    async def hit(self, key, limit, period, cost=1, force=False) -> RateLimitResult:
+        now = time.time()
+        self._ops += 1
+        if self._ops % _SWEEP_EVERY == 0:
+            self._sweep(now)
+
+        new_tat, result = _gcra(self._tats.get(key), now, limit, period, cost, force)
+        if new_tat is not None:
+            self._tats[key] = new_tat
+        return result
+
+    async def reset(self, key: str) -> None:
+        self._tats.pop(key, None)
+
+    def _sweep(self, now: float) -> None:
+        expired = [key for key, tat in self._tats.items() if tat <= now]
+        for key in expired:
+            del self._tats[key]
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+
+class PostgresRateLimitStore(RateLimitStore):
+    """Store backed by the ``rate_limit_buckets`` table."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self._ops = 0
+
+    async def hit(self, key, limit, period, cost=1, force=False) -> RateLimitResult:
+        now = time.time()
+        interval = period / limit
+        check_inc = interval * max(cost, 1)
+        apply_inc = interval * cost
+        table = RateLimitBucket.__table__
+
+        async with self.engine.begin() as conn:
+            if not cost:
+                tat = (await conn.execute(select(table.c.tat).where(table.c.key == key))).scalar()
+                return _gcra(tat, now, limit, period, cost, force)[1]
+
+            # The whole GCRA step as one upsert, so concurrent workers
+            # serialize on the row lock; the SET expressions see the old row.
+            now_param = literal(now, Double())
+            start = func.greatest(table.c.tat, now_param)
+            within = start + check_inc - now_param <= period
+            first_allowed = check_inc <= period
+            stmt = insert(table).values(
+                key=key,
+                tat=now + apply_inc if first_allowed or force else now,
+                allowed=first_allowed,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.key],
+                set_={
+                    "tat": start + apply_inc if force else case((within, start + apply_inc), else_=table.c.tat),
+                    "allowed": within,
+                },
+            ).returning(table.c.allowed, table.c.tat)
+            allowed, tat = (await conn.execute(stmt)).one()
+
+        self._ops += 1
+        if self._ops % _SWEEP_EVERY == 0:
+            await self._sweep(now)
+
+        if allowed:
+            return RateLimitResult(True, 0.0)
+        start_tat = max(tat - apply_inc if force else tat, now)
+        return RateLimitResult(False, max(start_tat + check_inc - now - period, 0.0))
+
+    async def reset(self, key: str) -> None:
+        table = RateLimitBucket.__table__
+        async with self.engine.begin() as conn:
+            await conn.execute(delete(table).where(table.c.key == key))
+
+    async def _sweep(self, now: float) -> None:
+        table = RateLimitBucket.__table__
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(delete(table).where(table.c.tat <= now))
+        except Exception as e:
+            logger.warning(f"Rate limit bucket sweep failed: {e}")
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """Store backed by Redis; keys expire on their own once idle."""
+
+    _HIT_SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local period = tonumber(ARGV[2])
+    local check_inc = tonumber(ARGV[3])
+    local apply_inc = tonumber(ARGV[4])
+    local force = ARGV[5] == '1'
+    local tat = tonumber(redis.call('GET', KEYS[1])) or now
+    if tat < now then tat = now end
+    local overshoot = tat + check_inc - now - period
+    if apply_inc > 0 and (overshoot <= 0 or force) then
+        local new_tat = tat + apply_inc
+        redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+    end
+    return tostring(overshoot)
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from e
+        self.client = aioredis.from_url(url)
+        self.prefix = prefix
+        self._script = self.client.register_script(self._HIT_SCRIPT)
+
+    async def hit(self, key, limit, period, cost=1, force=False) -> RateLimitResult:
+        interval = period / limit
+        overshoot = float(await self._script(
+            keys=[self.prefix + key],
+            args=[time.time(), period, interval * max(cost, 1), interval * cost, "1" if force else "0"],
+        ))
+        return RateLimitResult(overshoot <= 0, max(overshoot, 0.0))
+
+    async def reset(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_rate_limit_store(backend: str, redis_url: Optional[str] = None) -> RateLimitStore:
+    """Build the store selected by ``RATE_LIMIT_BACKEND``."""
+    if backend == "postgres":
+        from app.database.session import engine
+        return PostgresRateLimitStore(engine)
+    if backend == "redis":
+        if not redis_url:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires RATE_LIMIT_REDIS_URL")
+        return RedisRateLimitStore(redis_url)
+    return MemoryRateLimitStore()
+
+
+def retry_after_seconds(result: RateLimitResult) -> int:
+    """Whole seconds for a Retry-After header (at least 1)."""
+    return max(math.ceil(result.retry_after), 1)
@@ -1,11 +1,17 @@
 """
 Security middleware for request validation and protection.
+
+Implemented as plain ASGI middleware rather than ``BaseHTTPMiddleware`` so
+responses (including streamed ones) pass through without being buffered or
+re-wrapped in an extra task.
 """
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
-class ContentTypeValidationMiddleware(BaseHTTPMiddleware):
+class ContentTypeValidationMiddleware:
     """
     Validates Content-Type header for POST/PUT/PATCH requests.
     Prevents content-type confusion attacks.
@@ -17,40 +23,57 @@ class ContentTypeValidationMiddleware(BaseHTTPMiddleware):
         "multipart/form-data",
     ]
     
-    async def dispatch(self, request: Request, call_next):
-        if request.method in ["POST", "PUT", "PATCH"]:
-            content_type = request.headers.get("Content-Type", "")
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["method"] in ("POST", "PUT", "PATCH"):
+            content_type = Headers(scope=scope).get("Content-Type", "")
             
             # Extract base content type (ignore charset and boundary)
             base_content_type = content_type.split(";")[0].strip().lower()
             
             if base_content_type and base_content_type not in self.ALLOWED_CONTENT_TYPES:
-                raise HTTPException(
+                response = JSONResponse(
                     status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                    detail=f"Unsupported content type: {base_content_type}",
+                    content={"detail": f"Unsupported content type: {base_content_type}"},
                 )
+                await response(scope, receive, send)
+                return
         
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
 
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+class SecurityHeadersMiddleware:
     """
     Adds security headers to all responses.
     """
     
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
+    SECURITY_HEADERS = {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+        "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+    }
         
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+    def __init__(self, app: ASGIApp):
+        self.app = app
         
-        # Remove server header
-        if "server" in response.headers:
-            del response.headers["server"]
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self.SECURITY_HEADERS.items():
+                    headers[name] = value
+
+                # Remove server header
+                if "server" in headers:
+                    del headers["server"]
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
@@ -6,6 +6,11 @@ from app.models.sponsor import Sponsor
 from app.models.sponsorship import Sponsorship
 from app.models.payment import Payment, PaymentAccount, PaymentTransaction, PaymentWebhook
 from app.models.donation import OrganizationDonation
+from app.models.platform_stats import PlatformStatsSnapshot
+from app.models.rate_limit import RateLimitBucket
+from app.models.document_blob import DocumentBlob
+from app.models.email_outbox import OutboxEmail
+from app.models.unread_counter import UnreadCounter
 
 __all__ = [
     "User",
@@ -22,4 +27,9 @@ __all__ = [
     "PaymentTransaction",
     "PaymentWebhook",
     "OrganizationDonation",
+    "PlatformStatsSnapshot",
+    "RateLimitBucket",
+    "DocumentBlob",
+    "OutboxEmail",
+    "UnreadCounter",
 ]
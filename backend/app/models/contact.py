@@ -6,12 +6,28 @@ from typing import Optional
 from enum import Enum
 import uuid
 
-from sqlalchemy import String, Text, Boolean, Enum as SQLEnum
+from sqlalchemy import String, Text, Boolean, Computed, Index, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.base import Base, TimestampMixin, UUIDMixin
 
 
+# Text search language for subjects and messages; names and emails use the
+# unstemmed 'simple' configuration
+SEARCH_CONFIG = "english"
+
+# Names and emails rank above subjects, subjects above message bodies. Email
+# addresses are indexed whole and split at '@' and '.', so a search for
+# either part of an address finds it.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(email, '') || ' ' || translate(coalesce(email, ''), '@.', '  ')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(subject, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(message, '')), 'C')"
+)
+
+
 class InquiryType(str, Enum):
     """Contact form inquiry types."""
     GENERAL = "general"
@@ -36,6 +52,9 @@ class ContactSubmission(Base, UUIDMixin, TimestampMixin):
     """
     
     __tablename__ = "contact_submissions"
+    __table_args__ = (
+        Index("ix_contact_submissions_search", "search_vector", postgresql_using="gin"),
+    )
     
     # Contact details
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -68,3 +87,10 @@ class ContactSubmission(Base, UUIDMixin, TimestampMixin):
     response_notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    
+    # Full-text search document, maintained by Postgres; never loaded by default
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True,
+    )
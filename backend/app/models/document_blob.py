@@ -0,0 +1,68 @@
+"""
+Content-addressed document blob model.
+"""
+from collections import Counter
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, event, inspect, update
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.database.base import Base
+from app.models.student import StudentDocument
+
+
+class DocumentBlob(Base):
+    """
+    One stored (encrypted) document body, shared by every identical upload.
+
+    ``id`` is a keyed hash of the plaintext and names the file under
+    ``uploads/blobs/<id[:2]>/<id[2:4]>/<id>``. ``ref_count`` counts the
+    ``StudentDocument`` rows pointing at the blob and is maintained on flush;
+    blobs that reach zero are removed by ``scripts.check_blob_store``.
+    """
+
+    __tablename__ = "document_blobs"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+
+def _ref_count_deltas(session: Session) -> Counter:
+    deltas: Counter = Counter()
+    for obj in session.new:
+        if isinstance(obj, StudentDocument) and obj.blob_id:
+            deltas[obj.blob_id] += 1
+    for obj in session.deleted:
+        if isinstance(obj, StudentDocument):
+            history = inspect(obj).attrs.blob_id.history
+            for blob_id in history.deleted or history.unchanged:
+                if blob_id:
+                    deltas[blob_id] -= 1
+    for obj in session.dirty:
+        if isinstance(obj, StudentDocument):
+            history = inspect(obj).attrs.blob_id.history
+            for blob_id in history.deleted:
+                if blob_id:
+                    deltas[blob_id] -= 1
+            for blob_id in history.added:
+                if blob_id:
+                    deltas[blob_id] += 1
+    return deltas
+
+
+@event.listens_for(Session, "after_flush")
+def _update_blob_ref_counts(session: Session, flush_context) -> None:
+    """Keep ``ref_count`` in step with documents, in the same transaction."""
+    for blob_id, delta in _ref_count_deltas(session).items():
+        if delta:
+            session.connection().execute(
+                update(DocumentBlob)
+                .where(DocumentBlob.id == blob_id)
+                .values(ref_count=DocumentBlob.ref_count + delta)
+            )
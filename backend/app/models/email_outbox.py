@@ -0,0 +1,55 @@
+"""
+Outgoing email outbox model.
+"""
+from datetime import datetime
+from typing import Optional
+from enum import Enum
+
+from sqlalchemy import String, Text, Integer, Index, Enum as SQLEnum, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base, TimestampMixin, UUIDMixin
+
+
+class EmailStatus(str, Enum):
+    """Delivery status of an outgoing email."""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class OutboxEmail(Base, UUIDMixin, TimestampMixin):
+    """
+    An email waiting for, or done with, SMTP delivery.
+
+    Requests only insert rows here; the email workers deliver them over
+    pooled SMTP connections and retry temporary failures with backoff until
+    ``attempts`` reaches the configured limit.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Only rows still due for delivery are ever polled
+        Index(
+            "ix_email_outbox_due",
+            "next_attempt_at",
+            postgresql_where=text("next_attempt_at IS NOT NULL"),
+        ),
+    )
+
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    subject: Mapped[str] = mapped_column(Text, nullable=False)
+    html_content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    text_content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    reply_to: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+
+    status: Mapped[EmailStatus] = mapped_column(
+        SQLEnum(EmailStatus),
+        default=EmailStatus.PENDING,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # NULL once sent or when delivery has been given up
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
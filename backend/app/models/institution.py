@@ -7,11 +7,13 @@ from enum import Enum
 import uuid
 
 from sqlalchemy import (
+    DDL,
     String,
     Boolean,
     Text,
     ForeignKey,
     Index,
+    event,
     Enum as SQLEnum,  # ✅ FIXED: required for Postgres enums
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -132,7 +134,22 @@ class Institution(Base, UUIDMixin, TimestampMixin):
         Index("ix_institutions_type_verified_active", "institution_type", "is_verified", "compliance_status"),
         Index("ix_institutions_contact_email", "contact_person_email"),
         Index("ix_institutions_country_county", "country", "county"),
+        # Typeahead: similarity and word-similarity searches on the name
+        Index(
+            "ix_institutions_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
     )
 
     def __repr__(self) -> str:
         return f"<Institution {self.name} ({self.institution_type.value})>"
+
+
+# The trigram index needs pg_trgm when tables are created without Alembic
+event.listen(
+    Institution.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -6,7 +6,7 @@ from typing import Optional, TYPE_CHECKING
 from enum import Enum
 import uuid
 
-from sqlalchemy import String, Numeric, Text, Boolean, ForeignKey, Enum as SQLEnum
+from sqlalchemy import String, Numeric, Text, Boolean, Integer, ForeignKey, Index, Enum as SQLEnum, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 
@@ -157,6 +157,12 @@ class PaymentTransaction(Base, UUIDMixin, TimestampMixin):
 
     tx_metadata: Mapped[dict] = mapped_column(JSONB, default=dict)  # renamed from metadata
 
+    # Provider references used by callbacks/confirmations, indexed so lookups
+    # don't scan tx_metadata. Also mirrored in tx_metadata.
+    checkout_request_id: Mapped[Optional[str]] = mapped_column(String(100), unique=True, index=True, nullable=True)
+    paypal_order_id: Mapped[Optional[str]] = mapped_column(String(100), unique=True, index=True, nullable=True)
+    bank_transfer_reference: Mapped[Optional[str]] = mapped_column(String(100), unique=True, index=True, nullable=True)
+
     initiated_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
     completed_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
     failed_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
@@ -164,9 +170,23 @@ class PaymentTransaction(Base, UUIDMixin, TimestampMixin):
 
 
 class PaymentWebhook(Base, UUIDMixin, TimestampMixin):
-    """Webhook data from payment providers."""
+    """
+    Webhook data from payment providers.
+
+    Acts as the inbox for provider callbacks: rows are appended as soon as a
+    callback arrives and applied later by the webhook workers, which retry
+    failures until ``attempts`` reaches the configured limit.
+    """
 
     __tablename__ = "payment_webhooks"
+    __table_args__ = (
+        # Only unprocessed rows are ever polled
+        Index(
+            "ix_payment_webhooks_pending",
+            "next_attempt_at",
+            postgresql_where=text("processed = false"),
+        ),
+    )
 
     transaction_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
@@ -178,3 +198,9 @@ class PaymentWebhook(Base, UUIDMixin, TimestampMixin):
     provider: Mapped[str] = mapped_column(String(50), nullable=False)
     webhook_data: Mapped[dict] = mapped_column(JSONB, nullable=False)
     processed: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # NULL once processed or when retries are exhausted
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
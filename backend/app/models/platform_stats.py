@@ -0,0 +1,41 @@
+"""
+Platform statistics snapshot model.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import String, Integer, Numeric, Boolean, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+
+IMPACT_SNAPSHOT_KEY = "impact"
+
+
+class PlatformStatsSnapshot(Base):
+    """
+    Precomputed platform-wide aggregates.
+
+    One row per snapshot key. Rows are rewritten by the stats refresher and
+    flagged ``is_dirty`` after a change to the figures' source rows commits
+    (see ``app.services.stats_service``), so readers know the figures must
+    be recomputed before they are served again.
+    """
+
+    __tablename__ = "platform_stats_snapshot"
+
+    key: Mapped[str] = mapped_column(String(50), primary_key=True)
+
+    total_students: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_sponsors: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    active_sponsorships: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_fund_raised: Mapped[float] = mapped_column(Numeric(14, 2), default=0, nullable=False)
+    total_donations: Mapped[float] = mapped_column(Numeric(14, 2), default=0, nullable=False)
+    locations_served: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    is_dirty: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
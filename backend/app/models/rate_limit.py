@@ -0,0 +1,25 @@
+"""
+Rate limiter state model.
+"""
+from sqlalchemy import String, Double, Boolean
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+
+class RateLimitBucket(Base):
+    """
+    GCRA state for one rate-limit key, shared by every worker.
+
+    ``tat`` is the key's theoretical arrival time as a Unix timestamp; a key
+    whose ``tat`` is in the past carries no state and can be deleted. The
+    table is UNLOGGED: losing counters in a crash only resets the limits.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tat: Mapped[float] = mapped_column(Double, nullable=False)
+    # Outcome of the latest check, so the upsert can return it
+    allowed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
@@ -128,6 +128,15 @@ class StudentDocument(Base, UUIDMixin, TimestampMixin):
     file_name: Mapped[str] = mapped_column(String(255), nullable=False)
     file_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     mime_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    sha256: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
+    # Set for documents in the content-addressed blob store; older documents
+    # are individual files addressed by file_url
+    blob_id: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        ForeignKey("document_blobs.id"),
+        nullable=True,
+        index=True,
+    )
     
     status: Mapped[DocumentStatus] = mapped_column(
         SQLEnum(DocumentStatus),
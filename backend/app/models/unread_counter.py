@@ -0,0 +1,95 @@
+"""
+Unread counter model for the admin inbox.
+"""
+from sqlalchemy import DDL, BigInteger, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+from app.models.admin_notification import AdminNotification, NotificationType
+from app.models.contact import ContactSubmission, InquiryType
+
+NOTIFICATION_PREFIX = "notification:"
+CONTACT_PREFIX = "contact:"
+
+
+def notification_counter_key(notification_type: NotificationType) -> str:
+    return f"{NOTIFICATION_PREFIX}{notification_type.value}"
+
+
+def contact_counter_key(inquiry_type: InquiryType) -> str:
+    return f"{CONTACT_PREFIX}{inquiry_type.value}"
+
+
+class UnreadCounter(Base):
+    """
+    Number of unread admin notifications of one type, or unread contact
+    submissions of one inquiry type.
+
+    Maintained by row triggers on the counted tables, in the same
+    transaction as each change, so reading the unread totals is a
+    primary-key range scan instead of a ``COUNT(*)``. The periodic
+    reconciliation in ``app.services.unread_counter_service`` creates
+    missing rows and corrects anything changed by hand.
+    """
+
+    __tablename__ = "unread_counters"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+
+
+# Applies one row change to the counters. Fired per row by the triggers
+# below, so a delta reflects the row version the statement actually
+# changed: of two sessions marking the same row read, the second sees it
+# already read and changes nothing. Enum labels are lowercased to match the
+# Python enum values used in the keys.
+COUNT_UNREAD_FUNCTION = """
+CREATE OR REPLACE FUNCTION count_unread_rows() RETURNS trigger AS $$
+DECLARE
+    old_key text;
+    new_key text;
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        IF NOT OLD.is_read THEN
+            old_key := TG_ARGV[0] || lower(to_jsonb(OLD) ->> TG_ARGV[1]);
+        END IF;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        IF NOT NEW.is_read THEN
+            new_key := TG_ARGV[0] || lower(to_jsonb(NEW) ->> TG_ARGV[1]);
+        END IF;
+    END IF;
+    IF old_key IS NOT DISTINCT FROM new_key THEN
+        RETURN NULL;
+    END IF;
+    IF old_key IS NOT NULL THEN
+        UPDATE unread_counters SET count = count - 1 WHERE key = old_key;
+    END IF;
+    IF new_key IS NOT NULL THEN
+        INSERT INTO unread_counters (key, count) VALUES (new_key, 1)
+        ON CONFLICT (key) DO UPDATE SET count = unread_counters.count + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+NOTIFICATION_TRIGGER = f"""
+CREATE TRIGGER admin_notifications_count_unread
+AFTER INSERT OR DELETE OR UPDATE OF is_read, notification_type ON admin_notifications
+FOR EACH ROW EXECUTE FUNCTION count_unread_rows('{NOTIFICATION_PREFIX}', 'notification_type')
+"""
+
+CONTACT_TRIGGER = f"""
+CREATE TRIGGER contact_submissions_count_unread
+AFTER INSERT OR DELETE OR UPDATE OF is_read, inquiry_type ON contact_submissions
+FOR EACH ROW EXECUTE FUNCTION count_unread_rows('{CONTACT_PREFIX}', 'inquiry_type')
+"""
+
+# Installs the triggers when tables are created without Alembic
+for _table, _trigger in (
+    (AdminNotification.__table__, NOTIFICATION_TRIGGER),
+    (ContactSubmission.__table__, CONTACT_TRIGGER),
+):
+    event.listen(_table, "after_create", DDL(COUNT_UNREAD_FUNCTION).execute_if(dialect="postgresql"))
+    event.listen(_table, "after_create", DDL(_trigger).execute_if(dialect="postgresql"))
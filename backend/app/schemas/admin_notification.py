@@ -53,6 +53,8 @@ class AdminNotificationListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 
 class AdminNotificationUpdate(BaseModel):
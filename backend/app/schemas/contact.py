@@ -97,6 +97,9 @@ class ContactSubmissionDB(ContactMessageBase):
     responded_at: Optional[datetime] = None
     response_notes: Optional[str] = None
     is_read: bool = False
+    search_snippet: Optional[str] = Field(
+        None, description="Message excerpt with search matches in <mark> tags (search results only)"
+    )
     
     class Config:
         from_attributes = True
@@ -117,6 +120,8 @@ class ContactSubmissionListResponse(BaseModel):
     page_size: int
     total_pages: int
     unread_count: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
 
 class UnreadCountResponse(BaseModel):
@@ -67,3 +67,5 @@ class DonationListResponse(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
@@ -60,6 +60,14 @@ class InstitutionResponse(InstitutionBase):
         from_attributes = True
 
 
+class InstitutionSuggestion(BaseModel):
+    """Typeahead suggestion for institution pickers."""
+    id: UUID
+    name: str
+    institution_type: str
+    city: Optional[str] = None
+
+
 class InstitutionDetailResponse(InstitutionResponse):
     """Detailed institution response."""
     student_count: int = 0
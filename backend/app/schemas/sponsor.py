@@ -2,10 +2,12 @@
 Sponsor schemas.
 """
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr
+from typing import Dict, Optional, List
+from pydantic import BaseModel, EmailStr, computed_field
 from uuid import UUID
 
+from app.utils.images import profile_photo_variants
+
 
 class SponsorBase(BaseModel):
     """Base sponsor schema."""
@@ -76,3 +78,9 @@ class SponsorshipDetailResponse(SponsorshipResponse):
     student_name: Optional[str] = None
     student_photo_url: Optional[str] = None
     institution_name: Optional[str] = None
+
+    @computed_field
+    @property
+    def student_photo_variants(self) -> Optional[Dict[str, str]]:
+        """Resized WebP versions of the student's photo, keyed by size name."""
+        return profile_photo_variants(self.student_photo_url)
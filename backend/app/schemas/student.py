@@ -2,10 +2,12 @@
 Student schemas.
 """
 from datetime import datetime, date
-from typing import Optional, List
-from pydantic import BaseModel, Field
+from typing import Dict, Optional, List
+from pydantic import BaseModel, Field, computed_field
 from uuid import UUID
 
+from app.utils.images import profile_photo_variants
+
 
 class StudentBase(BaseModel):
     """Base student schema."""
@@ -98,6 +100,12 @@ class StudentResponse(StudentBase):
     updated_at: datetime
     fee_balance: Optional[StudentFeeBalanceResponse] = None
     
+    @computed_field
+    @property
+    def photo_variants(self) -> Optional[Dict[str, str]]:
+        """Resized WebP versions of the photo, keyed by size name."""
+        return profile_photo_variants(self.photo_url)
+    
     class Config:
         from_attributes = True
 
@@ -0,0 +1,207 @@
+"""
+Live admin events: new notifications and unread counters, pushed over SSE.
+
+Any flushed change that affects the admin inbox (a new notification, a
+notification or contact message being read, a contact submission arriving
+or being deleted) is announced with ``NOTIFY`` in the same transaction, so
+it goes out only once the change commits. Every worker runs
+``run_admin_event_listener``, which ``LISTEN``s on the channel and fans the
+events out to the admin streams connected to that worker.
+
+Counters are recomputed once per burst of changes per worker, and only while
+an admin is connected, instead of once per poll per open admin tab.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set
+
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.admin_notification import AdminNotification
+from app.models.contact import ContactSubmission
+from app.schemas.admin_notification import AdminNotificationResponse
+from app.services.admin_notification_service import AdminNotificationService
+from app.services.contact_service import ContactService
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "admin_events"
+
+# Events buffered per connected stream; a stream that falls further behind
+# loses its oldest events (a later "counts" event supersedes earlier ones)
+QUEUE_SIZE = 100
+
+# Wait this long after a change before dispatching, so a burst of changes
+# (e.g. mark-all-read) costs one counter query
+COALESCE_SECONDS = 0.1
+
+
+@dataclass
+class AdminEvent:
+    """One event for the admin stream: ``counts`` or ``notification``."""
+    name: str
+    data: Dict[str, Any]
+
+
+class AdminEventHub:
+    """Fans events out to the admin streams connected to this worker."""
+
+    def __init__(self, queue_size: int = QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, admin_event: AdminEvent) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(admin_event)
+
+
+admin_event_hub = AdminEventHub()
+
+
+async def load_unread_counts(db: AsyncSession) -> Dict[str, int]:
+    """Unread notification counts by type, plus unread contact messages."""
+    counts = await AdminNotificationService(db).get_unread_count()
+    counts["contact_unread"] = await ContactService(db).get_unread_count()
+    return counts
+
+
+def notification_event_data(notification: AdminNotification) -> Dict[str, Any]:
+    """JSON-ready notification, shaped like the REST responses."""
+    metadata = {}
+    if notification.metadata_json:
+        with suppress(json.JSONDecodeError):
+            metadata = json.loads(notification.metadata_json)
+    return AdminNotificationResponse(
+        id=notification.id,
+        notification_type=notification.notification_type,
+        title=notification.title,
+        message=notification.message,
+        related_user_id=notification.related_user_id,
+        related_entity_type=notification.related_entity_type,
+        related_entity_id=notification.related_entity_id,
+        metadata_json=notification.metadata_json,
+        is_read=notification.is_read,
+        read_at=notification.read_at,
+        created_at=notification.created_at,
+        metadata=metadata,
+    ).model_dump(mode="json")
+
+
+def _read_state_changed(obj: Any) -> bool:
+    return inspect(obj).attrs.is_read.history.has_changes()
+
+
+@event.listens_for(Session, "after_flush")
+def _announce_admin_changes(session: Session, flush_context) -> None:
+    """NOTIFY admin streams of inbox changes, with the transaction."""
+    inbox_types = (AdminNotification, ContactSubmission)
+    new_notification_ids = [str(obj.id) for obj in session.new if isinstance(obj, AdminNotification)]
+    counts_changed = (
+        any(isinstance(obj, inbox_types) for obj in session.new)
+        or any(isinstance(obj, inbox_types) for obj in session.deleted)
+        or any(isinstance(obj, inbox_types) and _read_state_changed(obj) for obj in session.dirty)
+    )
+    if not counts_changed:
+        return
+
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    # Postgres folds identical payloads within a transaction into one
+    payloads = [f"notification:{notification_id}" for notification_id in new_notification_ids] + ["counts"]
+    for payload in payloads:
+        connection.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": EVENTS_CHANNEL, "payload": payload},
+        )
+
+
+async def _dispatch(session_factory, changed: asyncio.Event, new_ids: List[uuid.UUID]) -> None:
+    """Turn announced changes into hub events, once per burst."""
+    while True:
+        await changed.wait()
+        await asyncio.sleep(COALESCE_SECONDS)
+        changed.clear()
+        ids, new_ids[:] = list(new_ids), []
+        if not admin_event_hub.subscriber_count:
+            continue
+
+        try:
+            async with session_factory() as db:
+                if ids:
+                    result = await db.execute(
+                        select(AdminNotification)
+                        .where(AdminNotification.id.in_(ids))
+                        .order_by(AdminNotification.created_at)
+                    )
+                    for notification in result.scalars():
+                        admin_event_hub.publish(AdminEvent("notification", notification_event_data(notification)))
+                admin_event_hub.publish(AdminEvent("counts", await load_unread_counts(db)))
+        except Exception as e:
+            logger.error(f"Failed to dispatch admin events: {e}")
+
+
+async def run_admin_event_listener(engine: AsyncEngine, session_factory) -> None:
+    """LISTEN for admin inbox changes from every worker until cancelled."""
+    if engine.dialect.name != "postgresql":
+        return
+
+    changed = asyncio.Event()
+    new_ids: List[uuid.UUID] = []
+
+    def on_notify(connection, pid, channel, payload) -> None:
+        kind, _, value = payload.partition(":")
+        if kind == "notification":
+            try:
+                new_ids.append(uuid.UUID(value))
+            except ValueError:
+                logger.warning(f"Ignoring malformed admin event: {payload!r}")
+        changed.set()
+
+    dispatcher = asyncio.create_task(_dispatch(session_factory, changed, new_ids))
+    try:
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    listener = raw.driver_connection
+                    await listener.add_listener(EVENTS_CHANNEL, on_notify)
+                    # Changes missed while disconnected can't be replayed,
+                    # but fresh counters cover them
+                    changed.set()
+                    try:
+                        while True:
+                            await asyncio.sleep(30)
+                            # Surfaces a dropped connection so we reconnect
+                            await listener.execute("SELECT 1")
+                    finally:
+                        await listener.remove_listener(EVENTS_CHANNEL, on_notify)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Admin event listener failed, reconnecting: {e}")
+                await asyncio.sleep(5)
+    finally:
+        dispatcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await dispatcher
@@ -7,11 +7,15 @@ from datetime import datetime
 from typing import Optional, List, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.admin_notification import AdminNotification, NotificationType
+from app.models.unread_counter import NOTIFICATION_PREFIX
 from app.schemas.admin_notification import AdminNotificationCreate
+from app.utils.counting import CountMode, count_rows
+from app.utils.pagination import keyset_paginate
+from app.services.unread_counter_service import read_unread_counters
 
 logger = logging.getLogger(__name__)
 
@@ -98,35 +102,46 @@ class AdminNotificationService:
         page_size: int = 20,
         notification_type: Optional[NotificationType] = None,
         unread_only: bool = False,
-    ) -> Tuple[List[AdminNotification], int]:
-        """Get paginated list of admin notifications."""
+        cursor: Optional[str] = None,
+        count_mode: Optional[CountMode] = None,
+    ) -> Tuple[List[AdminNotification], int, Optional[str], bool]:
+        """
+        Get paginated list of admin notifications, newest first.
+        
+        When ``cursor`` is given the page starts after it (keyset on
+        ``(created_at, id)``) and ``page`` is ignored. ``count_mode`` picks
+        how the total is computed.
+        
+        Returns:
+            Tuple of (notifications, total_count, next_cursor, total_is_estimate)
+        
+        Raises:
+            ValueError: If ``cursor`` is malformed.
+        """
         # Build query
         query = select(AdminNotification)
-        count_query = select(func.count(AdminNotification.id))
         
         # Apply filters
         if notification_type:
             query = query.where(AdminNotification.notification_type == notification_type)
-            count_query = count_query.where(AdminNotification.notification_type == notification_type)
         
         if unread_only:
             query = query.where(AdminNotification.is_read == False)
-            count_query = count_query.where(AdminNotification.is_read == False)
         
         # Get total count
-        result = await self.db.execute(count_query)
-        total = result.scalar() or 0
+        total, total_is_estimate = await count_rows(self.db, query, count_mode)
         
         # Apply pagination and ordering
-        offset = (page - 1) * page_size
-        query = query.order_by(AdminNotification.created_at.desc())
-        query = query.offset(offset).limit(page_size)
-        
-        # Execute query
-        result = await self.db.execute(query)
-        notifications = result.scalars().all()
+        notifications, next_cursor = await keyset_paginate(
+            self.db,
+            query,
+            [AdminNotification.created_at, AdminNotification.id],
+            page_size,
+            cursor=cursor,
+            offset=(page - 1) * page_size,
+        )
         
-        return list(notifications), total
+        return notifications, total, next_cursor, total_is_estimate
     
     async def get_notification_by_id(self, notification_id: UUID) -> Optional[AdminNotification]:
         """Get a single notification by ID."""
@@ -170,74 +185,23 @@ class AdminNotificationService:
         return count
     
     async def get_unread_count(self) -> dict:
-        """Get unread notification counts by type."""
-        # Total unread
-        total_result = await self.db.execute(
-            select(func.count(AdminNotification.id))
-            .where(AdminNotification.is_read == False)
-        )
-        total_unread = total_result.scalar() or 0
-        
-        # Count by registration types
-        registration_types = [
-            NotificationType.NEW_REGISTRATION,
-            NotificationType.NEW_SPONSOR,
-            NotificationType.NEW_INSTITUTION,
-            NotificationType.NEW_STUDENT,
-        ]
-        reg_result = await self.db.execute(
-            select(func.count(AdminNotification.id))
-            .where(
-                and_(
-                    AdminNotification.is_read == False,
-                    AdminNotification.notification_type.in_(registration_types)
-                )
-            )
-        )
-        new_registrations = reg_result.scalar() or 0
-        
-        # Count messages
-        msg_result = await self.db.execute(
-            select(func.count(AdminNotification.id))
-            .where(
-                and_(
-                    AdminNotification.is_read == False,
-                    AdminNotification.notification_type == NotificationType.NEW_CONTACT_MESSAGE
-                )
-            )
-        )
-        new_messages = msg_result.scalar() or 0
-        
-        # Count donations
-        don_result = await self.db.execute(
-            select(func.count(AdminNotification.id))
-            .where(
-                and_(
-                    AdminNotification.is_read == False,
-                    AdminNotification.notification_type == NotificationType.NEW_DONATION
-                )
-            )
-        )
-        new_donations = don_result.scalar() or 0
-        
-        # Count system alerts
-        alert_result = await self.db.execute(
-            select(func.count(AdminNotification.id))
-            .where(
-                and_(
-                    AdminNotification.is_read == False,
-                    AdminNotification.notification_type == NotificationType.SYSTEM_ALERT
-                )
-            )
-        )
-        system_alerts = alert_result.scalar() or 0
+        """Get unread notification counts by type, from the unread counters."""
+        counts = await read_unread_counters(self.db, NOTIFICATION_PREFIX)
+        
+        def unread(*types: NotificationType) -> int:
+            return sum(counts.get(t.value, 0) for t in types)
         
         return {
-            "unread_count": total_unread,
-            "new_registrations": new_registrations,
-            "new_messages": new_messages,
-            "new_donations": new_donations,
-            "system_alerts": system_alerts,
+            "unread_count": unread(*NotificationType),
+            "new_registrations": unread(
+                NotificationType.NEW_REGISTRATION,
+                NotificationType.NEW_SPONSOR,
+                NotificationType.NEW_INSTITUTION,
+                NotificationType.NEW_STUDENT,
+            ),
+            "new_messages": unread(NotificationType.NEW_CONTACT_MESSAGE),
+            "new_donations": unread(NotificationType.NEW_DONATION),
+            "system_alerts": unread(NotificationType.SYSTEM_ALERT),
         }
     
     async def delete_notification(self, notification_id: UUID) -> bool:
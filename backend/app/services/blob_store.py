@@ -0,0 +1,298 @@
+"""
+Content-addressed, deduplicated storage for student documents.
+
+Each distinct document body is stored once, encrypted, at
+
+    uploads/blobs/<id[:2]>/<id[2:4]>/<id>
+
+where ``id`` is a keyed SHA-256 of the plaintext. Two levels of 256-way
+sharding keep every directory small well past millions of documents.
+``StudentDocument.blob_id`` references the blob and the ``document_blobs``
+row counts those references (maintained on flush, see
+``app.models.document_blob``).
+
+Blob rows are locked while a file is placed or collected:
+
+- ``ingest`` upserts the row (locking it) before putting the file in place
+- ``check(collect=True)`` deletes files only for rows it has locked with
+  ``ref_count = 0``, and removes the row in the same transaction
+
+so a concurrent upload of the same content either keeps the blob alive or
+re-creates the file after it was collected.
+"""
+import logging
+import os
+import secrets
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Collection, Iterator, List, Optional, Set, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.models.document_blob import DocumentBlob
+from app.models.student import StudentDocument
+from app.services.file_service import (
+    IO_CHUNK_SIZE,
+    SecureFileStorageService,
+    file_storage_service,
+    receive_upload,
+)
+
+logger = logging.getLogger(__name__)
+
+# Files on disk without a row are only collected once this old, so a blob
+# placed by a still-open upload transaction is never mistaken for an orphan
+ORPHAN_GRACE_SECONDS = 3600
+
+
+@dataclass
+class StoredBlob:
+    """Result of ingesting an upload."""
+    blob_id: str
+    size: int
+    sha256: str
+    mime_type: Optional[str]
+    deduplicated: bool
+
+
+@dataclass
+class BlobStoreReport:
+    """Findings of a consistency check, and what was repaired."""
+    blobs: int = 0
+    files: int = 0
+    ref_count_mismatches: List[Tuple[str, int, int]] = field(default_factory=list)
+    missing_files: List[str] = field(default_factory=list)
+    unreferenced: List[str] = field(default_factory=list)
+    orphan_files: List[str] = field(default_factory=list)
+    corrupt: List[str] = field(default_factory=list)
+    fixed: int = 0
+    collected: int = 0
+
+    @property
+    def ok(self) -> bool:
+        """No referenced content is missing or damaged."""
+        return not self.missing_files and not self.corrupt
+
+
+class DocumentBlobStore:
+    """Deduplicated, encrypted document storage keyed by content."""
+
+    def __init__(self, storage: SecureFileStorageService):
+        self.storage = storage
+        self.root = storage.base_upload_dir / "blobs"
+        self.temp_dir = self.root / "tmp"
+
+    def blob_path(self, blob_id: str) -> Path:
+        return self.root / blob_id[:2] / blob_id[2:4] / blob_id
+
+    def _place(self, temp_path: Path, blob_id: str) -> bool:
+        """Move an ingested file into place; False if the blob already exists."""
+        target = self.blob_path(blob_id)
+        if target.exists():
+            temp_path.unlink(missing_ok=True)
+            return False
+        self.storage.ensure_dir(target.parent)
+        os.replace(temp_path, target)
+        return True
+
+    async def ingest(
+        self,
+        db: AsyncSession,
+        upload: UploadFile,
+        max_size: int,
+        allowed_types: Optional[Collection[str]] = None,
+    ) -> StoredBlob:
+        """
+        Stream an upload into the store, encrypting it.
+
+        The blob row is created (or locked) in ``db``'s transaction; the
+        caller commits it together with the ``StudentDocument`` that
+        references the blob, which is what bumps ``ref_count``.
+
+        Raises:
+            FileTooLargeError, UnsupportedFileTypeError: see ``receive_upload``.
+        """
+        self.storage.ensure_dir(self.temp_dir)
+        temp_path = self.temp_dir / f"{secrets.token_hex(16)}.part"
+        hasher = self.storage.encryption_service.blob_id_hasher()
+        received = await receive_upload(
+            upload,
+            temp_path,
+            max_size,
+            encryptor=self.storage.encryption_service.encryptor(),
+            allowed_types=allowed_types,
+            digests=(hasher,),
+        )
+        blob_id = hasher.hexdigest()
+
+        try:
+            # DO UPDATE (rather than DO NOTHING) so the row is locked until commit
+            stmt = insert(DocumentBlob).values(id=blob_id, size=received.size, ref_count=0)
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[DocumentBlob.id],
+                set_={"size": stmt.excluded.size},
+            ))
+            placed = await run_in_threadpool(self._place, temp_path, blob_id)
+        except BaseException:
+            await run_in_threadpool(temp_path.unlink, missing_ok=True)
+            raise
+
+        return StoredBlob(
+            blob_id=blob_id,
+            size=received.size,
+            sha256=received.sha256,
+            mime_type=received.mime_type,
+            deduplicated=not placed,
+        )
+
+    def stream(self, blob_id: str) -> Iterator[bytes]:
+        """
+        Decrypted contents of a blob, in chunks.
+
+        The file is opened before returning, so a missing blob raises
+        FileNotFoundError here rather than partway through a response.
+        """
+        f = open(self.blob_path(blob_id), "rb")
+
+        def read_chunks() -> Iterator[bytes]:
+            with f:
+                while chunk := f.read(IO_CHUNK_SIZE):
+                    yield chunk
+
+        return self.storage.encryption_service.iter_decrypt(read_chunks())
+
+    def _iter_files(self) -> Iterator[Tuple[str, float]]:
+        """(blob id, mtime) of every blob file, in id order."""
+        if not self.root.is_dir():
+            return
+        for level1 in sorted(entry.name for entry in os.scandir(self.root) if len(entry.name) == 2):
+            for level2 in sorted(entry.name for entry in os.scandir(self.root / level1)):
+                shard = self.root / level1 / level2
+                for entry in sorted(os.scandir(shard), key=lambda e: e.name):
+                    if entry.is_file() and not entry.name.endswith(".part"):
+                        yield entry.name, entry.stat().st_mtime
+
+    def _verify(self, blob_id: str) -> bool:
+        hasher = self.storage.encryption_service.blob_id_hasher()
+        try:
+            for chunk in self.stream(blob_id):
+                hasher.update(chunk)
+        except (OSError, ValueError):
+            return False
+        return hasher.hexdigest() == blob_id
+
+    async def check(
+        self,
+        db: AsyncSession,
+        fix: bool = False,
+        collect: bool = False,
+        verify: bool = False,
+    ) -> BlobStoreReport:
+        """
+        Compare the blob files, ``document_blobs`` and ``student_documents``.
+
+        Blob files and rows are both walked in id order and merged, so
+        memory stays flat however many blobs there are. Reports:
+
+        - rows whose ``ref_count`` differs from the documents referencing
+          them (``fix`` recounts them)
+        - rows whose file is missing
+        - rows no document references (``collect`` deletes them and their files)
+        - files with no row (``collect`` deletes those older than an hour)
+        - with ``verify``, files that fail decryption or don't hash to their id
+        """
+        report = BlobStoreReport()
+        now = time.time()
+
+        references = (
+            select(StudentDocument.blob_id, func.count().label("documents"))
+            .where(StudentDocument.blob_id.is_not(None))
+            .group_by(StudentDocument.blob_id)
+            .subquery()
+        )
+        rows = await db.stream(
+            select(DocumentBlob.id, DocumentBlob.ref_count, func.coalesce(references.c.documents, 0))
+            .outerjoin(references, references.c.blob_id == DocumentBlob.id)
+            .order_by(DocumentBlob.id)
+        )
+
+        files = self._iter_files()
+        next_file = next(files, None)
+        verified: Set[str] = set()
+
+        async for blob_id, ref_count, documents in rows:
+            report.blobs += 1
+            # Files sorting before this row have no row of their own
+            while next_file is not None and next_file[0] < blob_id:
+                report.files += 1
+                if now - next_file[1] > ORPHAN_GRACE_SECONDS:
+                    report.orphan_files.append(next_file[0])
+                next_file = next(files, None)
+
+            if next_file is not None and next_file[0] == blob_id:
+                report.files += 1
+                next_file = next(files, None)
+                if verify and documents:
+                    verified.add(blob_id)
+            else:
+                report.missing_files.append(blob_id)
+
+            if ref_count != documents:
+                report.ref_count_mismatches.append((blob_id, ref_count, documents))
+            if not documents:
+                report.unreferenced.append(blob_id)
+
+        while next_file is not None:
+            report.files += 1
+            if now - next_file[1] > ORPHAN_GRACE_SECONDS:
+                report.orphan_files.append(next_file[0])
+            next_file = next(files, None)
+
+        for blob_id in sorted(verified):
+            if not await run_in_threadpool(self._verify, blob_id):
+                report.corrupt.append(blob_id)
+
+        if fix:
+            for blob_id, _, documents in report.ref_count_mismatches:
+                await db.execute(
+                    update(DocumentBlob).where(DocumentBlob.id == blob_id).values(ref_count=documents)
+                )
+                report.fixed += 1
+            await db.commit()
+
+        if collect:
+            report.collected += await self._collect_unreferenced(db, report.unreferenced)
+            for blob_id in report.orphan_files:
+                await run_in_threadpool(self.blob_path(blob_id).unlink, missing_ok=True)
+                report.collected += 1
+
+        return report
+
+    async def _collect_unreferenced(self, db: AsyncSession, blob_ids: List[str]) -> int:
+        collected = 0
+        for blob_id in blob_ids:
+            # Re-check under the row lock: an upload may have just referenced it
+            locked = await db.scalar(
+                select(DocumentBlob.id)
+                .where(DocumentBlob.id == blob_id, DocumentBlob.ref_count == 0)
+                .with_for_update(skip_locked=True)
+            )
+            if locked is None:
+                await db.rollback()
+                continue
+            # Unlink before committing the delete, so an upload blocked on
+            # this row re-creates the file rather than losing it
+            await run_in_threadpool(self.blob_path(blob_id).unlink, missing_ok=True)
+            await db.execute(delete(DocumentBlob).where(DocumentBlob.id == blob_id))
+            await db.commit()
+            collected += 1
+        return collected
+
+
+# Singleton instance
+document_blob_store = DocumentBlobStore(file_storage_service)
@@ -2,17 +2,21 @@
 Contact service for handling form submissions and email notifications.
 """
 from html import escape
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime
 import logging
 import math
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc, or_
+from sqlalchemy import func, literal_column, select
 
 from app.utils.email import send_email
-from app.models.contact import ContactSubmission, InquiryType, ContactStatus
+from app.utils.counting import CountMode, count_rows
+from app.utils.pagination import keyset_paginate
+from app.models.contact import SEARCH_CONFIG, ContactSubmission, InquiryType, ContactStatus
+from app.models.unread_counter import CONTACT_PREFIX
+from app.services.unread_counter_service import read_unread_counters
 from app.schemas.contact import InquiryTypeEnum
 
 logger = logging.getLogger(__name__)
@@ -25,6 +29,36 @@ INQUIRY_LABELS: dict[str, str] = {
     "student": "Student Support",
 }
 
+# ts_headline options; the markers are swapped for <mark> tags after the
+# excerpt has been HTML-escaped
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", '
+    'MaxFragments=2, MaxWords=25, MinWords=8, FragmentDelimiter=" ... "'
+)
+
+
+def _regconfig(name: str):
+    # Inlined rather than bound, so Postgres resolves it as a regconfig
+    return literal_column(f"'{name}'::regconfig")
+
+
+def _search_query(search: str):
+    """
+    tsquery for admin search text (web-search syntax: quotes, ``or``, ``-``).
+
+    Stemmed English terms match subjects and messages; the unstemmed form
+    also matches names and email addresses, which aren't stemmed.
+    """
+    return func.websearch_to_tsquery(_regconfig(SEARCH_CONFIG), search).op("||")(
+        func.websearch_to_tsquery(_regconfig("simple"), search)
+    )
+
+
+def _highlight_html(headline: str) -> str:
+    return escape(headline).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
 
 class ContactService:
     """Service for handling contact form submissions."""
@@ -123,19 +157,33 @@ class ContactService:
         inquiry_type_filter: Optional[str] = None,
         search: Optional[str] = None,
         unread_only: bool = False,
-    ) -> Tuple[List[ContactSubmission], int, int]:
+        cursor: Optional[str] = None,
+        count_mode: Optional[CountMode] = None,
+    ) -> Tuple[List[ContactSubmission], int, int, Optional[str], bool]:
         """
-        Get paginated list of contact submissions.
+        Get paginated list of contact submissions, newest first.
+        
+        When ``cursor`` is given the page starts after it (keyset on
+        ``(created_at, id)``) and ``page`` is ignored. ``count_mode`` picks
+        how the total is computed; the unread count comes from the
+        unread counters.
+        
+        ``search`` is matched against the full-text index and orders the
+        results by relevance instead. Ranked results are paged by ``page``
+        only: ``cursor`` is ignored and no ``next_cursor`` is returned.
         
         Returns:
-            Tuple of (submissions, total_count, unread_count)
+            Tuple of (submissions, total_count, unread_count, next_cursor,
+            total_is_estimate)
+        
+        Raises:
+            ValueError: If ``cursor`` is malformed.
         """
         if not self.db:
-            return [], 0, 0
+            return [], 0, 0, None, False
         
         # Build base query
         query = select(ContactSubmission)
-        count_query = select(func.count(ContactSubmission.id))
         
         # Apply filters
         filters = []
@@ -153,14 +201,10 @@ class ContactService:
             except ValueError:
                 pass
         
-        if search:
-            search_filter = or_(
-                ContactSubmission.name.ilike(f"%{search}%"),
-                ContactSubmission.email.ilike(f"%{search}%"),
-                ContactSubmission.subject.ilike(f"%{search}%"),
-                ContactSubmission.message.ilike(f"%{search}%"),
-            )
-            filters.append(search_filter)
+        search_query = None
+        if search and search.strip():
+            search_query = _search_query(search.strip())
+            filters.append(ContactSubmission.search_vector.op("@@")(search_query))
         
         if unread_only:
             filters.append(ContactSubmission.is_read == False)
@@ -168,27 +212,56 @@ class ContactService:
         if filters:
             for f in filters:
                 query = query.where(f)
-                count_query = count_query.where(f)
         
         # Get total count
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
+        total, total_is_estimate = await count_rows(self.db, query, count_mode)
         
         # Get unread count (without status filter)
-        unread_query = select(func.count(ContactSubmission.id)).where(
-            ContactSubmission.is_read == False
-        )
-        unread_result = await self.db.execute(unread_query)
-        unread_count = unread_result.scalar() or 0
+        unread_count = await self.get_unread_count()
+        
+        if search_query is not None:
+            rank = func.ts_rank_cd(ContactSubmission.search_vector, search_query)
+            result = await self.db.execute(
+                query.order_by(rank.desc(), ContactSubmission.created_at.desc(), ContactSubmission.id.desc())
+                .offset((page - 1) * page_size)
+                .limit(page_size)
+            )
+            return list(result.scalars().all()), total, unread_count, None, total_is_estimate
         
         # Apply pagination and ordering
-        offset = (page - 1) * page_size
-        query = query.order_by(desc(ContactSubmission.created_at)).offset(offset).limit(page_size)
+        submissions, next_cursor = await keyset_paginate(
+            self.db,
+            query,
+            [ContactSubmission.created_at, ContactSubmission.id],
+            page_size,
+            cursor=cursor,
+            offset=(page - 1) * page_size,
+        )
+        
+        return submissions, total, unread_count, next_cursor, total_is_estimate
+    
+    async def search_snippets(self, submission_ids: List[UUID], search: str) -> Dict[UUID, str]:
+        """
+        Message excerpts around the matches of ``search``, for a page of
+        search results.
         
-        result = await self.db.execute(query)
-        submissions = list(result.scalars().all())
+        Returns:
+            ``{submission_id: html}``, the excerpt HTML-escaped with matched
+            terms wrapped in ``<mark>``
+        """
+        if not self.db or not submission_ids or not search.strip():
+            return {}
         
-        return submissions, total, unread_count
+        headline = func.ts_headline(
+            _regconfig(SEARCH_CONFIG),
+            ContactSubmission.message,
+            _search_query(search.strip()),
+            HEADLINE_OPTIONS,
+        )
+        result = await self.db.execute(
+            select(ContactSubmission.id, headline).where(ContactSubmission.id.in_(submission_ids))
+        )
+        return {submission_id: _highlight_html(text) for submission_id, text in result.all()}
     
     async def get_submission_by_id(self, submission_id: UUID) -> Optional[ContactSubmission]:
         """Get a single submission by ID."""
@@ -232,15 +305,12 @@ class ContactService:
         return await self.update_submission(submission_id, is_read=True)
     
     async def get_unread_count(self) -> int:
-        """Get count of unread submissions."""
+        """Get count of unread submissions, from the unread counters."""
         if not self.db:
             return 0
         
-        query = select(func.count(ContactSubmission.id)).where(
-            ContactSubmission.is_read == False
-        )
-        result = await self.db.execute(query)
-        return result.scalar() or 0
+        counts = await read_unread_counters(self.db, CONTACT_PREFIX)
+        return sum(counts.values())
     
     async def send_contact_message(
         self,
@@ -253,7 +323,7 @@ class ContactService:
         submission_id: Optional[UUID] = None,
     ) -> dict:
         """
-        Send contact form message via email.
+        Queue the contact form message for delivery by email.
         
         Args:
             name: Sender's full name
@@ -335,10 +405,12 @@ class ContactService:
                 body=html_body,
                 is_html=True,
                 reply_to=email,
+                db=self.db,
             )
-            logger.info(f"Contact email sent successfully from {email}")
+            logger.info(f"Contact email queued from {email}")
             
-            # Update submission status if ID provided
+            # Update submission status if ID provided; once queued the
+            # outbox retries until it's delivered
             if submission_id and self.db:
                 await self.update_submission_status(submission_id, ContactStatus.SENT)
             
@@ -0,0 +1,194 @@
+"""
+Service layer for the outgoing email outbox.
+
+Sending an email only inserts a row into ``email_outbox``; background
+workers deliver due rows over a shared pool of SMTP connections, sending a
+batch concurrently across the pool. Rows are claimed with
+``FOR UPDATE SKIP LOCKED`` so workers (in this process or others) never
+send the same email twice, temporary failures are retried with exponential
+backoff, and every row records its delivery status and last error.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from email import policy
+from email.message import EmailMessage
+from email.utils import format_datetime, formataddr
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.email_outbox import EmailStatus, OutboxEmail
+from app.utils.smtp import SMTPConnectionPool, SMTPError
+
+logger = logging.getLogger(__name__)
+
+# Set when an email is enqueued so idle workers pick it up without waiting
+# for the next poll.
+_wakeup = asyncio.Event()
+
+_smtp_pool: Optional[SMTPConnectionPool] = None
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """The process-wide SMTP connection pool, created on first use."""
+    global _smtp_pool
+    if _smtp_pool is None:
+        _smtp_pool = SMTPConnectionPool(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            size=settings.SMTP_POOL_SIZE,
+            tls_mode=settings.SMTP_TLS_MODE,
+            username=settings.SMTP_USER or None,
+            password=settings.SMTP_PASSWORD,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+            idle_seconds=settings.SMTP_IDLE_SECONDS,
+            max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+            allow_plaintext_auth=settings.SMTP_ALLOW_PLAINTEXT_AUTH,
+        )
+    return _smtp_pool
+
+
+async def close_smtp_pool() -> None:
+    """Close pooled SMTP connections."""
+    global _smtp_pool
+    if _smtp_pool is not None:
+        await _smtp_pool.close()
+        _smtp_pool = None
+
+
+def build_message(email: OutboxEmail) -> bytes:
+    """
+    Render an outbox row as an RFC 5322 message.
+
+    The Message-ID is derived from the row id, so a retried delivery carries
+    the same id and receiving servers can drop the duplicate.
+
+    Raises:
+        ValueError: if a header value contains a line break.
+    """
+    domain = settings.EMAILS_FROM_EMAIL.rpartition("@")[2] or "localhost"
+    message = EmailMessage()
+    message["From"] = formataddr((settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL))
+    message["To"] = email.to_email
+    message["Subject"] = email.subject
+    if email.reply_to:
+        message["Reply-To"] = email.reply_to
+    message["Date"] = format_datetime(email.created_at or datetime.now(timezone.utc))
+    message["Message-ID"] = f"<{email.id}@{domain}>"
+
+    if email.text_content:
+        message.set_content(email.text_content)
+        if email.html_content:
+            message.add_alternative(email.html_content, subtype="html")
+    else:
+        message.set_content(email.html_content or "", subtype="html")
+    return message.as_bytes(policy=policy.SMTP)
+
+
+class EmailOutboxService:
+    """Service for queueing and delivering outgoing email."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: Optional[str] = None,
+        text_content: Optional[str] = None,
+        reply_to: Optional[str] = None,
+    ) -> OutboxEmail:
+        """Durably record an email for background delivery."""
+        email = OutboxEmail(
+            to_email=to_email,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content,
+            reply_to=reply_to,
+            status=EmailStatus.PENDING,
+            attempts=0,
+            next_attempt_at=datetime.now(timezone.utc),
+        )
+        self.db.add(email)
+        await self.db.commit()
+        _wakeup.set()
+        return email
+
+    async def process_pending(self, pool: SMTPConnectionPool, batch_size: int) -> int:
+        """
+        Claim and send up to ``batch_size`` due emails.
+
+        The batch is sent concurrently; the pool bounds how many messages
+        are in flight at once.
+
+        Returns:
+            Number of emails claimed
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(OutboxEmail)
+            .where(OutboxEmail.next_attempt_at <= now)
+            .order_by(OutboxEmail.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        emails = result.scalars().all()
+
+        outcomes = await asyncio.gather(
+            *(self._deliver(pool, email) for email in emails),
+            return_exceptions=True,
+        )
+
+        for email, error in zip(emails, outcomes):
+            email.attempts += 1
+            if error is None:
+                email.status = EmailStatus.SENT
+                email.sent_at = datetime.now(timezone.utc)
+                email.next_attempt_at = None
+                email.last_error = None
+                continue
+
+            email.last_error = str(error)[:2000]
+            permanent = isinstance(error, ValueError) or (isinstance(error, SMTPError) and error.permanent)
+            if permanent or email.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                email.status = EmailStatus.FAILED
+                email.next_attempt_at = None
+                logger.error(f"Giving up on email {email.id} to {email.to_email} after {email.attempts} attempts: {error}")
+            else:
+                delay = settings.EMAIL_RETRY_BASE_SECONDS * (2 ** (email.attempts - 1))
+                email.next_attempt_at = now + timedelta(seconds=delay)
+                logger.warning(f"Email {email.id} to {email.to_email} failed, retrying in {delay:.0f}s: {error}")
+
+        await self.db.commit()
+        return len(emails)
+
+    async def _deliver(self, pool: SMTPConnectionPool, email: OutboxEmail) -> None:
+        await pool.send_message(settings.EMAILS_FROM_EMAIL, [email.to_email], build_message(email))
+
+
+async def run_email_worker(session_factory) -> None:
+    """Send pending emails until cancelled."""
+    pool = get_smtp_pool()
+    while True:
+        try:
+            async with session_factory() as db:
+                claimed = await EmailOutboxService(db).process_pending(pool, settings.EMAIL_BATCH_SIZE)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Email worker batch failed: {e}")
+            claimed = 0
+
+        # A full batch means there may be more waiting
+        if claimed >= settings.EMAIL_BATCH_SIZE:
+            continue
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.EMAIL_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
@@ -1,48 +1,442 @@
 """
 Secure file storage service with encryption.
+
+Encrypted documents are written in a chunked AEAD container so they can be
+encrypted and decrypted as streams with bounded memory:
+
+    header:   b"DPE" + version (1) | segment size (uint32 BE) | nonce prefix (7)
+    segments: AES-256-GCM(segment of plaintext) + 16-byte tag, repeated
+
+Each segment's nonce is ``prefix | counter (uint32 BE) | last flag (1 byte)``
+and the header is authenticated as associated data, so reordering,
+truncating or extending a file fails decryption. Files written before the
+container existed are single Fernet tokens and are still readable.
 """
 import os
 import uuid
 import base64
 import hashlib
+import hmac
 import secrets
+import struct
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from typing import IO, TYPE_CHECKING, Any, Collection, Iterator, Optional, Sequence, Set, Tuple
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+
+CONTAINER_MAGIC = b"DPE\x01"
+SEGMENT_SIZE = 64 * 1024
+TAG_SIZE = 16
+NONCE_PREFIX_SIZE = 7
+HEADER_SIZE = len(CONTAINER_MAGIC) + 4 + NONCE_PREFIX_SIZE
+
+# Read/write granularity for streaming files to and from disk
+IO_CHUNK_SIZE = 16 * SEGMENT_SIZE
+
+# Canonical extension per sniffable type. Stored files are named with the
+# extension of their sniffed type, so serving maps it straight back.
+EXTENSION_BY_MIME_TYPE = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "application/pdf": ".pdf",
+}
+MIME_TYPE_BY_EXTENSION = {
+    **{ext: mime for mime, ext in EXTENSION_BY_MIME_TYPE.items()},
+    ".jpeg": "image/jpeg",
+}
+
+
+class FileDecryptionError(ValueError):
+    """Encrypted file is corrupt, truncated, or was not written with our key."""
+
+
+class FileTooLargeError(ValueError):
+    """Upload exceeded the allowed size; nothing was stored."""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File exceeds {max_size} bytes")
+        self.max_size = max_size
+
+
+class UnsupportedFileTypeError(ValueError):
+    """Upload content is not one of the allowed types; nothing was stored."""
+
+
+@dataclass
+class StoredFile:
+    """Result of storing an upload."""
+    path: str
+    url: str
+    size: int
+    sha256: str
+    mime_type: Optional[str]
+    is_encrypted: bool
+
+
+def sniff_mime_type(head: bytes) -> Optional[str]:
+    """Identify a file from its leading bytes, or None if unrecognised."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    return None
+
+
+def mime_type_for(filename: str, default: str = "application/octet-stream") -> str:
+    """MIME type of a stored file, from the extension it was stored under."""
+    return MIME_TYPE_BY_EXTENSION.get(Path(filename).suffix.lower(), default)
+
+
+@lru_cache(maxsize=None)
+def _derive_key(master_key: str, salt: bytes) -> bytes:
+    """
+    Derive the Fernet key from the master key.
+
+    PBKDF2 at 480,000 iterations takes a noticeable fraction of a second, so
+    it runs once per process on first use rather than at import.
+    """
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=480000,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(master_key.encode()))
+
+
+@lru_cache(maxsize=None)
+def _derive_segment_key(master_key: str, salt: bytes) -> bytes:
+    """AES-256 key for the chunked container, kept separate from the Fernet key."""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"destinypal file segments v1",
+    ).derive(base64.urlsafe_b64decode(_derive_key(master_key, salt)))
+
+
+@lru_cache(maxsize=None)
+def _derive_blob_id_key(master_key: str, salt: bytes) -> bytes:
+    """HMAC key naming content-addressed blobs."""
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"destinypal blob ids v1",
+    ).derive(base64.urlsafe_b64decode(_derive_key(master_key, salt)))
+
+
+def _segment_nonce(prefix: bytes, counter: int, last: bool) -> bytes:
+    if counter > 0xFFFFFFFF:
+        raise OverflowError("File too large for the encrypted container")
+    return prefix + struct.pack(">IB", counter, 1 if last else 0)
+
+
+class StreamEncryptor:
+    """
+    Incrementally encrypts plaintext into the chunked container.
+
+    Feed plaintext to ``update`` in chunks of any size and write out what it
+    returns; ``finalize`` returns the closing segment. At most one segment of
+    plaintext is buffered.
+    """
+
+    def __init__(self, aead: "AESGCM", segment_size: int = SEGMENT_SIZE):
+        self._aead = aead
+        self._segment_size = segment_size
+        self._prefix = secrets.token_bytes(NONCE_PREFIX_SIZE)
+        self._header = CONTAINER_MAGIC + struct.pack(">I", segment_size) + self._prefix
+        self._header_sent = False
+        self._counter = 0
+        self._buffer = b""
+
+    def _seal(self, segment, last: bool) -> bytes:
+        nonce = _segment_nonce(self._prefix, self._counter, last)
+        self._counter += 1
+        return self._aead.encrypt(nonce, bytes(segment), self._header)
+
+    def _start(self) -> list:
+        if self._header_sent:
+            return []
+        self._header_sent = True
+        return [self._header]
+
+    def update(self, data: bytes) -> bytes:
+        out = self._start()
+        pending = self._buffer + data if self._buffer else data
+        view = memoryview(pending)
+        pos = 0
+        # Keep the trailing segment back: only finalize knows it is the last
+        while len(view) - pos > self._segment_size:
+            out.append(self._seal(view[pos:pos + self._segment_size], last=False))
+            pos += self._segment_size
+        self._buffer = bytes(view[pos:])
+        return b"".join(out)
+
+    def finalize(self) -> bytes:
+        out = self._start()
+        out.append(self._seal(self._buffer, last=True))
+        self._buffer = b""
+        return b"".join(out)
+
+
+class StreamDecryptor:
+    """
+    Incrementally decrypts the chunked container.
+
+    Only authenticated plaintext is ever returned. ``finalize`` must be
+    called to detect truncation: until the flagged last segment has been
+    verified, the file may have been cut short.
+
+    Raises:
+        FileDecryptionError: on a bad header or any failed segment.
+    """
+
+    def __init__(self, aead: "AESGCM"):
+        self._aead = aead
+        self._header: Optional[bytes] = None
+        self._prefix = b""
+        self._sealed_size = 0
+        self._counter = 0
+        self._buffer = b""
+
+    def _open(self, segment, last: bool) -> bytes:
+        from cryptography.exceptions import InvalidTag
+
+        nonce = _segment_nonce(self._prefix, self._counter, last)
+        self._counter += 1
+        try:
+            return self._aead.decrypt(nonce, bytes(segment), self._header)
+        except InvalidTag:
+            raise FileDecryptionError(f"Encrypted segment {self._counter - 1} failed authentication") from None
+
+    def _read_header(self, pending: bytes) -> int:
+        if not pending.startswith(CONTAINER_MAGIC[:len(pending)]):
+            raise FileDecryptionError("Not an encrypted file container")
+        if len(pending) < HEADER_SIZE:
+            return 0
+        self._header = pending[:HEADER_SIZE]
+        (segment_size,) = struct.unpack(">I", self._header[4:8])
+        if not segment_size:
+            raise FileDecryptionError("Invalid segment size in header")
+        self._sealed_size = segment_size + TAG_SIZE
+        self._prefix = self._header[8:]
+        return HEADER_SIZE
+
+    def update(self, data: bytes) -> bytes:
+        pending = self._buffer + data if self._buffer else data
+        pos = 0
+        if self._header is None:
+            pos = self._read_header(pending)
+            if self._header is None:
+                self._buffer = pending
+                return b""
+
+        view = memoryview(pending)
+        out = []
+        while len(view) - pos > self._sealed_size:
+            out.append(self._open(view[pos:pos + self._sealed_size], last=False))
+            pos += self._sealed_size
+        self._buffer = bytes(view[pos:])
+        return b"".join(out)
+
+    def finalize(self) -> bytes:
+        if self._header is None or len(self._buffer) < TAG_SIZE:
+            raise FileDecryptionError("Encrypted file is truncated")
+        plaintext = self._open(self._buffer, last=True)
+        self._buffer = b""
+        return plaintext
+
+
+def is_container(data: bytes) -> bool:
+    """Whether ``data`` starts like a chunked container (vs a legacy Fernet token)."""
+    return data.startswith(CONTAINER_MAGIC)
+
 
 class FileEncryptionService:
     """Service for encrypting and decrypting files."""
 
     def __init__(self):
         # Use environment variable for master key or generate one
-        master_key = os.getenv("FILE_ENCRYPTION_KEY", settings.SECRET_KEY)
+        self._master_key = os.getenv("FILE_ENCRYPTION_KEY", settings.SECRET_KEY)
         self.salt = os.getenv("FILE_ENCRYPTION_SALT", "destiny_pal_salt_2024").encode()
-        self._fernet = self._create_fernet(master_key)
-
-    def _create_fernet(self, master_key: str) -> Fernet:
-        """Create Fernet instance from master key."""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=480000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(master_key.encode()))
-        return Fernet(key)
+        self._fernet_instance: Optional["Fernet"] = None
+        self._aead_instance: Optional["AESGCM"] = None
+
+    @property
+    def _fernet(self) -> "Fernet":
+        """Fernet instance for legacy files, created on first use."""
+        if self._fernet_instance is None:
+            from cryptography.fernet import Fernet
+
+            self._fernet_instance = Fernet(_derive_key(self._master_key, self.salt))
+        return self._fernet_instance
+
+    @property
+    def _aead(self) -> "AESGCM":
+        """AES-GCM instance for the chunked container, created on first use."""
+        if self._aead_instance is None:
+            from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+            self._aead_instance = AESGCM(_derive_segment_key(self._master_key, self.salt))
+        return self._aead_instance
+
+    def encryptor(self) -> StreamEncryptor:
+        """Start encrypting a new file as a stream."""
+        return StreamEncryptor(self._aead)
+
+    def decryptor(self) -> StreamDecryptor:
+        """Start decrypting a chunked container as a stream."""
+        return StreamDecryptor(self._aead)
+
+    def blob_id_hasher(self) -> "hmac.HMAC":
+        """
+        Keyed SHA-256 of plaintext, used to name deduplicated blobs.
+
+        Keyed so stored file names can't be matched against the plain
+        SHA-256 of a known document.
+        """
+        return hmac.new(_derive_blob_id_key(self._master_key, self.salt), digestmod=hashlib.sha256)
 
     def encrypt_file(self, file_data: bytes) -> bytes:
         """Encrypt file data."""
-        return self._fernet.encrypt(file_data)
+        encryptor = self.encryptor()
+        return encryptor.update(file_data) + encryptor.finalize()
 
     def decrypt_file(self, encrypted_data: bytes) -> bytes:
-        """Decrypt file data."""
-        return self._fernet.decrypt(encrypted_data)
+        """Decrypt file data in either the chunked or the legacy Fernet format."""
+        if not is_container(encrypted_data):
+            return self._fernet.decrypt(encrypted_data)
+        decryptor = self.decryptor()
+        return decryptor.update(encrypted_data) + decryptor.finalize()
+
+    def iter_decrypt(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """
+        Decrypt an encrypted file given as a stream of chunks.
+
+        Chunked containers are decrypted segment by segment. Legacy Fernet
+        files can only be decrypted whole, so they are buffered first.
+        """
+        first = next(chunks, b"")
+        if not is_container(first):
+            plaintext = self._fernet.decrypt(first + b"".join(chunks))
+            for pos in range(0, len(plaintext), IO_CHUNK_SIZE):
+                yield plaintext[pos:pos + IO_CHUNK_SIZE]
+            return
+
+        decryptor = self.decryptor()
+        yield decryptor.update(first)
+        for chunk in chunks:
+            plaintext = decryptor.update(chunk)
+            if plaintext:
+                yield plaintext
+        yield decryptor.finalize()
+
+
+@dataclass
+class ReceivedUpload:
+    """An upload written out to a temporary file."""
+    size: int
+    sha256: str
+    mime_type: Optional[str]
+
+
+def _write_chunk(f: IO[bytes], digests: Sequence[Any], encryptor: Optional[StreamEncryptor], chunk: bytes) -> None:
+    for digest in digests:
+        digest.update(chunk)
+    f.write(encryptor.update(chunk) if encryptor else chunk)
+
+
+def _close_temp_file(f: IO[bytes], encryptor: Optional[StreamEncryptor]) -> None:
+    with f:
+        if encryptor:
+            f.write(encryptor.finalize())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _discard_temp_file(f: IO[bytes], temp_path: Path) -> None:
+    f.close()
+    temp_path.unlink(missing_ok=True)
+
+
+async def receive_upload(
+    upload: UploadFile,
+    temp_path: Path,
+    max_size: int,
+    encryptor: Optional[StreamEncryptor] = None,
+    allowed_types: Optional[Collection[str]] = None,
+    digests: Sequence[Any] = (),
+) -> ReceivedUpload:
+    """
+    Stream an upload to ``temp_path``, hashing and optionally encrypting it.
+
+    The upload is read in ``IO_CHUNK_SIZE`` pieces: each is hashed (SHA-256
+    plus any extra ``digests``), encrypted and written on the threadpool, so
+    memory stays bounded and the event loop never blocks on disk. The file
+    is fsynced and closed on return, ready to be renamed into place; on any
+    error it is removed.
+
+    The type is sniffed from the first bytes rather than taken from the
+    client.
+
+    Raises:
+        FileTooLargeError: as soon as the upload exceeds ``max_size``.
+        UnsupportedFileTypeError: if the sniffed type is not in
+            ``allowed_types``.
+    """
+    # Starlette already knows the size of the spooled part
+    if upload.size is not None and upload.size > max_size:
+        raise FileTooLargeError(max_size)
+
+    chunk = await upload.read(IO_CHUNK_SIZE)
+    mime_type = sniff_mime_type(chunk)
+    if allowed_types is not None and mime_type not in allowed_types:
+        raise UnsupportedFileTypeError(f"File content is not one of: {', '.join(allowed_types)}")
+
+    sha256 = hashlib.sha256()
+    digests = (sha256, *digests)
+    size = 0
+
+    f = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        while chunk:
+            size += len(chunk)
+            if size > max_size:
+                raise FileTooLargeError(max_size)
+            await run_in_threadpool(_write_chunk, f, digests, encryptor, chunk)
+            chunk = await upload.read(IO_CHUNK_SIZE)
+        await run_in_threadpool(_close_temp_file, f, encryptor)
+    except BaseException:
+        await run_in_threadpool(_discard_temp_file, f, temp_path)
+        raise
+
+    return ReceivedUpload(size=size, sha256=sha256.hexdigest(), mime_type=mime_type)
 
 
 class SecureFileStorageService:
@@ -52,29 +446,96 @@ class SecureFileStorageService:
         self.base_upload_dir = Path(os.getenv("UPLOAD_DIR", "uploads"))
         self.encryption_service = FileEncryptionService()
         self.base_url = os.getenv("API_BASE_URL", "http://localhost:8000")
+        # Directories already known to exist, so writes skip the mkdir
+        self._known_dirs: Set[Path] = set()
         self._ensure_base_dir()
 
     def _ensure_base_dir(self):
         """Ensure base upload directory exists."""
         self.base_upload_dir.mkdir(parents=True, exist_ok=True)
 
-    def _get_student_folder(self, student_id: str) -> Path:
-        """Get or create student-specific folder using hashed ID."""
+    def _student_folder_path(self, student_id: str) -> Path:
         # Hash student ID for additional security
         hashed_id = hashlib.sha256(student_id.encode()).hexdigest()[:16]
-        student_folder = self.base_upload_dir / "students" / hashed_id
-        student_folder.mkdir(parents=True, exist_ok=True)
-        return student_folder
+        return self.base_upload_dir / "students" / hashed_id
 
-    def _generate_secure_filename(self, original_filename: str, document_type: str) -> str:
+    def ensure_dir(self, path: Path) -> Path:
+        """Create ``path`` if needed, once per process."""
+        if path not in self._known_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(path)
+        return path
+
+    def _get_student_folder(self, student_id: str) -> Path:
+        """Get or create student-specific folder using hashed ID."""
+        return self.ensure_dir(self._student_folder_path(student_id))
+
+    def file_path(self, student_id: str, filename: str) -> Path:
+        """
+        Location of a stored file, without touching the filesystem.
+
+        Raises:
+            FileNotFoundError: for names that can never be a stored file
+                (path components, hidden and in-progress ``.part`` files).
+        """
+        if not filename or filename.startswith(".") or "/" in filename or "\\" in filename:
+            raise FileNotFoundError(f"File not found: {filename}")
+        return self._student_folder_path(student_id) / filename
+
+    def _generate_secure_filename(
+        self, original_filename: str, document_type: str, mime_type: Optional[str] = None
+    ) -> str:
         """Generate a secure unique filename."""
-        # Get file extension
-        ext = Path(original_filename).suffix.lower()
+        # Prefer the extension of the sniffed type over the client's
+        ext = EXTENSION_BY_MIME_TYPE.get(mime_type) or Path(original_filename).suffix.lower()
         # Generate unique identifier
         unique_id = secrets.token_hex(16)
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         return f"{document_type}_{timestamp}_{unique_id}{ext}"
 
+    def _file_url(self, student_id: str, filename: str, encrypted: bool) -> str:
+        if encrypted:
+            return f"{self.base_url}/api/v1/files/{student_id}/{filename}"
+        # Profile photos and other public files use the public endpoint
+        return f"{self.base_url}/api/v1/files/public/{student_id}/{filename}"
+
+    async def store_upload(
+        self,
+        student_id: str,
+        upload: UploadFile,
+        original_filename: str,
+        document_type: str,
+        max_size: int,
+        encrypt: bool = True,
+        allowed_types: Optional[Collection[str]] = None,
+    ) -> StoredFile:
+        """
+        Stream an upload into the student's folder, optionally encrypting it.
+
+        See ``receive_upload``; the file is renamed into place only once
+        complete, under a name carrying its sniffed type's extension.
+        """
+        student_folder = self._get_student_folder(student_id)
+        temp_path = student_folder / f".upload_{secrets.token_hex(8)}.part"
+        encryptor = self.encryption_service.encryptor() if encrypt else None
+        received = await receive_upload(upload, temp_path, max_size, encryptor, allowed_types)
+
+        secure_filename = self._generate_secure_filename(original_filename, document_type, received.mime_type)
+        if encrypt:
+            secure_filename = f"enc_{secure_filename}"
+        final_path = student_folder / secure_filename
+        # Readers only ever see a complete file under the final name
+        await run_in_threadpool(os.replace, temp_path, final_path)
+
+        return StoredFile(
+            path=str(final_path),
+            url=self._file_url(student_id, secure_filename, encrypt),
+            size=received.size,
+            sha256=received.sha256,
+            mime_type=received.mime_type,
+            is_encrypted=encrypt,
+        )
+
     async def upload_file(
         self,
         student_id: str,
@@ -94,62 +555,78 @@ class SecureFileStorageService:
         student_folder = self._get_student_folder(student_id)
         
         # Generate secure filename
-        secure_filename = self._generate_secure_filename(original_filename, document_type)
+        secure_filename = self._generate_secure_filename(
+            original_filename, document_type, sniff_mime_type(file_data[:16])
+        )
         
-        # Encrypt file if requested
         if encrypt:
-            file_data = self.encryption_service.encrypt_file(file_data)
             secure_filename = f"enc_{secure_filename}"
         
-        # Write file
+        # Write file, encrypting chunk by chunk so the ciphertext is never
+        # held in memory as a whole
         file_path = student_folder / secure_filename
         with open(file_path, "wb") as f:
-            f.write(file_data)
-        
-        if encrypt:
-            file_url = f"{self.base_url}/api/v1/files/{student_id}/{secure_filename}"
-        else:
-            # Profile photos and other public files use the public endpoint
-            file_url = f"{self.base_url}/api/v1/files/public/{student_id}/{secure_filename}"
+            if encrypt:
+                encryptor = self.encryption_service.encryptor()
+                view = memoryview(file_data)
+                for pos in range(0, len(view), IO_CHUNK_SIZE):
+                    f.write(encryptor.update(view[pos:pos + IO_CHUNK_SIZE]))
+                f.write(encryptor.finalize())
+            else:
+                f.write(file_data)
         
-        return str(file_path), file_url, encrypt
+        return str(file_path), self._file_url(student_id, secure_filename, encrypt), encrypt
 
-    async def download_file(
+    def stream_file(
         self,
         student_id: str,
         filename: str,
-    ) -> Tuple[bytes, bool]:
+    ) -> Tuple[Iterator[bytes], bool]:
         """
-        Download and optionally decrypt a file.
-        
+        Open a file for streaming, decrypting it on the fly if encrypted.
+
+        The file is opened before returning, so a missing file raises
+        FileNotFoundError here rather than halfway through a response. The
+        iterator does blocking reads; ``StreamingResponse`` runs plain
+        iterators in a worker thread.
+
         Returns:
-            Tuple of (file_data, was_encrypted)
+            Tuple of (chunk iterator, was_encrypted)
         """
-        student_folder = self._get_student_folder(student_id)
-        file_path = student_folder / filename
-        
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {filename}")
-        
-        with open(file_path, "rb") as f:
-            file_data = f.read()
-        
+        f = open(self.file_path(student_id, filename), "rb")
+
+        def read_chunks() -> Iterator[bytes]:
+            with f:
+                while chunk := f.read(IO_CHUNK_SIZE):
+                    yield chunk
+
         # Check if file is encrypted
         is_encrypted = filename.startswith("enc_")
         if is_encrypted:
-            file_data = self.encryption_service.decrypt_file(file_data)
+            return self.encryption_service.iter_decrypt(read_chunks()), True
+        return read_chunks(), False
+
+    async def download_file(
+        self,
+        student_id: str,
+        filename: str,
+    ) -> Tuple[bytes, bool]:
+        """
+        Download and optionally decrypt a file into memory.
         
-        return file_data, is_encrypted
+        Returns:
+            Tuple of (file_data, was_encrypted)
+        """
+        chunks, is_encrypted = self.stream_file(student_id, filename)
+        return b"".join(chunks), is_encrypted
 
     async def delete_file(self, student_id: str, filename: str) -> bool:
         """Delete a file."""
-        student_folder = self._get_student_folder(student_id)
-        file_path = student_folder / filename
-        
-        if file_path.exists():
-            file_path.unlink()
+        try:
+            self.file_path(student_id, filename).unlink()
             return True
-        return False
+        except FileNotFoundError:
+            return False
 
     def generate_download_token(self, student_id: str, document_id: str) -> Tuple[str, datetime]:
         """Generate a temporary download token."""
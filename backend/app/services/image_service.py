@@ -0,0 +1,57 @@
+"""
+Background generation of profile image variants.
+
+Rendering runs in a small process pool so decoding and resizing large phone
+photos neither blocks the event loop nor contends for the GIL with request
+handling. Uploads schedule it as a background task, after the response.
+"""
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import settings
+from app.utils.images import PROFILE_IMAGE_VARIANTS, render_variants, variant_filename
+
+logger = logging.getLogger(__name__)
+
+_image_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_image_executor() -> ProcessPoolExecutor:
+    global _image_executor
+    if _image_executor is None:
+        # spawn, not fork: forking a process with a running event loop and
+        # threads is unsafe, and spawned workers only import app.utils.images
+        _image_executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _image_executor
+
+
+async def generate_profile_variants(source_path: str) -> None:
+    """Render every profile variant of ``source_path``; failures are logged."""
+    loop = asyncio.get_running_loop()
+    try:
+        written = await loop.run_in_executor(
+            _get_image_executor(), render_variants, source_path, PROFILE_IMAGE_VARIANTS
+        )
+        logger.info(f"Generated {len(written)} profile image variants for {Path(source_path).name}")
+    except Exception as e:
+        logger.error(f"Failed to generate profile image variants for {source_path}: {e}")
+
+
+def variant_filenames(filename: str) -> List[str]:
+    """Stored names of every variant of ``filename``."""
+    return [variant_filename(filename, size) for size in PROFILE_IMAGE_VARIANTS]
+
+
+def shutdown_image_executor() -> None:
+    """Stop the rendering pool (on application shutdown)."""
+    global _image_executor
+    if _image_executor is not None:
+        _image_executor.shutdown(wait=False, cancel_futures=True)
+        _image_executor = None
@@ -0,0 +1,310 @@
+"""
+Typeahead suggestions for institution names.
+
+The student registration form asks for suggestions on every keystroke.
+They are answered from an in-process index of active institutions (word
+prefixes plus ``pg_trgm``-style trigrams), so a keystroke costs no database
+round trip.
+
+Any flushed change to an institution marks the index stale in this worker
+and, with ``NOTIFY`` in the same transaction, in every worker running
+``run_suggest_index_listener``. The next request starts a reload in the
+background (the index is built in a worker thread); until it completes,
+requests are answered by the ``pg_trgm`` index on ``institutions.name``.
+"""
+import asyncio
+import heapq
+import logging
+import re
+import uuid
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Collection, Dict, FrozenSet, List, Optional
+
+from sqlalchemy import event, func, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.database.session import async_session_maker
+from app.models.institution import ComplianceStatus, Institution, InstitutionType
+from app.schemas.institution import InstitutionSuggestion
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "institution_suggest_invalidate"
+
+# Share of the query's trigrams a name must contain to match when no name
+# word starts with the query (i.e. a typo or a fragment mid-word)
+MIN_TRIGRAM_COVERAGE = 0.5
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(value: str) -> str:
+    """Lowercase and reduce to words, the way ``pg_trgm`` reads text."""
+    return _NON_WORD.sub(" ", value.lower()).strip()
+
+
+def trigrams(normalized: str) -> FrozenSet[str]:
+    """``pg_trgm`` trigrams of normalized text (words padded "  word ")."""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    id: uuid.UUID
+    name: str
+    institution_type: InstitutionType
+    city: Optional[str]
+    normalized: str
+    grams: FrozenSet[str]
+
+
+class SuggestIndex:
+    """Immutable prefix and trigram index over institution names."""
+
+    def __init__(self, entries: List[_Entry]):
+        self.entries = entries
+        self._by_gram: Dict[str, List[int]] = defaultdict(list)
+        words = []
+        for position, entry in enumerate(entries):
+            for gram in entry.grams:
+                self._by_gram[gram].append(position)
+            words.extend((word, position) for word in set(entry.normalized.split()))
+        words.sort()
+        self._words = [word for word, _ in words]
+        self._word_entries = [position for _, position in words]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _with_word_prefix(self, prefix: str) -> set:
+        start = bisect_left(self._words, prefix)
+        end = bisect_left(self._words, prefix + "\uffff", lo=start)
+        return set(self._word_entries[start:end])
+
+    def search(self, query: str, types: Optional[Collection[InstitutionType]], limit: int) -> List[_Entry]:
+        """
+        Best ``limit`` matches for ``query``: names starting with it first,
+        then names with a word starting with each query word, then fuzzy
+        (trigram) matches; ties go to the closer trigram match, then name.
+        """
+        normalized = normalize(query)
+        if not normalized:
+            return []
+
+        prefixed = None
+        for word in normalized.split():
+            matches = self._with_word_prefix(word)
+            prefixed = matches if prefixed is None else prefixed & matches
+
+        query_grams = trigrams(normalized)
+        shared: Counter = Counter()
+        for gram in query_grams:
+            shared.update(self._by_gram.get(gram, ()))
+
+        min_shared = MIN_TRIGRAM_COVERAGE * len(query_grams)
+        candidates = prefixed.union(position for position, count in shared.items() if count >= min_shared)
+
+        ranked = []
+        for position in candidates:
+            entry = self.entries[position]
+            if types and entry.institution_type not in types:
+                continue
+            count = shared[position]
+            coverage = count / len(query_grams)
+            similarity = count / (len(query_grams) + len(entry.grams) - count)
+            if entry.normalized.startswith(normalized):
+                tier = 0
+            elif position in prefixed:
+                tier = 1
+            else:
+                tier = 2
+            ranked.append((tier, -coverage, -similarity, entry.name, position))
+
+        return [self.entries[ranked_entry[-1]] for ranked_entry in heapq.nsmallest(limit, ranked)]
+
+
+def build_index(rows) -> SuggestIndex:
+    """Index ``(id, name, institution_type, city)`` rows."""
+    entries = []
+    for row in rows:
+        normalized = normalize(row.name)
+        entries.append(_Entry(
+            id=row.id,
+            name=row.name,
+            institution_type=row.institution_type,
+            city=row.city,
+            normalized=normalized,
+            grams=trigrams(normalized),
+        ))
+    return SuggestIndex(entries)
+
+
+def _suggestion(entry: _Entry) -> InstitutionSuggestion:
+    return InstitutionSuggestion(
+        id=entry.id,
+        name=entry.name,
+        institution_type=entry.institution_type.value,
+        city=entry.city,
+    )
+
+
+async def suggest_from_database(
+    db: AsyncSession,
+    query: str,
+    types: Optional[Collection[InstitutionType]],
+    limit: int,
+) -> List[InstitutionSuggestion]:
+    """Suggestions straight from the ``pg_trgm`` GIN index on ``institutions.name``."""
+    term = query.strip()
+    if not normalize(term):
+        return []
+
+    word_similarity = func.word_similarity(term, Institution.name)
+    stmt = (
+        select(Institution.id, Institution.name, Institution.institution_type, Institution.city)
+        .where(Institution.compliance_status == ComplianceStatus.ACTIVE)
+        # word_similarity(term, name) above pg_trgm.word_similarity_threshold
+        .where(literal(term).op("<%")(Institution.name))
+        .order_by(word_similarity.desc(), func.similarity(term, Institution.name).desc(), Institution.name)
+        .limit(limit)
+    )
+    if types:
+        stmt = stmt.where(Institution.institution_type.in_(list(types)))
+    result = await db.execute(stmt)
+    return [
+        InstitutionSuggestion(
+            id=row.id,
+            name=row.name,
+            institution_type=row.institution_type.value,
+            city=row.city,
+        )
+        for row in result.all()
+    ]
+
+
+class InstitutionSuggester:
+    """The worker's suggest index, with its staleness tracking."""
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+        self._index: Optional[SuggestIndex] = None
+        # Bumped by every invalidation; the index is fresh while it was
+        # loaded at the current generation
+        self._generation = 0
+        self._loaded_generation = -1
+        self._lock = asyncio.Lock()
+        self._reload: Optional[asyncio.Task] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._index is not None and self._loaded_generation == self._generation
+
+    def invalidate(self) -> None:
+        self._generation += 1
+
+    async def refresh(self) -> None:
+        """Reload the index from the database, unless it's already fresh."""
+        async with self._lock:
+            if self.is_fresh:
+                return
+            generation = self._generation
+            async with self._session_factory() as db:
+                result = await db.execute(
+                    select(Institution.id, Institution.name, Institution.institution_type, Institution.city)
+                    .where(Institution.compliance_status == ComplianceStatus.ACTIVE)
+                )
+                rows = result.all()
+            self._index = await run_in_threadpool(build_index, rows)
+            self._loaded_generation = generation
+            logger.info(f"Institution suggest index loaded ({len(rows)} institutions)")
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"Failed to reload institution suggest index: {e}")
+
+    def _schedule_refresh(self) -> None:
+        if self._reload is None or self._reload.done():
+            self._reload = asyncio.create_task(self._refresh_in_background())
+
+    async def suggest(
+        self,
+        db: AsyncSession,
+        query: str,
+        types: Optional[Collection[InstitutionType]] = None,
+        limit: int = 10,
+    ) -> List[InstitutionSuggestion]:
+        """Up to ``limit`` active institutions matching ``query``, best first."""
+        if settings.INSTITUTION_SUGGEST_IN_MEMORY:
+            index = self._index
+            if self.is_fresh and index is not None:
+                return [_suggestion(entry) for entry in index.search(query, types, limit)]
+            self._schedule_refresh()
+        return await suggest_from_database(db, query, types, limit)
+
+
+institution_suggester = InstitutionSuggester(async_session_maker)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_institution_change(session: Session, flush_context) -> None:
+    """Mark suggest indexes stale when institutions change, with the transaction."""
+    touched = [obj for obj in session.dirty if session.is_modified(obj)]
+    if not any(isinstance(obj, Institution) for obj in chain(session.new, session.deleted, touched)):
+        return
+
+    institution_suggester.invalidate()
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_notify(:channel, '')"), {"channel": INVALIDATION_CHANNEL})
+
+
+def _on_remote_invalidation(connection, pid, channel, payload) -> None:
+    institution_suggester.invalidate()
+
+
+async def run_suggest_index_listener(engine: AsyncEngine) -> None:
+    """
+    Warm the suggest index, then LISTEN for institution changes from every
+    worker until cancelled.
+
+    Invalidation at flush time covers this worker before commit; the
+    notification marks it stale again once the change is visible, so a
+    reload that raced the commit isn't kept.
+    """
+    if engine.dialect.name != "postgresql" or not settings.INSTITUTION_SUGGEST_IN_MEMORY:
+        return
+
+    while True:
+        try:
+            async with engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                listener = raw.driver_connection
+                await listener.add_listener(INVALIDATION_CHANNEL, _on_remote_invalidation)
+                # Changes missed while disconnected can't be replayed
+                institution_suggester.invalidate()
+                try:
+                    await institution_suggester.refresh()
+                    while True:
+                        await asyncio.sleep(30)
+                        # Surfaces a dropped connection so we reconnect
+                        await listener.execute("SELECT 1")
+                finally:
+                    await listener.remove_listener(INVALIDATION_CHANNEL, _on_remote_invalidation)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Institution suggest listener failed, reconnecting: {e}")
+            institution_suggester.invalidate()
+            await asyncio.sleep(5)
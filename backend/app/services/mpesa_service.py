@@ -1,22 +1,40 @@
 """
 M-Pesa (Safaricom) Payment Integration Service.
 Implements STK Push (Lipa Na M-Pesa Online) and callback handling.
+
+All Daraja calls go through one shared ``httpx.AsyncClient`` so connections
+are pooled across requests and no call blocks the event loop. The OAuth
+token is cached until shortly before it expires, and concurrent callers
+that find it stale wait on a single refresh instead of each fetching one.
 """
+import asyncio
 import base64
-import requests
 import logging
-from datetime import datetime, timezone
+import time
+from datetime import datetime
 from typing import Optional, Dict, Any
 
+import httpx
+
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+PRODUCTION_BASE_URL = "https://api.safaricom.co.ke"
+SANDBOX_BASE_URL = "https://sandbox.safaricom.co.ke"
+
+AUTH_PATH = "/oauth/v1/generate?grant_type=client_credentials"
+STK_PUSH_PATH = "/mpesa/stkpush/v1/processrequest"
+STK_QUERY_PATH = "/mpesa/stkpushquery/v1/query"
+
+# Safaricom tokens are issued for an hour; used when expires_in is missing.
+DEFAULT_TOKEN_TTL_SECONDS = 3599
+
 
 class MpesaService:
     """M-Pesa payment integration service."""
     
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.consumer_key = settings.MPESA_CONSUMER_KEY
         self.consumer_secret = settings.MPESA_CONSUMER_SECRET
         self.passkey = settings.MPESA_PASSKEY
@@ -24,53 +42,149 @@ class MpesaService:
         self.callback_url = settings.MPESA_CALLBACK_URL
         self.environment = getattr(settings, 'MPESA_ENVIRONMENT', 'sandbox')
         
-        # Set API URLs based on environment
-        if self.environment == 'production':
-            self.auth_url = "https://api.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials"
-            self.stk_push_url = "https://api.safaricom.co.ke/mpesa/stkpush/v1/processrequest"
-            self.query_url = "https://api.safaricom.co.ke/mpesa/stkpushquery/v1/query"
+        # Set API base URL based on environment (overridable for local stand-ins)
+        if settings.MPESA_BASE_URL:
+            self.base_url = settings.MPESA_BASE_URL.rstrip('/')
+        elif self.environment == 'production':
+            self.base_url = PRODUCTION_BASE_URL
         else:
-            self.auth_url = "https://sandbox.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials"
-            self.stk_push_url = "https://sandbox.safaricom.co.ke/mpesa/stkpush/v1/processrequest"
-            self.query_url = "https://sandbox.safaricom.co.ke/mpesa/stkpushquery/v1/query"
+            self.base_url = SANDBOX_BASE_URL
+    
+        self.max_retries = settings.MPESA_MAX_RETRIES
+        self.token_refresh_margin = settings.MPESA_TOKEN_REFRESH_MARGIN_SECONDS
+        
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._access_token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client, created on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                transport=self._transport,
+                timeout=httpx.Timeout(
+                    settings.MPESA_READ_TIMEOUT_SECONDS,
+                    connect=settings.MPESA_CONNECT_TIMEOUT_SECONDS,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.MPESA_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.MPESA_MAX_CONNECTIONS,
+                ),
+            )
+        return self._client
     
-    def get_access_token(self) -> Optional[str]:
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _send(self, method: str, url: str, idempotent: bool, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying transient failures with exponential backoff.
+        
+        Non-idempotent calls (STK push) are only retried when the request
+        never reached Safaricom, so a customer is never prompted twice.
         """
-        Generate M-Pesa OAuth access token.
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                if attempt == self.max_retries:
+                    raise
+            except httpx.TransportError:
+                if not idempotent or attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code < 500 or not idempotent or attempt == self.max_retries:
+                    return response
+            await asyncio.sleep(settings.MPESA_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+        raise RuntimeError("unreachable")
+    
+    async def _fetch_access_token(self) -> Optional[str]:
+        auth_string = f"{self.consumer_key}:{self.consumer_secret}"
+        auth_base64 = base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
+        
+        response = await self._send(
+            'GET',
+            AUTH_PATH,
+            idempotent=True,
+            headers={'Authorization': f'Basic {auth_base64}'},
+        )
+        response.raise_for_status()
+        
+        result = response.json()
+        access_token = result.get('access_token')
+        if not access_token:
+            logger.error("No access token in M-Pesa response")
+            return None
+        
+        try:
+            expires_in = int(result.get('expires_in', DEFAULT_TOKEN_TTL_SECONDS))
+        except (TypeError, ValueError):
+            expires_in = DEFAULT_TOKEN_TTL_SECONDS
+        
+        self._access_token = access_token
+        self._token_expires_at = time.monotonic() + max(expires_in - self.token_refresh_margin, 0)
+        logger.info("M-Pesa access token generated successfully")
+        return access_token
+    
+    def _cached_token(self) -> Optional[str]:
+        if self._access_token and time.monotonic() < self._token_expires_at:
+            return self._access_token
+        return None
+    
+    def invalidate_access_token(self) -> None:
+        """Forget the cached token (e.g. after Safaricom rejects it)."""
+        self._access_token = None
+        self._token_expires_at = 0.0
+    
+    async def get_access_token(self) -> Optional[str]:
+        """
+        Get an M-Pesa OAuth access token, reusing the cached one while valid.
         
         Returns:
             Access token string or None if failed
         """
-        try:
-            # Create auth credentials
-            auth_string = f"{self.consumer_key}:{self.consumer_secret}"
-            auth_bytes = auth_string.encode('utf-8')
-            auth_base64 = base64.b64encode(auth_bytes).decode('utf-8')
-            
-            headers = {
-                'Authorization': f'Basic {auth_base64}',
-                'Content-Type': 'application/json'
-            }
+        token = self._cached_token()
+        if token:
+            return token
             
-            response = requests.get(self.auth_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
-            access_token = result.get('access_token')
-            
-            if access_token:
-                logger.info("M-Pesa access token generated successfully")
-                return access_token
-            else:
-                logger.error("No access token in M-Pesa response")
+        async with self._token_lock:
+            # Another caller may have refreshed while we waited for the lock
+            token = self._cached_token()
+            if token:
+                return token
+            try:
+                return await self._fetch_access_token()
+            except httpx.HTTPError as e:
+                logger.error(f"Failed to get M-Pesa access token: {str(e)}")
+                return None
+            except Exception as e:
+                logger.error(f"Unexpected error getting M-Pesa token: {str(e)}")
                 return None
                 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to get M-Pesa access token: {str(e)}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error getting M-Pesa token: {str(e)}")
-            return None
+    async def _authorized_post(self, path: str, payload: Dict[str, Any], idempotent: bool) -> Optional[httpx.Response]:
+        """POST with the cached bearer token, refreshing it once on a 401."""
+        for _ in range(2):
+            access_token = await self.get_access_token()
+            if not access_token:
+                return None
+            response = await self._send(
+                'POST',
+                path,
+                idempotent=idempotent,
+                json=payload,
+                headers={'Authorization': f'Bearer {access_token}'},
+            )
+            if response.status_code != 401:
+                return response
+            self.invalidate_access_token()
+        return response
     
     def generate_password(self, timestamp: str) -> str:
         """
@@ -86,7 +200,7 @@ class MpesaService:
         password_bytes = password_string.encode('utf-8')
         return base64.b64encode(password_bytes).decode('utf-8')
     
-    def initiate_stk_push(
+    async def initiate_stk_push(
         self,
         phone_number: str,
         amount: float,
@@ -106,15 +220,6 @@ class MpesaService:
             Dictionary with response data including checkout_request_id
         """
         try:
-            # Get access token
-            access_token = self.get_access_token()
-            if not access_token:
-                return {
-                    'success': False,
-                    'message': 'Failed to authenticate with M-Pesa',
-                    'error_code': 'AUTH_FAILED'
-                }
-            
             # Generate timestamp and password
             timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
             password = self.generate_password(timestamp)
@@ -127,12 +232,6 @@ class MpesaService:
             if not phone_number.startswith('254'):
                 phone_number = '254' + phone_number
             
-            # Prepare STK Push request
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-            
             payload = {
                 'BusinessShortCode': self.shortcode,
                 'Password': password,
@@ -149,12 +248,13 @@ class MpesaService:
             
             logger.info(f"Initiating M-Pesa STK Push for {phone_number}, amount: {amount}")
             
-            response = requests.post(
-                self.stk_push_url,
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
+            response = await self._authorized_post(STK_PUSH_PATH, payload, idempotent=False)
+            if response is None:
+                return {
+                    'success': False,
+                    'message': 'Failed to authenticate with M-Pesa',
+                    'error_code': 'AUTH_FAILED'
+                }
             
             result = response.json()
             
@@ -178,7 +278,7 @@ class MpesaService:
                     'response_code': result.get('ResponseCode')
                 }
                 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"M-Pesa API request failed: {str(e)}")
             return {
                 'success': False,
@@ -193,7 +293,7 @@ class MpesaService:
                 'error': str(e)
             }
     
-    def query_stk_status(
+    async def query_stk_status(
         self,
         checkout_request_id: str
     ) -> Dict[str, Any]:
@@ -207,23 +307,10 @@ class MpesaService:
             Dictionary with transaction status
         """
         try:
-            # Get access token
-            access_token = self.get_access_token()
-            if not access_token:
-                return {
-                    'success': False,
-                    'message': 'Failed to authenticate with M-Pesa'
-                }
-            
             # Generate timestamp and password
             timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
             password = self.generate_password(timestamp)
             
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-            
             payload = {
                 'BusinessShortCode': self.shortcode,
                 'Password': password,
@@ -231,12 +318,12 @@ class MpesaService:
                 'CheckoutRequestID': checkout_request_id
             }
             
-            response = requests.post(
-                self.query_url,
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
+            response = await self._authorized_post(STK_QUERY_PATH, payload, idempotent=True)
+            if response is None:
+                return {
+                    'success': False,
+                    'message': 'Failed to authenticate with M-Pesa'
+                }
             
             result = response.json()
             
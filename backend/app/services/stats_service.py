@@ -0,0 +1,221 @@
+"""
+Service layer for platform statistics snapshots.
+
+A committed change to a row or column the impact figures read flags the
+snapshot dirty. The flag is set after the commit, in a short transaction of
+its own, so writers never queue on the snapshot row.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, inspect, select, func, true, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.session import engine
+from app.models.donation import OrganizationDonation
+from app.models.institution import Institution
+from app.models.platform_stats import PlatformStatsSnapshot, IMPACT_SNAPSHOT_KEY
+from app.models.sponsor import Sponsor
+from app.models.sponsorship import Sponsorship, SponsorshipStatus
+from app.models.student import Student
+
+logger = logging.getLogger(__name__)
+
+# Serializes recomputation within a worker so a burst of landing-page hits
+# after a change triggers one refresh instead of one per request.
+_refresh_lock = asyncio.Lock()
+
+# Columns compute_impact_stats reads, per source model; inserted and deleted
+# rows always count. Keep in step with compute_impact_stats.
+IMPACT_SOURCE_COLUMNS = {
+    Student: (),
+    Sponsor: (),
+    Sponsorship: ("status", "amount"),
+    OrganizationDonation: ("amount",),
+    Institution: ("county",),
+}
+
+# Session.info key: this transaction has flushed an impact-relevant change
+_IMPACT_CHANGED = "impact_stats_changed"
+
+_dirty_pending = False
+_dirty_task: Optional[asyncio.Task] = None
+
+
+class StatsService:
+    """Service for computing and serving cached platform statistics."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def compute_impact_stats(self) -> Dict[str, Any]:
+        """Compute the impact figures from the source tables in one statement."""
+        students = select(func.count(Student.id).label("total_students")).subquery()
+        sponsors = select(func.count(Sponsor.id).label("total_sponsors")).subquery()
+        sponsorships = select(
+            func.count(Sponsorship.id).filter(
+                Sponsorship.status == SponsorshipStatus.ACTIVE
+            ).label("active_sponsorships"),
+            func.sum(Sponsorship.amount).filter(
+                Sponsorship.status.in_([SponsorshipStatus.ACTIVE, SponsorshipStatus.COMPLETED])
+            ).label("total_fund_raised"),
+        ).subquery()
+        donations = select(
+            func.sum(OrganizationDonation.amount).label("total_donations")
+        ).subquery()
+        locations = select(
+            func.count(func.distinct(Institution.county)).label("locations_served")
+        ).where(Institution.county.isnot(None)).subquery()
+
+        query = (
+            select(students, sponsors, sponsorships, donations, locations)
+            .select_from(students)
+            .join(sponsors, true())
+            .join(sponsorships, true())
+            .join(donations, true())
+            .join(locations, true())
+        )
+        row = (await self.db.execute(query)).mappings().one()
+
+        return {
+            "total_students": row["total_students"] or 0,
+            "total_sponsors": row["total_sponsors"] or 0,
+            "total_fund_raised": float(row["total_fund_raised"] or 0),
+            "active_sponsorships": row["active_sponsorships"] or 0,
+            "total_donations": float(row["total_donations"] or 0),
+            "locations_served": row["locations_served"] or 0,
+        }
+
+    async def refresh_impact_snapshot(self) -> PlatformStatsSnapshot:
+        """Recompute the impact figures and upsert them into the snapshot row."""
+        stats = await self.compute_impact_stats()
+        values = {**stats, "is_dirty": False, "refreshed_at": datetime.now(timezone.utc)}
+
+        stmt = insert(PlatformStatsSnapshot).values(key=IMPACT_SNAPSHOT_KEY, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PlatformStatsSnapshot.key],
+            set_=values,
+        ).returning(PlatformStatsSnapshot)
+
+        result = await self.db.execute(
+            select(PlatformStatsSnapshot).from_statement(stmt).execution_options(populate_existing=True)
+        )
+        snapshot = result.scalar_one()
+        await self.db.commit()
+        return snapshot
+
+    async def get_impact_stats(self, max_age_seconds: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Serve the impact figures from the snapshot.
+
+        The snapshot is recomputed when it is missing, flagged dirty by a
+        source-table change, or older than ``max_age_seconds`` (defaults to
+        ``STATS_SNAPSHOT_MAX_AGE_SECONDS``).
+        """
+        if max_age_seconds is None:
+            max_age_seconds = settings.STATS_SNAPSHOT_MAX_AGE_SECONDS
+
+        snapshot = await self._get_fresh_snapshot(max_age_seconds)
+        if snapshot is None:
+            async with _refresh_lock:
+                # Another request may have refreshed while we waited.
+                snapshot = await self._get_fresh_snapshot(max_age_seconds)
+                if snapshot is None:
+                    snapshot = await self.refresh_impact_snapshot()
+
+        return {
+            "total_students": snapshot.total_students,
+            "total_sponsors": snapshot.total_sponsors,
+            "total_fund_raised": float(snapshot.total_fund_raised),
+            "active_sponsorships": snapshot.active_sponsorships,
+            "total_donations": float(snapshot.total_donations),
+            "locations_served": snapshot.locations_served,
+            "refreshed_at": snapshot.refreshed_at.isoformat(),
+        }
+
+    async def _get_fresh_snapshot(self, max_age_seconds: int) -> Optional[PlatformStatsSnapshot]:
+        result = await self.db.execute(
+            select(PlatformStatsSnapshot)
+            .where(PlatformStatsSnapshot.key == IMPACT_SNAPSHOT_KEY)
+            .execution_options(populate_existing=True)
+        )
+        snapshot = result.scalar_one_or_none()
+        if snapshot is None or snapshot.is_dirty:
+            return None
+        if datetime.now(timezone.utc) - snapshot.refreshed_at > timedelta(seconds=max_age_seconds):
+            return None
+        return snapshot
+
+
+async def run_snapshot_refresher(session_factory, interval_seconds: int) -> None:
+    """Periodically refresh the impact snapshot until cancelled."""
+    while True:
+        try:
+            async with session_factory() as db:
+                await StatsService(db).refresh_impact_snapshot()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Impact stats snapshot refresh failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+def _changes_impact_stats(session: Session) -> bool:
+    if any(type(obj) in IMPACT_SOURCE_COLUMNS for obj in chain(session.new, session.deleted)):
+        return True
+    for obj in session.dirty:
+        columns = IMPACT_SOURCE_COLUMNS.get(type(obj), ())
+        state = inspect(obj)
+        if any(state.attrs[column].history.has_changes() for column in columns):
+            return True
+    return False
+
+
+@event.listens_for(Session, "after_flush")
+def _note_impact_changes(session: Session, flush_context) -> None:
+    if not session.info.get(_IMPACT_CHANGED) and _changes_impact_stats(session):
+        session.info[_IMPACT_CHANGED] = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_impact_changes(session: Session) -> None:
+    session.info.pop(_IMPACT_CHANGED, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _flag_snapshot_after_commit(session: Session) -> None:
+    """Schedule flagging the snapshot dirty once an impact change commits."""
+    global _dirty_pending, _dirty_task
+    if not session.info.pop(_IMPACT_CHANGED, False):
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No event loop (a sync script): the age-based refresh catches up
+        return
+    _dirty_pending = True
+    # One task per worker flags the snapshot for a whole burst of commits
+    if _dirty_task is None or _dirty_task.done():
+        _dirty_task = loop.create_task(_flag_snapshot_dirty())
+
+
+async def _flag_snapshot_dirty() -> None:
+    global _dirty_pending
+    while _dirty_pending:
+        _dirty_pending = False
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    update(PlatformStatsSnapshot)
+                    .where(PlatformStatsSnapshot.key == IMPACT_SNAPSHOT_KEY)
+                    .where(PlatformStatsSnapshot.is_dirty == False)
+                    .values(is_dirty=True)
+                )
+        except Exception as e:
+            logger.error(f"Failed to flag impact stats snapshot dirty: {e}")
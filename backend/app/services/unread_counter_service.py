@@ -0,0 +1,91 @@
+"""
+Service layer for the admin inbox unread counters.
+
+Counters are kept up to date by triggers (see ``app.models.unread_counter``);
+this module reads them and periodically reconciles them with the rows they
+count.
+"""
+import asyncio
+import logging
+from typing import Dict
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.admin_notification import AdminNotification, NotificationType
+from app.models.contact import ContactSubmission, InquiryType
+from app.models.unread_counter import (
+    UnreadCounter,
+    contact_counter_key,
+    notification_counter_key,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def read_unread_counters(db: AsyncSession, prefix: str) -> Dict[str, int]:
+    """Counters whose key starts with ``prefix``, keyed by the rest of the key."""
+    result = await db.execute(
+        select(UnreadCounter.key, UnreadCounter.count).where(UnreadCounter.key.startswith(prefix))
+    )
+    return {key[len(prefix):]: count for key, count in result.all()}
+
+
+async def reconcile_unread_counters(db: AsyncSession) -> Dict[str, int]:
+    """
+    Recount unread rows and overwrite the counters, creating missing ones.
+
+    The counters table is locked against writers while recounting: a
+    transaction that already bumped a counter is waited for (so the recount
+    sees its rows), and one that hasn't yet bumps it after the recount is
+    stored. Either way the stored counts are exact.
+
+    Returns:
+        ``{key: corrected_by}`` for counters that had drifted
+    """
+    await db.execute(text(f"LOCK TABLE {UnreadCounter.__tablename__} IN EXCLUSIVE MODE"))
+
+    actual = {notification_counter_key(t): 0 for t in NotificationType}
+    actual.update({contact_counter_key(t): 0 for t in InquiryType})
+    notifications = await db.execute(
+        select(AdminNotification.notification_type, func.count())
+        .where(AdminNotification.is_read == False)
+        .group_by(AdminNotification.notification_type)
+    )
+    for notification_type, count in notifications.all():
+        actual[notification_counter_key(notification_type)] = count
+    submissions = await db.execute(
+        select(ContactSubmission.inquiry_type, func.count())
+        .where(ContactSubmission.is_read == False)
+        .group_by(ContactSubmission.inquiry_type)
+    )
+    for inquiry_type, count in submissions.all():
+        actual[contact_counter_key(inquiry_type)] = count
+
+    stored = dict((await db.execute(select(UnreadCounter.key, UnreadCounter.count))).all())
+    drift = {key: count - stored.get(key, 0) for key, count in actual.items() if stored.get(key) != count}
+
+    if drift:
+        stmt = insert(UnreadCounter).values([{"key": key, "count": actual[key]} for key in drift])
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[UnreadCounter.key],
+            set_={"count": stmt.excluded["count"]},
+        ))
+    await db.commit()
+    return drift
+
+
+async def run_counter_reconciler(session_factory, interval_seconds: int) -> None:
+    """Reconcile unread counters at startup and then periodically, until cancelled."""
+    while True:
+        try:
+            async with session_factory() as db:
+                drift = await reconcile_unread_counters(db)
+            if drift:
+                logger.warning(f"Corrected drifted unread counters: {drift}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Unread counter reconciliation failed: {e}")
+        await asyncio.sleep(interval_seconds)
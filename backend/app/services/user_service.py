@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.user import User, UserProfile, User2FASettings, UserRole, TwoFactorMethod
-from app.core.security import get_password_hash, verify_password, create_token_pair, TokenPair
+from app.core.security import get_password_hash_async, verify_password_async, create_token_pair, TokenPair
 
 
 class UserService:
@@ -52,7 +52,7 @@ class UserService:
         # Create user
         user = User(
             email=email.lower(),
-            hashed_password=get_password_hash(password),
+            hashed_password=await get_password_hash_async(password),
             phone=phone,
             role=role,
         )
@@ -75,7 +75,7 @@ class UserService:
         if not user:
             return None
         
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             return None
         
         # Update last login
@@ -184,5 +184,5 @@ class UserService:
     
     async def change_password(self, user: User, new_password: str) -> None:
         """Change user password."""
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await get_password_hash_async(new_password)
         await self.db.commit()
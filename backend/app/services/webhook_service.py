@@ -0,0 +1,181 @@
+"""
+Service layer for the payment webhook inbox.
+
+Provider callbacks are appended to ``payment_webhooks`` and acknowledged
+straight away; a small pool of background workers then applies them to
+their payment transactions. Rows are claimed with ``FOR UPDATE SKIP LOCKED``
+so workers (in this process or others) never handle the same callback
+twice, and failed rows are retried with exponential backoff.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.payment import PaymentTransaction, PaymentWebhook, TransactionStatus
+from app.services.mpesa_service import mpesa_service
+
+logger = logging.getLogger(__name__)
+
+# Set when a webhook is enqueued so idle workers pick it up without waiting
+# for the next poll.
+_wakeup = asyncio.Event()
+
+FINAL_STATUSES = frozenset({
+    TransactionStatus.COMPLETED,
+    TransactionStatus.FAILED,
+    TransactionStatus.CANCELLED,
+    TransactionStatus.REFUNDED,
+})
+
+
+class PaymentWebhookService:
+    """Service for recording and applying payment provider callbacks."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(
+        self,
+        provider: str,
+        webhook_data: Dict[str, Any],
+        transaction_id: Optional[uuid.UUID] = None,
+    ) -> PaymentWebhook:
+        """Durably record a callback for background processing."""
+        webhook = PaymentWebhook(
+            provider=provider,
+            webhook_data=webhook_data,
+            transaction_id=transaction_id,
+            processed=False,
+            attempts=0,
+            next_attempt_at=datetime.now(timezone.utc),
+        )
+        self.db.add(webhook)
+        await self.db.commit()
+        _wakeup.set()
+        return webhook
+
+    async def process_pending(self, batch_size: int) -> int:
+        """
+        Claim and apply up to ``batch_size`` due webhooks.
+
+        Each webhook is applied in its own savepoint, so one failure doesn't
+        undo the others in the batch.
+
+        Returns:
+            Number of webhooks claimed
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(PaymentWebhook)
+            .where(
+                PaymentWebhook.processed == False,
+                PaymentWebhook.next_attempt_at <= now,
+            )
+            .order_by(PaymentWebhook.next_attempt_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        webhooks = result.scalars().all()
+
+        for webhook in webhooks:
+            # Read before the savepoint: rolling it back expires the row
+            webhook_id, provider = webhook.id, webhook.provider
+            attempts = webhook.attempts + 1
+            webhook.attempts = attempts
+            try:
+                async with self.db.begin_nested():
+                    await self._apply(webhook)
+            except Exception as e:
+                webhook.last_error = str(e)[:2000]
+                if attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                    webhook.next_attempt_at = None
+                    logger.error(f"Giving up on {provider} webhook {webhook_id} after {attempts} attempts: {e}")
+                else:
+                    delay = settings.WEBHOOK_RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+                    webhook.next_attempt_at = now + timedelta(seconds=delay)
+                    logger.warning(f"{provider} webhook {webhook_id} failed, retrying in {delay:.0f}s: {e}")
+            else:
+                webhook.processed = True
+                webhook.processed_at = datetime.now(timezone.utc)
+                webhook.next_attempt_at = None
+                webhook.last_error = None
+
+        await self.db.commit()
+        return len(webhooks)
+
+    async def _apply(self, webhook: PaymentWebhook) -> None:
+        if webhook.provider == "mpesa":
+            await self._apply_mpesa(webhook)
+        else:
+            raise ValueError(f"No handler for provider '{webhook.provider}'")
+
+    async def _apply_mpesa(self, webhook: PaymentWebhook) -> None:
+        processed = mpesa_service.process_callback(webhook.webhook_data)
+        checkout_request_id = processed.get('checkout_request_id')
+
+        if not checkout_request_id:
+            logger.warning(f"No checkout_request_id in M-Pesa callback {webhook.id}")
+            return
+
+        result = await self.db.execute(
+            select(PaymentTransaction)
+            .where(PaymentTransaction.checkout_request_id == checkout_request_id)
+            .with_for_update()
+        )
+        transaction = result.scalar_one_or_none()
+
+        if not transaction:
+            # The callback can beat the commit that stores the checkout id,
+            # so treat this as transient and retry.
+            raise LookupError(f"Transaction not found for checkout_request_id: {checkout_request_id}")
+
+        webhook.transaction_id = transaction.id
+
+        if transaction.status in FINAL_STATUSES:
+            logger.info(f"M-Pesa callback for {transaction.reference_id} already applied ({transaction.status.value})")
+            return
+
+        if processed.get('success') and processed.get('result_code') == 0:
+            transaction.status = TransactionStatus.COMPLETED
+            transaction.completed_at = datetime.now(timezone.utc)
+            transaction.tx_metadata = {
+                **transaction.tx_metadata,
+                "mpesa_receipt_number": processed.get('mpesa_receipt_number'),
+                "transaction_date": processed.get('transaction_date'),
+                "result_desc": processed.get('result_desc'),
+            }
+            logger.info(f"M-Pesa payment completed: {transaction.reference_id} - Receipt: {processed.get('mpesa_receipt_number')}")
+        else:
+            transaction.status = TransactionStatus.FAILED
+            transaction.failed_at = datetime.now(timezone.utc)
+            transaction.failure_reason = processed.get('result_desc', 'Payment failed')
+            logger.warning(f"M-Pesa payment failed: {transaction.reference_id} - {transaction.failure_reason}")
+
+
+async def run_webhook_worker(session_factory) -> None:
+    """Apply pending webhooks until cancelled."""
+    while True:
+        try:
+            async with session_factory() as db:
+                claimed = await PaymentWebhookService(db).process_pending(settings.WEBHOOK_BATCH_SIZE)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Webhook worker batch failed: {e}")
+            claimed = 0
+
+        # A full batch means there may be more waiting
+        if claimed >= settings.WEBHOOK_BATCH_SIZE:
+            continue
+
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.WEBHOOK_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
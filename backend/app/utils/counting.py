@@ -0,0 +1,146 @@
+"""
+Row-count strategies for paginated listings.
+
+A list endpoint's ``total`` is often costlier than the page itself, since an
+exact ``COUNT(*)`` has to visit every matching row. Endpoints pick one of
+three strategies per request:
+
+- ``exact``: run ``COUNT(*)`` over the filtered query every time
+- ``cached``: exact count, reused for ``COUNT_CACHE_TTL_SECONDS`` per
+  distinct filter signature (the compiled SQL plus its parameters)
+- ``estimate``: the Postgres planner's row estimate (``pg_class.reltuples``
+  for unfiltered queries, ``EXPLAIN`` otherwise), falling back to an exact
+  count when the estimate is small enough that counting is cheap
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Optional, Tuple
+
+from sqlalchemy import select, func, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ClauseElement, Executable, Select
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MAX_CACHED_COUNTS = 1024
+
+# signature -> (expires_at, count); insertion-ordered for LRU eviction
+_count_cache: "OrderedDict[Tuple[str, str], Tuple[float, int]]" = OrderedDict()
+
+
+class CountMode(str, Enum):
+    """Strategies for computing a listing's total."""
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a query, with its parameters bound as usual."""
+
+    inherit_cache = False
+
+    def __init__(self, query: Select):
+        self.query = query
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.query, **kw)
+
+
+def _signature(query: Select) -> Tuple[str, str]:
+    compiled = query.compile()
+    return str(compiled), repr(sorted(compiled.params.items(), key=lambda item: item[0]))
+
+
+async def _exact_count(db: AsyncSession, query: Select) -> int:
+    result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+    return result.scalar() or 0
+
+
+async def _cached_count(db: AsyncSession, query: Select, ttl_seconds: int) -> int:
+    key = _signature(query)
+    now = time.monotonic()
+
+    entry = _count_cache.get(key)
+    if entry and entry[0] > now:
+        _count_cache.move_to_end(key)
+        return entry[1]
+
+    total = await _exact_count(db, query)
+    _count_cache[key] = (now + ttl_seconds, total)
+    _count_cache.move_to_end(key)
+    while len(_count_cache) > _MAX_CACHED_COUNTS:
+        _count_cache.popitem(last=False)
+    return total
+
+
+async def _planner_estimate(db: AsyncSession, query: Select) -> Optional[int]:
+    """Return the planner's row estimate, or None if it can't be obtained."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    try:
+        froms = query.get_final_froms()
+        if query.whereclause is None and len(froms) == 1 and hasattr(froms[0], "fullname"):
+            result = await db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+                {"name": froms[0].fullname},
+            )
+            estimate = result.scalar()
+        else:
+            # Savepoint so a failed EXPLAIN doesn't abort the request transaction
+            async with db.begin_nested():
+                result = await db.execute(_Explain(query.order_by(None)))
+                plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+    except (SQLAlchemyError, KeyError, IndexError, TypeError, ValueError) as e:
+        logger.debug(f"Planner row estimate unavailable: {e}")
+        return None
+
+    # reltuples is -1 for tables that have never been vacuumed/analyzed
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+async def count_rows(
+    db: AsyncSession,
+    query: Select,
+    mode: Optional[CountMode] = None,
+) -> Tuple[int, bool]:
+    """
+    Count the rows ``query`` would return using the given strategy.
+
+    ``mode`` defaults to ``LIST_COUNT_MODE``.
+
+    Returns:
+        Tuple of (total, is_estimate)
+    """
+    mode = mode or CountMode(settings.LIST_COUNT_MODE)
+
+    if mode == CountMode.CACHED:
+        return await _cached_count(db, query, settings.COUNT_CACHE_TTL_SECONDS), False
+
+    if mode == CountMode.ESTIMATE:
+        estimate = await _planner_estimate(db, query)
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+            return estimate, True
+
+    return await _exact_count(db, query), False
+
+
+def clear_count_cache() -> None:
+    """Drop every cached count (e.g. after bulk changes)."""
+    _count_cache.clear()
@@ -1,10 +1,17 @@
 """
 Email utilities for sending verification and notification emails.
+
+Emails are queued in the outbox and delivered by the background email
+workers, so callers never wait on SMTP.
 """
 from typing import Optional
 import logging
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.config import settings
+from app.database.session import async_session_maker
+from app.services.email_outbox_service import EmailOutboxService
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +24,10 @@ async def send_email(
     body: Optional[str] = None,
     is_html: bool = False,
     reply_to: Optional[str] = None,
+    db: Optional[AsyncSession] = None,
 ) -> bool:
     """
-    Send an email.
-    In production, integrate with an email service (SendGrid, SES, etc.)
+    Queue an email for delivery.
     
     Args:
         to_email: Recipient email address
@@ -30,6 +37,8 @@ async def send_email(
         body: Alternative to html_content/text_content (for backward compatibility)
         is_html: Whether body contains HTML (used with body param)
         reply_to: Reply-to email address
+        db: Session to queue the email in; a new one is used if omitted.
+            Note the email is committed along with anything else pending.
     """
     # Handle both parameter styles
     if body is not None:
@@ -45,10 +54,12 @@ async def send_email(
         # Return True to indicate success even without SMTP configured (for development)
         return True
     
-    # TODO: Implement actual email sending with SMTP
-    logger.info(f"Sending email to {to_email}: {subject}")
-    if reply_to:
-        logger.info(f"Reply-to: {reply_to}")
+    if db is None:
+        async with async_session_maker() as session:
+            email = await EmailOutboxService(session).enqueue(to_email, subject, html_content, text_content, reply_to)
+    else:
+        email = await EmailOutboxService(db).enqueue(to_email, subject, html_content, text_content, reply_to)
+    logger.info(f"Queued email {email.id} to {to_email}: {subject}")
     return True
 
 
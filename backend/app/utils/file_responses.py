@@ -0,0 +1,82 @@
+"""
+Conditional, range-aware responses for files served straight from disk.
+
+``FileResponse`` sends the file with ``sendfile``/``pathsend`` where the
+server supports it, sets a strong ``ETag`` and ``Last-Modified`` from the
+file's stat, and answers ``Range``/``If-Range`` requests. What it doesn't do
+is conditional GET, so ``file_response`` answers a matching
+``If-None-Match`` or ``If-Modified-Since`` with a bodiless 304 first.
+
+Stored files are write-once (unique names, renamed into place complete), so
+the stat-derived validators change exactly when the content does.
+"""
+import os
+import stat
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+
+# Headers a 304 must repeat from the 200 it stands in for
+NOT_MODIFIED_HEADERS = ("etag", "last-modified", "cache-control", "vary")
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def is_not_modified(response_headers: Headers, request_headers: Headers) -> bool:
+    """Whether the client's cached copy is current (RFC 9110 section 13.2.2)."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = response_headers.get("etag")
+        return etag is not None and _etag_matches(etag, if_none_match)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = response_headers.get("last-modified")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Serve ``path`` with validators, 304s and byte ranges.
+
+    Raises:
+        FileNotFoundError: if ``path`` is missing or not a regular file.
+    """
+    stat_result = await run_in_threadpool(os.stat, path)
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise FileNotFoundError(str(path))
+
+    response = FileResponse(path, media_type=media_type, headers=headers, stat_result=stat_result)
+    if request.method in ("GET", "HEAD") and is_not_modified(response.headers, request.headers):
+        return Response(
+            status_code=304,
+            headers={
+                name: response.headers[name]
+                for name in NOT_MODIFIED_HEADERS
+                if name in response.headers
+            },
+        )
+    return response
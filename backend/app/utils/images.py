@@ -0,0 +1,75 @@
+"""
+Profile image variants.
+
+Each uploaded profile photo gets downscaled WebP variants stored next to the
+original as ``<stem>.<size>.webp``; clients ask for one with
+``/files/public/<student>/<original>?size=<size>``.
+
+``render_variants`` is CPU-bound and runs in a worker process, so this
+module only imports the standard library at the top: worker processes are
+spawned fresh and import nothing else of the application.
+"""
+import os
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Variant name -> longest edge in pixels. Images are never upscaled.
+PROFILE_IMAGE_VARIANTS: Dict[str, int] = {
+    "thumb": 160,
+    "card": 480,
+    "large": 1080,
+}
+VARIANT_QUALITY = 80
+
+
+def variant_filename(filename: str, size: str) -> str:
+    """Stored name of the ``size`` variant of ``filename``."""
+    return f"{Path(filename).stem}.{size}.webp"
+
+
+def profile_photo_variants(photo_url: Optional[str]) -> Optional[Dict[str, str]]:
+    """URLs of every variant of a public profile photo URL."""
+    if not photo_url or "/files/public/" not in photo_url:
+        return None
+    return {size: f"{photo_url}?size={size}" for size in PROFILE_IMAGE_VARIANTS}
+
+
+def render_variants(source_path: str, variants: Dict[str, int], quality: int = VARIANT_QUALITY) -> List[str]:
+    """
+    Write a WebP variant of ``source_path`` for each entry in ``variants``.
+
+    Orientation from EXIF is applied to the pixels and all metadata (EXIF,
+    GPS, XMP) is dropped. Each variant is written to a temporary name and
+    renamed into place, so readers never see a partial file.
+
+    Returns:
+        Paths of the written variants.
+    """
+    from PIL import Image, ImageOps
+
+    source = Path(source_path)
+    written = []
+
+    with warnings.catch_warnings():
+        # Refuse decompression bombs outright rather than just warning
+        warnings.simplefilter("error", Image.DecompressionBombWarning)
+
+        with Image.open(source) as image:
+            largest = max(variants.values())
+            # Lets JPEG decode at a reduced scale, far cheaper for phone photos
+            image.draft("RGB", (largest, largest))
+            image = ImageOps.exif_transpose(image)
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+            # Largest first, so each smaller variant resizes an already smaller image
+            for size, edge in sorted(variants.items(), key=lambda item: item[1], reverse=True):
+                image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+                target = source.with_name(variant_filename(source.name, size))
+                temp = target.with_name(f".{target.name}.part")
+                image.save(temp, "WEBP", quality=quality, method=4)
+                os.replace(temp, target)
+                written.append(str(target))
+
+    return written
@@ -0,0 +1,120 @@
+"""
+Cursor helpers for keyset pagination.
+
+Cursors are opaque, URL-safe tokens that carry the sort key of the last row
+on a page. Clients pass them back unchanged to fetch the next page, and the
+next page is selected with a row-value comparison on the sort key
+(``WHERE (created_at, id) < (:last_created_at, :last_id)``) instead of an
+OFFSET, so deep pages cost the same as the first one.
+"""
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import Select
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row into an opaque cursor."""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, (date, datetime)) else str(v) for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[str]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _coerce(column: InstrumentedAttribute, raw: str) -> Any:
+    """Convert a decoded cursor value back to the column's Python type."""
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    if python_type is uuid.UUID:
+        return uuid.UUID(raw)
+    return python_type(raw)
+
+
+def apply_cursor(
+    query: Select,
+    keys: Sequence[InstrumentedAttribute],
+    cursor: str,
+    descending: bool = True,
+) -> Select:
+    """
+    Restrict ``query`` to rows after ``cursor`` in ``keys`` order.
+
+    Raises:
+        ValueError: If the cursor is malformed or does not match ``keys``.
+    """
+    values = decode_cursor(cursor)
+    if len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+    try:
+        typed = [_coerce(column, value) for column, value in zip(keys, values)]
+    except (TypeError, ValueError, NotImplementedError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if descending:
+        return query.where(tuple_(*keys) < tuple_(*typed))
+    return query.where(tuple_(*keys) > tuple_(*typed))
+
+
+async def keyset_paginate(
+    db: AsyncSession,
+    query: Select,
+    keys: Sequence[InstrumentedAttribute],
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    descending: bool = True,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of ``query`` ordered by ``keys``.
+
+    ``keys`` must end in a unique column (normally ``id``) so the order is
+    total. When ``cursor`` is given the page starts after it and ``offset`` is
+    ignored; otherwise ``offset`` is applied for legacy page-number clients.
+
+    Returns:
+        Tuple of (items, next_cursor); ``next_cursor`` is None on the last page.
+
+    Raises:
+        ValueError: If ``cursor`` is malformed.
+    """
+    if cursor:
+        query = apply_cursor(query, keys, cursor, descending)
+    elif offset:
+        query = query.offset(offset)
+
+    query = query.order_by(*[key.desc() if descending else key.asc() for key in keys])
+    result = await db.execute(query.limit(limit + 1))
+    items = list(result.scalars().all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor([getattr(items[-1], key.key) for key in keys])
+    return items, next_cursor
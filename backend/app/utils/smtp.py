@@ -0,0 +1,323 @@
+"""
+Minimal asyncio SMTP client with a connection pool.
+
+Only what outbound delivery needs: EHLO, STARTTLS or implicit TLS,
+AUTH PLAIN, and MAIL/RCPT/DATA. When the server advertises PIPELINING
+(RFC 2920) the envelope and DATA go out in a single write, so a message
+costs two round trips instead of three plus one per recipient.
+
+``SMTPConnectionPool`` keeps authenticated connections open between
+messages, which saves the TCP, TLS and AUTH handshakes that dominate the
+cost of sending one message per connection.
+"""
+import asyncio
+import base64
+import logging
+import re
+import socket
+import ssl
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_LEADING_DOT = re.compile(rb"^\.", re.MULTILINE)
+
+
+class SMTPError(Exception):
+    """The server rejected a command."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+    @property
+    def permanent(self) -> bool:
+        """5xx replies won't succeed on retry."""
+        return 500 <= self.code < 600
+
+
+class SMTPSecurityError(Exception):
+    """The session can't be made secure enough to continue."""
+
+
+def _dot_stuff(data: bytes) -> bytes:
+    """Escape leading dots and terminate the DATA section."""
+    data = _LEADING_DOT.sub(b"..", data)
+    if not data.endswith(b"\r\n"):
+        data += b"\r\n"
+    return data + b".\r\n"
+
+
+class SMTPConnection:
+    """One open, greeted (and possibly authenticated) SMTP session."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, timeout: float):
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+        self.extensions: Dict[str, str] = {}
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+    @classmethod
+    async def open(
+        cls,
+        host: str,
+        port: int,
+        tls_mode: str = "starttls",
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: float = 30.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        allow_plaintext_auth: bool = False,
+    ) -> "SMTPConnection":
+        """
+        Connect, greet and log in.
+
+        Args:
+            tls_mode: ``ssl`` for implicit TLS (port 465), ``starttls`` to
+                upgrade with STARTTLS (required), ``none`` for plain text
+            allow_plaintext_auth: permit AUTH in ``none`` mode; otherwise
+                credentials are never sent unencrypted
+
+        Raises:
+            SMTPSecurityError: ``starttls`` mode and the server doesn't offer
+                STARTTLS (possibly stripped in transit), or credentials
+                would go out in plain text.
+        """
+        context = ssl_context or ssl.create_default_context()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=context if tls_mode == "ssl" else None),
+            timeout,
+        )
+        conn = cls(reader, writer, timeout)
+        try:
+            code, message = await conn._read_reply()
+            if code != 220:
+                raise SMTPError(code, message)
+            await conn._ehlo()
+
+            if tls_mode == "starttls":
+                if "starttls" not in conn.extensions:
+                    raise SMTPSecurityError(f"{host} did not offer STARTTLS; refusing to continue in plain text")
+                await conn.command("STARTTLS", expect=220)
+                await asyncio.wait_for(writer.start_tls(context, server_hostname=host), timeout)
+                await conn._ehlo()
+
+            if username:
+                if tls_mode == "none" and not allow_plaintext_auth:
+                    raise SMTPSecurityError("Refusing to send SMTP credentials over an unencrypted connection")
+                credentials = base64.b64encode(f"\0{username}\0{password or ''}".encode()).decode()
+                await conn.command(f"AUTH PLAIN {credentials}", expect=235)
+        except BaseException:
+            conn.abort()
+            raise
+        return conn
+
+    async def _ehlo(self) -> None:
+        _, message = await self.command(f"EHLO {socket.getfqdn()}", expect=250)
+        self.extensions = {}
+        for line in message.splitlines()[1:]:
+            keyword, _, params = line.partition(" ")
+            self.extensions[keyword.lower()] = params
+
+    async def _read_reply(self) -> Tuple[int, str]:
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not line:
+                raise ConnectionResetError("SMTP server closed the connection")
+            lines.append(line[4:].decode("utf-8", "replace").rstrip("\r\n"))
+            # "250-..." continues a multiline reply, "250 ..." ends it
+            if line[3:4] != b"-":
+                return int(line[:3]), "\n".join(lines)
+
+    async def command(self, line: str, expect: int = 250) -> Tuple[int, str]:
+        """Send one command and check its reply code."""
+        self.writer.write(line.encode() + b"\r\n")
+        await self.writer.drain()
+        code, message = await self._read_reply()
+        if code != expect:
+            raise SMTPError(code, message)
+        return code, message
+
+    async def send_message(self, sender: str, recipients: Sequence[str], data: bytes) -> None:
+        """
+        Deliver one message.
+
+        ``data`` is the RFC 5322 message with CRLF line endings. A rejected
+        message leaves the connection reset and reusable; network errors
+        leave it unusable.
+
+        Raises:
+            SMTPError: the server refused the envelope or the message.
+        """
+        envelope = [f"MAIL FROM:<{sender}>"] + [f"RCPT TO:<{rcpt}>" for rcpt in recipients] + ["DATA"]
+        expected = [250] * (len(envelope) - 1) + [354]
+
+        if "pipelining" in self.extensions:
+            self.writer.write("".join(f"{line}\r\n" for line in envelope).encode())
+            await self.writer.drain()
+            replies = [await self._read_reply() for _ in envelope]
+        else:
+            replies = []
+            for line in envelope:
+                self.writer.write(line.encode() + b"\r\n")
+                await self.writer.drain()
+                replies.append(await self._read_reply())
+                if replies[-1][0] != 250:
+                    break
+
+        failed = next(
+            ((code, message) for (code, message), want in zip(replies, expected) if code != want),
+            None,
+        )
+        if failed:
+            if replies[-1][0] == 354 and len(replies) == len(envelope):
+                # DATA was accepted despite an envelope error: send an empty
+                # message body to get back to a clean state
+                self.writer.write(b".\r\n")
+                await self.writer.drain()
+                await self._read_reply()
+            await self.command("RSET")
+            raise SMTPError(*failed)
+
+        self.writer.write(_dot_stuff(data))
+        await self.writer.drain()
+        code, message = await self._read_reply()
+        self.last_used = time.monotonic()
+        if code != 250:
+            raise SMTPError(code, message)
+        self.messages_sent += 1
+
+    async def close(self) -> None:
+        """Say QUIT and close, ignoring a server that already went away."""
+        try:
+            await self.command("QUIT", expect=221)
+        except (OSError, asyncio.TimeoutError, SMTPError):
+            pass
+        self.abort()
+
+    def abort(self) -> None:
+        self.writer.close()
+
+
+class SMTPConnectionPool:
+    """
+    Up to ``size`` reusable connections to one SMTP server.
+
+    Connections idle longer than ``idle_seconds`` or that have carried
+    ``max_messages`` messages are closed instead of reused, staying inside
+    the limits servers commonly enforce.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        size: int = 4,
+        tls_mode: str = "starttls",
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: float = 30.0,
+        idle_seconds: float = 60.0,
+        max_messages: int = 100,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        allow_plaintext_auth: bool = False,
+    ):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.tls_mode = tls_mode
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.idle_seconds = idle_seconds
+        self.max_messages = max_messages
+        self.ssl_context = ssl_context
+        self.allow_plaintext_auth = allow_plaintext_auth
+        self._idle: List[SMTPConnection] = []
+        self._slots = asyncio.Semaphore(size)
+        self.connections_opened = 0
+
+    async def _open(self) -> SMTPConnection:
+        conn = await SMTPConnection.open(
+            self.host,
+            self.port,
+            tls_mode=self.tls_mode,
+            username=self.username,
+            password=self.password,
+            timeout=self.timeout,
+            ssl_context=self.ssl_context,
+            allow_plaintext_auth=self.allow_plaintext_auth,
+        )
+        self.connections_opened += 1
+        return conn
+
+    def _take_idle(self) -> Optional[SMTPConnection]:
+        now = time.monotonic()
+        while self._idle:
+            conn = self._idle.pop()
+            if now - conn.last_used < self.idle_seconds:
+                return conn
+            # Most servers drop idle clients anyway, so don't bother with QUIT
+            conn.abort()
+        return None
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Tuple[SMTPConnection, bool]]:
+        """
+        Borrow a connection, yielding it and whether it was reused.
+
+        The connection goes back to the pool unless the block failed with
+        anything other than a server rejection.
+        """
+        async with self._slots:
+            conn = self._take_idle()
+            reused = conn is not None
+            if conn is None:
+                conn = await self._open()
+            try:
+                yield conn, reused
+            except SMTPError:
+                await self._release(conn)
+                raise
+            except BaseException:
+                conn.abort()
+                raise
+            await self._release(conn)
+
+    async def _release(self, conn: SMTPConnection) -> None:
+        if conn.writer.is_closing():
+            return
+        if conn.messages_sent >= self.max_messages:
+            await conn.close()
+        else:
+            self._idle.append(conn)
+
+    async def send_message(self, sender: str, recipients: Sequence[str], data: bytes) -> None:
+        """
+        Deliver one message over a pooled connection.
+
+        A pooled connection the server has dropped since its last use is
+        discarded and the message retried on another one; only a failure on
+        a freshly opened connection is raised.
+        """
+        while True:
+            async with self.connection() as (conn, reused):
+                try:
+                    await conn.send_message(sender, recipients, data)
+                    return
+                except (OSError, SMTPError) as e:
+                    # 421: the server is closing the connection (e.g. idle timeout)
+                    if not reused or (isinstance(e, SMTPError) and e.code != 421):
+                        raise
+                    logger.debug(f"Pooled SMTP connection went stale, reconnecting: {e}")
+                    conn.abort()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(conn.close() for conn in idle), return_exceptions=True)
@@ -0,0 +1,106 @@
+"""
+Streaming JSON responses for large listing endpoints.
+
+Rows are pulled from the database with a server-side cursor
+(``AsyncSession.stream``) and written to the client as they arrive, so peak
+memory is bounded by one batch and the first byte goes out as soon as the
+first row is fetched.
+
+Two wire formats are supported:
+
+- ``ndjson``: one JSON document per line (``application/x-ndjson``)
+- ``json``: a single JSON array, emitted incrementally
+"""
+import json
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Optional, Type
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.sql import Select
+
+from app.database.session import async_session_maker
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class StreamFormat(str, Enum):
+    """Wire formats for streamed listings."""
+    NDJSON = "ndjson"
+    JSON = "json"
+
+
+def pydantic_serializer(schema: Type[BaseModel]) -> Callable[[Any], str]:
+    """Build a row serializer that validates through a response schema."""
+    def serialize(obj: Any) -> str:
+        return schema.model_validate(obj).model_dump_json()
+    return serialize
+
+
+def dict_serializer(obj: Any) -> str:
+    """Serialize a plain dict, stringifying UUIDs, dates and Decimals."""
+    return json.dumps(obj, default=str, separators=(",", ":"))
+
+
+async def stream_rows(
+    query: Select,
+    scalars: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[Any]:
+    """
+    Yield rows of ``query`` from a server-side cursor.
+
+    Uses its own session rather than the request's: the response body is
+    produced after the endpoint returns, when the request session may
+    already be closed.
+    """
+    async with async_session_maker() as session:
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        if scalars:
+            result = result.scalars()
+        async for row in result:
+            yield row
+
+
+async def _encode(
+    items: AsyncIterator[Any],
+    serialize: Callable[[Any], str],
+    fmt: StreamFormat,
+) -> AsyncIterator[bytes]:
+    if fmt == StreamFormat.NDJSON:
+        async for item in items:
+            yield (serialize(item) + "\n").encode()
+        return
+
+    yield b"["
+    first = True
+    async for item in items:
+        yield (serialize(item) if first else "," + serialize(item)).encode()
+        first = False
+    yield b"]"
+
+
+def streaming_json_response(
+    items: AsyncIterator[Any],
+    serialize: Callable[[Any], str],
+    fmt: StreamFormat,
+    headers: Optional[dict] = None,
+) -> StreamingResponse:
+    """Wrap an async iterator of items in a chunked JSON/NDJSON response."""
+    media_type = "application/x-ndjson" if fmt == StreamFormat.NDJSON else "application/json"
+    return StreamingResponse(_encode(items, serialize, fmt), media_type=media_type, headers=headers)
+
+
+def stream_query_response(
+    query: Select,
+    serialize: Callable[[Any], str],
+    fmt: StreamFormat,
+    scalars: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> StreamingResponse:
+    """Stream every row of ``query`` as JSON without buffering the result set."""
+    return streaming_json_response(
+        stream_rows(query, scalars=scalars, batch_size=batch_size),
+        serialize,
+        fmt,
+    )
@@ -0,0 +1,80 @@
+"""
+Benchmark: SMTP delivery throughput against the local stand-in.
+
+Sends the same batch of messages, rendered the way the outbox renders
+them, through SMTPConnectionPool in a few configurations:
+
+- per-message: a new connection for every message, no pipelining
+  (what a naive ``smtplib`` call per email does)
+- pooled: connections reused across messages, without and with PIPELINING
+- pooled xN: several pooled connections sending concurrently
+
+``--latency-ms`` delays each burst of server replies to model the network
+round trip to a real relay, which is what pooling and pipelining save:
+
+    python -m scripts.bench_email_delivery --messages 200 --latency-ms 20
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.models.email_outbox import OutboxEmail
+from app.services.email_outbox_service import build_message
+from app.utils.smtp import SMTPConnectionPool
+from scripts.smtp_standin import SMTPStandin
+
+
+def sample_message(index: int) -> bytes:
+    email = OutboxEmail(
+        id=uuid.uuid4(),
+        to_email=f"user{index}@example.org",
+        subject="Your login verification code - DestinyPal",
+        html_content="<h1>Two-Factor Authentication</h1><p>Your code is: <strong>123456</strong></p>" * 4,
+        created_at=datetime.now(timezone.utc),
+    )
+    return build_message(email)
+
+
+async def run(messages: list, latency: float, pipelining: bool, size: int, max_messages: int) -> tuple:
+    standin = SMTPStandin(latency=latency, pipelining=pipelining)
+    port = await standin.start()
+    pool = SMTPConnectionPool("127.0.0.1", port, size=size, tls_mode="none", max_messages=max_messages)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        pool.send_message("noreply@destinypal.org", [f"user{i}@example.org"], data)
+        for i, data in enumerate(messages)
+    ))
+    elapsed = time.perf_counter() - start
+
+    await pool.close()
+    await standin.close()
+    assert standin.messages == len(messages)
+    return elapsed, standin.connections
+
+
+async def main(count: int, latency_ms: float, sizes: list[int]) -> None:
+    messages = [sample_message(i) for i in range(count)]
+    latency = latency_ms / 1000
+    variants = [
+        ("per-message", False, 1, 1),
+        ("pooled", False, 1, count),
+        ("pooled+pipelining", True, 1, count),
+    ] + [(f"pooled+pipelining x{size}", True, size, count) for size in sizes if size > 1]
+
+    print(f"{count} messages, {latency_ms:.0f} ms simulated round trip")
+    print(f"{'variant':<26} {'seconds':>8} {'msg/s':>8} {'connections':>12}")
+    for name, pipelining, size, max_messages in variants:
+        elapsed, connections = await run(messages, latency, pipelining, size, max_messages)
+        print(f"{name:<26} {elapsed:>8.2f} {count / elapsed:>8.0f} {connections:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--pool-sizes", default="4,8", help="Comma-separated concurrent connection counts")
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.latency_ms, [int(s) for s in args.pool_sizes.split(",")]))
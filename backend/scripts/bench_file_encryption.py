@@ -0,0 +1,119 @@
+"""
+Benchmark: document encryption throughput and peak memory.
+
+Compares, for each file size:
+
+- fernet: the legacy format, whole file in memory
+- chunked: the chunked AES-GCM container, whole file in memory
+- streamed: the chunked container file-to-file in IO_CHUNK_SIZE pieces,
+  the way uploads and downloads use it
+
+Peak memory is measured with ``tracemalloc`` and covers Python-level
+allocations (the plaintext and ciphertext buffers), which is what grows
+with file size:
+
+    python -m scripts.bench_file_encryption --sizes 1,10,50
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+from app.services.file_service import IO_CHUNK_SIZE, FileEncryptionService
+
+MIB = 1024 * 1024
+
+
+def measure(func: Callable[[], object]) -> Tuple[float, float]:
+    """Seconds taken and peak traced MiB allocated while running ``func``."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / MIB
+
+
+def stream_encrypt(service: FileEncryptionService, source: Path, target: Path) -> None:
+    encryptor = service.encryptor()
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        while chunk := src.read(IO_CHUNK_SIZE):
+            dst.write(encryptor.update(chunk))
+        dst.write(encryptor.finalize())
+
+
+def stream_decrypt(service: FileEncryptionService, source: Path, target: Path) -> None:
+    def chunks():
+        with open(source, "rb") as src:
+            while chunk := src.read(IO_CHUNK_SIZE):
+                yield chunk
+
+    with open(target, "wb") as dst:
+        for plaintext in service.iter_decrypt(chunks()):
+            dst.write(plaintext)
+
+
+def main(sizes: list[int]) -> None:
+    service = FileEncryptionService()
+    # Pay for key derivation up front
+    service.decrypt_file(service.encrypt_file(b"warm up"))
+    service._fernet.decrypt(service._fernet.encrypt(b"warm up"))
+
+    print(f"{'size':>7} {'variant':<9} {'enc MB/s':>9} {'dec MB/s':>9} {'enc peak':>9} {'dec peak':>9} {'on disk':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_path, enc_path, out_path = (Path(tmp) / name for name in ("plain", "enc", "out"))
+        for size_mib in sizes:
+            data = os.urandom(size_mib * MIB)
+            plain_path.write_bytes(data)
+            results = {}
+
+            token = b""
+
+            def fernet_encrypt():
+                nonlocal token
+                token = service._fernet.encrypt(plain_path.read_bytes())
+
+            results["fernet"] = (
+                measure(fernet_encrypt),
+                measure(lambda: service._fernet.decrypt(token)),
+                len(token),
+            )
+            token = b""
+
+            sealed = b""
+
+            def chunked_encrypt():
+                nonlocal sealed
+                sealed = service.encrypt_file(plain_path.read_bytes())
+
+            results["chunked"] = (
+                measure(chunked_encrypt),
+                measure(lambda: service.decrypt_file(sealed)),
+                len(sealed),
+            )
+            sealed = b""
+
+            results["streamed"] = (
+                measure(lambda: stream_encrypt(service, plain_path, enc_path)),
+                measure(lambda: stream_decrypt(service, enc_path, out_path)),
+                enc_path.stat().st_size,
+            )
+            assert out_path.read_bytes() == data
+
+            for variant, ((enc_s, enc_peak), (dec_s, dec_peak), stored) in results.items():
+                print(
+                    f"{size_mib:>5}Mi {variant:<9} {size_mib * MIB / enc_s / 1e6:>9.0f} "
+                    f"{size_mib * MIB / dec_s / 1e6:>9.0f} {enc_peak:>7.1f}Mi {dec_peak:>7.1f}Mi "
+                    f"{stored / len(data):>7.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", default="1,10,50", help="Comma-separated file sizes in MiB")
+    args = parser.parse_args()
+    main([int(size) for size in args.sizes.split(",")])
@@ -0,0 +1,123 @@
+"""
+Microbenchmark: per-request overhead of the middleware stack.
+
+Compares three otherwise identical apps serving a trivial JSON endpoint:
+
+- bare: no middleware
+- legacy: the four middlewares written as ``BaseHTTPMiddleware`` subclasses
+  (as they were before the move to plain ASGI)
+- asgi: the current pure-ASGI middlewares from ``app.middleware``
+
+Requests are driven in-process through ``httpx.ASGITransport`` so the
+numbers reflect middleware cost, not networking:
+
+    python -m scripts.bench_middleware --requests 5000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.rate_limit import AuthRateLimitMiddleware, RateLimitMiddleware
+from app.middleware.rate_limit_store import MemoryRateLimitStore
+from app.middleware.security import ContentTypeValidationMiddleware, SecurityHeadersMiddleware
+
+# High enough that the benchmark never trips the limiter
+LIMIT = 10 ** 9
+
+
+class LegacySecurityHeaders(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        for name, value in SecurityHeadersMiddleware.SECURITY_HEADERS.items():
+            response.headers[name] = value
+        if "server" in response.headers:
+            del response.headers["server"]
+        return response
+
+
+class LegacyContentType(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        if request.method in ["POST", "PUT", "PATCH"]:
+            base = request.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if base and base not in ContentTypeValidationMiddleware.ALLOWED_CONTENT_TYPES:
+                return JSONResponse(status_code=415, content={"detail": "Unsupported"})
+        return await call_next(request)
+
+
+class LegacyAuthRateLimit(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path not in AuthRateLimitMiddleware.AUTH_PATHS:
+            return await call_next(request)
+        return await call_next(request)
+
+
+class LegacyRateLimit(BaseHTTPMiddleware):
+    def __init__(self, app, store):
+        super().__init__(app)
+        self.store = store
+
+    async def dispatch(self, request: Request, call_next):
+        ip = request.client.host if request.client else "unknown"
+        await self.store.hit(f"burst:{ip}", LIMIT, 1)
+        await self.store.hit(f"minute:{ip}", LIMIT, 60)
+        return await call_next(request)
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    store = MemoryRateLimitStore()
+    if variant == "legacy":
+        app.add_middleware(LegacySecurityHeaders)
+        app.add_middleware(LegacyContentType)
+        app.add_middleware(LegacyAuthRateLimit)
+        app.add_middleware(LegacyRateLimit, store=store)
+    elif variant == "asgi":
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(ContentTypeValidationMiddleware)
+        app.add_middleware(AuthRateLimitMiddleware, store=store)
+        app.add_middleware(RateLimitMiddleware, requests_per_minute=LIMIT, burst_limit=LIMIT, store=store)
+    return app
+
+
+async def measure(variant: str, requests: int, rounds: int) -> list[float]:
+    """Mean microseconds per request for each round."""
+    transport = httpx.ASGITransport(app=build_app(variant))
+    results = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.get("/ping")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(requests):
+                await client.get("/ping")
+            results.append((time.perf_counter() - start) / requests * 1e6)
+    return results
+
+
+async def main(requests: int, rounds: int) -> None:
+    baseline = None
+    print(f"{'variant':<8} {'us/request':>11} {'overhead':>10}")
+    for variant in ("bare", "legacy", "asgi"):
+        per_request = statistics.median(await measure(variant, requests, rounds))
+        if baseline is None:
+            baseline = per_request
+        print(f"{variant:<8} {per_request:>11.1f} {per_request - baseline:>+10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.rounds))
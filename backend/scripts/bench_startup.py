@@ -0,0 +1,102 @@
+"""
+Startup benchmark: how long ``import app.main`` takes in a fresh interpreter.
+
+Each run spawns ``python -X importtime -c "import app.main"`` and parses the
+per-module timings it writes to stderr. The report shows the median total
+plus the slowest modules by self and cumulative time, which is usually
+enough to spot a new eager import or import-time side effect:
+
+    python -m scripts.bench_startup --runs 5 --top 15
+
+``--json`` prints one machine-readable line instead, suitable for appending
+to a history file in CI to track cold-start cost over time:
+
+    python -m scripts.bench_startup --json >> startup-history.jsonl
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+TARGET = "app.main"
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def run_once(target: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """
+    Import ``target`` in a fresh interpreter.
+
+    Returns wall-clock seconds and ``{module: (self_us, cumulative_us)}``.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        sys.exit(f"import {target} failed:\n{proc.stderr[-2000:]}")
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return wall, modules
+
+
+def slowest(modules: Dict[str, Tuple[int, int]], index: int, top: int) -> List[Tuple[str, int]]:
+    ranked = sorted(modules.items(), key=lambda item: item[1][index], reverse=True)
+    return [(name, times[index]) for name, times in ranked[:top]]
+
+
+def main(target: str, runs: int, top: int, as_json: bool) -> None:
+    # The first run also pays for writing .pyc files elsewhere in the tree
+    run_once(target)
+
+    results = [run_once(target) for _ in range(runs)]
+    wall = statistics.median(r[0] for r in results)
+    import_us = statistics.median(r[1].get(target, (0, 0))[1] for r in results)
+    # Per-module numbers from the run closest to the median
+    _, modules = min(results, key=lambda r: abs(r[0] - wall))
+
+    if as_json:
+        print(json.dumps({
+            "timestamp": int(time.time()),
+            "python": sys.version.split()[0],
+            "target": target,
+            "runs": runs,
+            "wall_ms": round(wall * 1000, 1),
+            "import_ms": round(import_us / 1000, 1),
+            "modules": len(modules),
+            "top_cumulative": {name: us for name, us in slowest(modules, 1, top)},
+        }))
+        return
+
+    print(f"import {target}: {import_us / 1000:.1f} ms "
+          f"(process wall {wall * 1000:.1f} ms, {len(modules)} modules, median of {runs})")
+    for title, index in (("self", 0), ("cumulative", 1)):
+        print(f"\nslowest by {title} time:")
+        for name, us in slowest(modules, index, top):
+            print(f"  {us / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--target", default=TARGET, help="Module to import")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print a single JSON summary line")
+    args = parser.parse_args()
+    main(args.target, args.runs, args.top, args.json)
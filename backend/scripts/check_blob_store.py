@@ -0,0 +1,59 @@
+"""
+Consistency check for the document blob store.
+
+Walks the blob files and the ``document_blobs`` rows together and reports
+reference-count drift, missing files, unreferenced blobs and orphan files:
+
+    python -m scripts.check_blob_store
+    python -m scripts.check_blob_store --fix --collect
+    python -m scripts.check_blob_store --verify
+
+``--fix`` recounts references, ``--collect`` deletes unreferenced blobs and
+orphan files, ``--verify`` decrypts every referenced blob and checks it
+still hashes to its id. Exits non-zero when referenced content is missing
+or corrupt.
+"""
+import argparse
+import asyncio
+import sys
+
+from app.database.session import async_session_maker, engine
+from app.services.blob_store import document_blob_store
+
+SAMPLE = 10
+
+
+def show(title: str, items: list) -> None:
+    print(f"{title}: {len(items)}")
+    for item in items[:SAMPLE]:
+        print(f"  {item}")
+    if len(items) > SAMPLE:
+        print(f"  ... {len(items) - SAMPLE} more")
+
+
+async def main(fix: bool, collect: bool, verify: bool) -> int:
+    async with async_session_maker() as db:
+        report = await document_blob_store.check(db, fix=fix, collect=collect, verify=verify)
+    await engine.dispose()
+
+    print(f"blobs: {report.blobs}, files: {report.files}")
+    show("ref_count mismatches (id, stored, actual)", report.ref_count_mismatches)
+    show("missing files", report.missing_files)
+    show("unreferenced blobs", report.unreferenced)
+    show("orphan files", report.orphan_files)
+    if verify:
+        show("corrupt blobs", report.corrupt)
+    if fix:
+        print(f"ref_counts fixed: {report.fixed}")
+    if collect:
+        print(f"collected: {report.collected}")
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--fix", action="store_true", help="Recount blob references")
+    parser.add_argument("--collect", action="store_true", help="Delete unreferenced blobs and orphan files")
+    parser.add_argument("--verify", action="store_true", help="Decrypt and re-hash every referenced blob")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.fix, args.collect, args.verify)))
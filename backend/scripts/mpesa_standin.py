@@ -0,0 +1,106 @@
+"""
+Local stand-in for the Safaricom Daraja API.
+
+Serves the three endpoints MpesaService talks to so the client can be
+exercised without sandbox credentials or network access:
+
+    uvicorn scripts.mpesa_standin:app --port 8081
+    MPESA_BASE_URL=http://127.0.0.1:8081
+
+It can also be mounted in-process for tests:
+
+    transport = httpx.ASGITransport(app=app)
+    service = MpesaService(transport=transport)
+
+Behaviour knobs live on ``app.state`` (token lifetime, forced failures) and
+``GET /_standin/stats`` reports how many tokens and pushes were issued.
+"""
+import base64
+import secrets
+import time
+
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="M-Pesa stand-in")
+
+app.state.token_ttl_seconds = 3599
+app.state.fail_next_stk_pushes = 0
+app.state.token_requests = 0
+app.state.stk_pushes = 0
+app.state.tokens = {}
+app.state.checkouts = {}
+
+
+def _authorized(authorization: str) -> bool:
+    if not authorization.startswith("Bearer "):
+        return False
+    expires_at = app.state.tokens.get(authorization[len("Bearer "):])
+    return expires_at is not None and expires_at > time.monotonic()
+
+
+def _unauthorized() -> JSONResponse:
+    return JSONResponse(
+        status_code=401,
+        content={"errorCode": "404.001.03", "errorMessage": "Invalid Access Token"},
+    )
+
+
+@app.get("/oauth/v1/generate")
+async def generate_token(grant_type: str, authorization: str = Header("")):
+    if grant_type != "client_credentials" or not authorization.startswith("Basic "):
+        return JSONResponse(status_code=400, content={"errorMessage": "Invalid grant"})
+    try:
+        base64.b64decode(authorization[len("Basic "):], validate=True)
+    except ValueError:
+        return JSONResponse(status_code=400, content={"errorMessage": "Invalid credentials"})
+
+    app.state.token_requests += 1
+    token = secrets.token_urlsafe(24)
+    app.state.tokens[token] = time.monotonic() + app.state.token_ttl_seconds
+    return {"access_token": token, "expires_in": str(app.state.token_ttl_seconds)}
+
+
+@app.post("/mpesa/stkpush/v1/processrequest")
+async def stk_push(request: Request, authorization: str = Header("")):
+    if not _authorized(authorization):
+        return _unauthorized()
+    if app.state.fail_next_stk_pushes:
+        app.state.fail_next_stk_pushes -= 1
+        return JSONResponse(status_code=500, content={"errorMessage": "Internal Server Error"})
+
+    payload = await request.json()
+    app.state.stk_pushes += 1
+    checkout_request_id = f"ws_CO_{secrets.token_hex(8)}"
+    app.state.checkouts[checkout_request_id] = payload
+    return {
+        "MerchantRequestID": secrets.token_hex(6),
+        "CheckoutRequestID": checkout_request_id,
+        "ResponseCode": "0",
+        "ResponseDescription": "Success. Request accepted for processing",
+        "CustomerMessage": "Success. Request accepted for processing",
+    }
+
+
+@app.post("/mpesa/stkpushquery/v1/query")
+async def stk_query(request: Request, authorization: str = Header("")):
+    if not _authorized(authorization):
+        return _unauthorized()
+
+    payload = await request.json()
+    if payload.get("CheckoutRequestID") not in app.state.checkouts:
+        return JSONResponse(status_code=400, content={"errorMessage": "Invalid CheckoutRequestID"})
+    return {
+        "ResponseCode": "0",
+        "ResponseDescription": "The service request has been accepted successsfully",
+        "ResultCode": "0",
+        "ResultDesc": "The service request is processed successfully.",
+    }
+
+
+@app.get("/_standin/stats")
+async def stats():
+    return {
+        "token_requests": app.state.token_requests,
+        "stk_pushes": app.state.stk_pushes,
+    }
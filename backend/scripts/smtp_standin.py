@@ -0,0 +1,178 @@
+"""
+Local stand-in for an SMTP relay.
+
+Accepts mail over plain-text SMTP (EHLO, AUTH PLAIN, PIPELINING) and
+discards it, counting connections and messages, so outbox delivery can be
+exercised and load-tested without a real relay or network access:
+
+    python -m scripts.smtp_standin --port 1025 --latency-ms 20
+    SMTP_HOST=127.0.0.1 SMTP_PORT=1025 SMTP_TLS_MODE=none SMTP_ALLOW_PLAINTEXT_AUTH=true
+
+It can also run in-process for tests and benchmarks:
+
+    standin = SMTPStandin(latency=0.02)
+    port = await standin.start()
+
+``latency`` delays every burst of replies, standing in for the network
+round trip: pipelined commands arrive in one burst and so pay it once.
+``fail_next`` makes the next messages fail with a temporary 451, and
+recipients containing "reject" get a permanent 550.
+"""
+import argparse
+import asyncio
+import signal
+from typing import List, Optional
+
+
+class _Session(asyncio.Protocol):
+    def __init__(self, standin: "SMTPStandin"):
+        self.standin = standin
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = b""
+        self.in_data = False
+        self.data_size = 0
+        self.recipients = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.standin.connections += 1
+        self._send([b"220 smtp-standin ESMTP ready"])
+
+    def data_received(self, data):
+        self.buffer += data
+        replies: List[bytes] = []
+        while b"\r\n" in self.buffer:
+            line, self.buffer = self.buffer.split(b"\r\n", 1)
+            reply = self._handle(line)
+            if reply:
+                replies.append(reply)
+        if replies:
+            self._send(replies)
+
+    def _send(self, replies: List[bytes]) -> None:
+        payload = b"".join(reply + b"\r\n" for reply in replies)
+        if self.standin.latency:
+            asyncio.get_running_loop().call_later(self.standin.latency, self._write, payload)
+        else:
+            self._write(payload)
+
+    def _write(self, payload: bytes) -> None:
+        if self.transport and not self.transport.is_closing():
+            self.transport.write(payload)
+
+    def _handle(self, line: bytes) -> Optional[bytes]:
+        if self.in_data:
+            if line != b".":
+                self.data_size += len(line) + 2
+                return None
+            self.in_data = False
+            if self.standin.fail_next:
+                self.standin.fail_next -= 1
+                self.standin.failed += 1
+                return b"451 4.3.0 Temporary failure, try again later"
+            self.standin.messages += 1
+            self.standin.recipients += self.recipients
+            self.standin.bytes_received += self.data_size
+            return b"250 2.0.0 Ok: queued"
+
+        command = line[:4].upper()
+        if command == b"EHLO":
+            extensions = [b"250-smtp-standin", b"250-SIZE 26214400", b"250-AUTH PLAIN"]
+            if self.standin.pipelining:
+                extensions.append(b"250-PIPELINING")
+            return b"\r\n".join(extensions + [b"250 8BITMIME"])
+        if command == b"HELO":
+            return b"250 smtp-standin"
+        if command == b"AUTH":
+            return b"235 2.7.0 Authentication successful"
+        if command == b"MAIL":
+            self.recipients = 0
+            return b"250 2.1.0 Ok"
+        if command == b"RCPT":
+            if b"reject" in line.lower():
+                return b"550 5.1.1 Recipient address rejected"
+            self.recipients += 1
+            return b"250 2.1.5 Ok"
+        if command == b"DATA":
+            if not self.recipients:
+                return b"554 5.5.1 No valid recipients"
+            self.in_data = True
+            self.data_size = 0
+            return b"354 End data with <CR><LF>.<CR><LF>"
+        if command in (b"RSET", b"NOOP"):
+            self.recipients = 0
+            return b"250 2.0.0 Ok"
+        if command == b"QUIT":
+            self._send([b"221 2.0.0 Bye"])
+            asyncio.get_running_loop().call_later(self.standin.latency, self.transport.close)
+            return None
+        return b"502 5.5.2 Command not recognized"
+
+
+class SMTPStandin:
+    """In-process SMTP sink with counters and failure knobs."""
+
+    def __init__(self, latency: float = 0.0, pipelining: bool = True):
+        self.latency = latency
+        self.pipelining = pipelining
+        self.fail_next = 0
+        self.connections = 0
+        self.messages = 0
+        self.recipients = 0
+        self.failed = 0
+        self.bytes_received = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening; returns the bound port."""
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(lambda: _Session(self), host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "messages": self.messages,
+            "recipients": self.recipients,
+            "failed": self.failed,
+            "bytes_received": self.bytes_received,
+        }
+
+
+async def main(host: str, port: int, latency_ms: float, pipelining: bool) -> None:
+    standin = SMTPStandin(latency=latency_ms / 1000, pipelining=pipelining)
+    bound = await standin.start(host, port)
+    print(f"SMTP stand-in listening on {host}:{bound} (latency {latency_ms:.0f} ms)")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    last = 0
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            pass
+        if standin.messages != last:
+            last = standin.messages
+            print(standin.stats())
+
+    await standin.close()
+    print(standin.stats())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay per burst of replies")
+    parser.add_argument("--no-pipelining", action="store_true", help="Don't advertise PIPELINING")
+    args = parser.parse_args()
+    asyncio.run(main(args.host, args.port, args.latency_ms, not args.no_pipelining))